@@ -3,8 +3,10 @@ import sys
 import time
 
 from planner.parser import carregar_instancia
-from planner.busca import bfs, dfs_limited, ids, astar
-from planner.bidirecional import bidirecional
+from planner.busca import bfs, dfs_limited, ids, astar, astar_lmcut, astar_blocos, gbfs
+from planner.bidirecional import bidirecional, mm
+from planner.paralelo import bfs_paralelo
+from planner.portfolio import portfolio
 
 PASTA = "Trabalho IA\src\instancias"   # coloque o nome da pasta onde ficam os arquivos .strips
 
@@ -40,13 +42,62 @@ def rodar_algoritmo(nome, func, INI, OBJ, ACOES):
     print("-" * 70)
 
 
+ALGORITMOS = [
+    ("BFS", bfs),
+    ("DFS limitada", dfs_limited),
+    ("IDS", ids),
+    ("A*", astar),
+    ("A* (LM-cut)", astar_lmcut),
+    ("A* (blocos)", astar_blocos),
+    ("GBFS (FF)", gbfs),
+    ("Bidirecional", bidirecional),
+    ("MM (LM-cut)", mm),
+    ("BFS paralela", bfs_paralelo),
+]
+
+# Algoritmos que abrem processos próprios ficam fora do portfólio, que já
+# roda cada algoritmo num processo (daemon, que não pode ter filhos)
+PARALELOS = {"BFS paralela"}
+
+
+def rodar_portfolio(caminho, prazo):
+    algoritmos = [a for a in ALGORITMOS if a[0] not in PARALELOS]
+    vencedor, resultados = portfolio(caminho, algoritmos, prazo)
+
+    for i, (custo, _, nos, tempo, erro) in sorted(resultados.items()):
+        nome = algoritmos[i][0]
+        print(f"{nome:15} | Custo: {str(custo):>4} | Nós: {nos:>7} | Tempo: {tempo*1000:7.2f} ms"
+              + (f" | {erro}" if erro else ""))
+    print("-" * 70)
+
+    if vencedor is None:
+        print("Nenhum plano encontrado.")
+        return
+
+    custo, caminho_plano = resultados[vencedor][:2]
+    print(f"Vencedor: {algoritmos[vencedor][0]} (custo {custo})")
+    if custo <= 25:
+        for i, ac in enumerate(caminho_plano, 1):
+            print(f"   {i:3}. {ac}")
+
+
 def main():
+    # --portfolio [segundos]: roda os algoritmos em paralelo em vez de um
+    # depois do outro
+    args = sys.argv[1:]
+    usar_portfolio = "--portfolio" in args
+    prazo = None
+    if usar_portfolio:
+        k = args.index("--portfolio")
+        args.pop(k)
+        if k < len(args) and args[k].replace(".", "", 1).isdigit():
+            prazo = float(args.pop(k))
 
     # Se o usuário *não* passou arquivo, mostramos menu
-    if len(sys.argv) == 1:
+    if not args:
         caminho = escolher_arquivo()
     else:
-        caminho = sys.argv[1]
+        caminho = args[0]
 
     print(f"\nLendo instância: {caminho}")
     print("=" * 70)
@@ -56,11 +107,12 @@ def main():
     print(f"Total de ações        : {len(ACOES)}")
     print("=" * 70)
 
-    rodar_algoritmo("BFS", bfs, INI, OBJ, ACOES)
-    rodar_algoritmo("DFS limitada", dfs_limited, INI, OBJ, ACOES)
-    rodar_algoritmo("IDS", ids, INI, OBJ, ACOES)
-    rodar_algoritmo("A*", astar, INI, OBJ, ACOES)
-    rodar_algoritmo("Bidirecional", bidirecional, INI, OBJ, ACOES)
+    if usar_portfolio:
+        rodar_portfolio(caminho, prazo)
+        return
+
+    for nome, func in ALGORITMOS:
+        rodar_algoritmo(nome, func, INI, OBJ, ACOES)
 
 
 if __name__ == "__main__":
@@ -10,170 +10,510 @@
 #   -p → p deve ser falso
 #
 # A busca ocorre simultaneamente:
-#   - BFS a partir do INÍCIO
-#   - BFS reversa a partir do OBJETIVO
+#   - BFS a partir do INÍCIO, sobre estados completos
+#   - BFS reversa a partir do OBJETIVO, por regressão sobre estados
+#     parciais (pos, neg): todos os estados com pos verdadeiros e neg
+#     falsos. O próprio OBJ é o primeiro estado parcial.
 #
-# Quando as fronteiras se encontram, o caminho é reconstruído.
+# A cada passo é expandida a camada inteira da fronteira menor. As
+# buscas se encontram quando um estado da frente está contido em um
+# estado parcial de trás, testado nos dois sentidos: cada estado novo
+# da frente contra os parciais (IndiceParciais) e cada parcial novo
+# contra os estados da frente (IndiceEstados). O plano é o caminho até
+# esse estado seguido das ações da regressão, que são aplicadas para
+# frente normalmente.
+# O comprimento do plano não é garantidamente mínimo.
+#
+# mm() é a versão heurística (MM), com custo ótimo.
 # -----------------------------------------------------------------------
 
-from collections import deque
-from planner.busca import satisfaz_objetivo, sucessores
+import heapq
+from itertools import count
+
+from planner.busca import satisfaz_objetivo, sucessores_ids
+from planner.heuristica import heuristica_lmcut, INFINITO
+from planner.invariantes import grupos_mutex
 
 
 # -----------------------------------------------------------------------
-# Gera sucessores reversos (para BFS do lado do OBJETIVO)
-# 
-# Isso significa: ações que "desfazem" efeitos.
+# Regressão de um estado parcial por uma ação.
 #
-# Tecnicamente, um sucessor reverso é um estado anterior no qual
-# aplicar a ação leva ao estado atual.
-#
-# Para isso, se ac.aplicar(X)=estado então X é um predecessor.
+# A ação precisa contribuir (adicionar um fato de pos ou apagar um de
+# neg) sem desfazer nada do que é exigido. Os fatos que ela fixa saem
+# da exigência e as pré-condições dela entram. Parciais que exigem dois
+# fatos de um mesmo grupo de mutex nunca são alcançáveis e são podados.
 # -----------------------------------------------------------------------
-def predecessores(estado, acoes):
-    preds = []
-    est_set = set(estado)
+class Regressao:
+    def __init__(self, INI, OBJ, acoes):
+        self.acoes = acoes
+        self.efeitos = []
+        self.adicionado_por = {}
+        self.apagado_por = {}
+        for i, ac in enumerate(acoes):
+            add = frozenset(ac.add)
+            dele = frozenset(ac.delete) - add
+            pre = frozenset(p for p in ac.pre if p > 0)
+            pre_neg = frozenset(-p for p in ac.pre if p < 0)
+            self.efeitos.append((add, dele, pre, pre_neg))
+            for p in add:
+                self.adicionado_por.setdefault(p, []).append(i)
+            for p in dele:
+                self.apagado_por.setdefault(p, []).append(i)
+
+        # fato -> fatos mutuamente exclusivos com ele
+        self.mutex = {}
+        for grupo in grupos_mutex(INI, OBJ, acoes):
+            for p in grupo:
+                self.mutex.setdefault(p, set()).update(grupo - {p})
+
+    def consistente(self, pos):
+        for p in pos:
+            m = self.mutex.get(p)
+            if m and not m.isdisjoint(pos):
+                return False
+        return True
+
+    def regredir(self, pos, neg):
+        """
+        Lista de (índice da ação, pos, neg) dos estados parciais
+        anteriores a (pos, neg).
+        """
+        candidatas = set()
+        for p in pos:
+            candidatas.update(self.adicionado_por.get(p, ()))
+        for p in neg:
+            candidatas.update(self.apagado_por.get(p, ()))
+
+        preds = []
+        for i in sorted(candidatas):
+            add, dele, pre, pre_neg = self.efeitos[i]
+            if not add.isdisjoint(neg) or not dele.isdisjoint(pos):
+                continue
+
+            resto_pos = pos - add - dele
+            resto_neg = neg - add - dele
+            if not pre.isdisjoint(resto_neg) or not pre_neg.isdisjoint(resto_pos):
+                continue
+
+            novo_pos = resto_pos | pre
+            if not self.consistente(novo_pos):
+                continue
+            preds.append((i, novo_pos, resto_neg | pre_neg))
+
+        return preds
 
-    for ac in acoes:
-        # Para a ação ser "desfazível":
-        # estado deve conter todos os efeitos positivos dela
-        # e não conter os efeitos negativos
-        ok = True
 
-        for p in ac.add:
-            if p not in est_set:
-                ok = False
-                break
+# -----------------------------------------------------------------------
+# Índice dos estados parciais para o encontro por subsunção: uma trie
+# sobre os fatos de pos em ordem crescente. Cada nó é
+# (filhos, [[neg, valor]]); a consulta só desce pelos fatos verdadeiros
+# no estado, então visita apenas os prefixos contidos nele. inserir
+# devolve o item, cujo valor pode ser trocado depois.
+# -----------------------------------------------------------------------
+class IndiceParciais:
+    def __init__(self):
+        self.raiz = ({}, [])
+
+    def inserir(self, pos, neg, valor):
+        no = self.raiz
+        for p in sorted(pos):
+            filhos = no[0]
+            if p not in filhos:
+                filhos[p] = ({}, [])
+            no = filhos[p]
+        item = [neg, valor]
+        no[1].append(item)
+        return item
+
+    def encontrar(self, estado):
+        """
+        Menor valor entre os parciais que contêm o estado (ou None).
+        estado: tuple ordenada de proposições
+        """
+        est_set = set(estado)
+        fim = len(estado)
+        melhor = None
+        pilha = [(self.raiz, 0)]
+
+        while pilha:
+            (filhos, itens), k = pilha.pop()
+            for neg, valor in itens:
+                if neg.isdisjoint(est_set) and (melhor is None or valor < melhor):
+                    melhor = valor
+            if filhos:
+                for j in range(k, fim):
+                    filho = filhos.get(estado[j])
+                    if filho is not None:
+                        pilha.append((filho, j + 1))
+
+        return melhor
+
 
-        for p in ac.delete:
-            if p in est_set:
-                ok = False
-                break
+# -----------------------------------------------------------------------
+# Busca Bidirecional
+# -----------------------------------------------------------------------
+def bidirecional(INI, OBJ, acoes):
+    """
+    Retorna: (custo, caminho, nos_expandidos)
+    """
 
-        if not ok:
-            continue
+    # Caso trivial
+    if satisfaz_objetivo(INI, OBJ):
+        return 0, [], 0
 
-        # Para obter o predecessor X, precisamos "remover add" e "adicionar delete"
-        prev = set(est_set)
-        for p in ac.add:
-            prev.remove(p)
-        for p in ac.delete:
-            prev.add(p)
+    regressao = Regressao(INI, OBJ, acoes)
 
-        preds.append((tuple(sorted(prev)), ac.nome))
+    # FRONT (da esquerda): estado -> (pai, índice da ação)
+    pai_f = {INI: (None, None)}
+    g_f = {INI: 0}
+    camada_f = [INI]
+    estados = IndiceEstados()
+    estados.inserir(INI, 0)
+
+    # BACK (meta →): parciais em listas paralelas; o id cresce com g
+    inicial = (frozenset(g for g in OBJ if g > 0), frozenset(-g for g in OBJ if g < 0))
+    parciais = [inicial]
+    pai_t = [None]
+    acao_t = [None]
+    g_t = [0]
+    vistos = {inicial: 0}
+    indice = IndiceParciais()
+    indice.inserir(inicial[0], inicial[1], 0)
+    camada_t = [0]
+
+    encontro = None   # (custo, estado da frente, id do parcial)
+    nos = 0
 
-    return preds
+    while camada_f and camada_t and encontro is None:
+        proxima = []
+
+        if len(camada_f) <= len(camada_t):
+            # --------------------------------------------------
+            # Expansão da frente
+            # --------------------------------------------------
+            for atual in camada_f:
+                nos += 1
+                g = g_f[atual] + 1
+
+                for prox, i in sucessores_ids(atual, acoes):
+                    if prox in pai_f:
+                        continue
+                    pai_f[prox] = (atual, i)
+                    g_f[prox] = g
+                    proxima.append(prox)
+                    estados.inserir(prox, g)
+
+                    t = indice.encontrar(prox)
+                    if t is not None and (encontro is None or g + g_t[t] < encontro[0]):
+                        encontro = (g + g_t[t], prox, t)
+            camada_f = proxima
+
+        else:
+            # --------------------------------------------------
+            # Expansão de trás (regressão)
+            # --------------------------------------------------
+            for atual in camada_t:
+                nos += 1
+                g = g_t[atual] + 1
+
+                for i, pos, neg in regressao.regredir(*parciais[atual]):
+                    chave = (pos, neg)
+                    if chave in vistos:
+                        continue
+                    novo = len(parciais)
+                    vistos[chave] = novo
+                    parciais.append(chave)
+                    pai_t.append(atual)
+                    acao_t.append(i)
+                    g_t.append(g)
+                    indice.inserir(pos, neg, novo)
+                    proxima.append(novo)
+
+                    # Estado da frente (ou o próprio INI) contido no parcial
+                    casado = estados.minimo(pos, neg, INFINITO if encontro is None else encontro[0] - g)
+                    if casado is not None:
+                        encontro = (casado[0] + g, casado[1], novo)
+            camada_t = proxima
+
+    if encontro is None:
+        return None, [], nos
+
+    custo, estado, t = encontro
+    caminho = reconstruir_caminho(estado, t, pai_f, pai_t, acao_t, acoes)
+    return custo, caminho, nos
 
 
 # -----------------------------------------------------------------------
 # Reconstrói o caminho total quando as fronteiras se encontram.
-# 
-# pai_f : dict estado → (pai, nome_da_ação)
-# pai_t : dict estado → (pai, nome_da_ação)
-# encontro : estado onde as buscas se tocaram
+#
+# Do início até o estado de encontro, segue pai_f; depois, do parcial
+# de encontro até o objetivo, as ações da regressão na ordem em que
+# foram regredidas ao contrário (cada uma leva ao parcial pai).
 # -----------------------------------------------------------------------
-def reconstruir_caminho(encontro, pai_f, pai_t):
-    caminho = []
-
-    # ---- Do início até o nó de encontro
-    atual = encontro
+def reconstruir_caminho(encontro, t, pai_f, pai_t, acao_t, acoes):
     seq_f = []
-    while pai_f[atual] is not None:
-        pai, acao = pai_f[atual]
-        seq_f.append(acao)
+    atual = encontro
+    while pai_f[atual][0] is not None:
+        pai, i = pai_f[atual]
+        seq_f.append(acoes[i].nome)
         atual = pai
     seq_f.reverse()
 
-    # ---- Do encontro até o objetivo (ações reversas)
-    atual = encontro
     seq_t = []
-    while pai_t[atual] is not None:
-        pai, acao = pai_t[atual]
-        seq_t.append(acao)
-        atual = pai
+    while pai_t[t] is not None:
+        seq_t.append(acoes[acao_t[t]].nome)
+        t = pai_t[t]
 
-    # Ações do lado "trás" precisam ser invertidas semanticamente.
-    # Aqui mantemos o nome original mas é possível refinar se necessário.
-    seq_total = seq_f + [f"(rev) {a}" for a in seq_t]
+    return seq_f + seq_t
 
-    return seq_total
+
+# -----------------------------------------------------------------------
+# Índice dos estados da frente, para casar um estado parcial novo com
+# os estados já gerados: uma trie sobre as tuples ordenadas. Cada nó é
+# [menor g da subárvore, filhos, g do estado que termina nele, estado].
+#
+# A consulta desce só por fatos fora de neg e nunca pula o próximo
+# fato exigido de pos (os estados estão em ordem crescente); ramos
+# sem g abaixo do melhor já achado são descartados.
+# -----------------------------------------------------------------------
+class IndiceEstados:
+    def __init__(self):
+        self.raiz = [INFINITO, {}, INFINITO, None]
+
+    def inserir(self, estado, g):
+        no = self.raiz
+        for p in estado:
+            if g < no[0]:
+                no[0] = g
+            filhos = no[1]
+            if p not in filhos:
+                filhos[p] = [INFINITO, {}, INFINITO, None]
+            no = filhos[p]
+        if g < no[0]:
+            no[0] = g
+        if g < no[2]:
+            no[2] = g
+            no[3] = estado
+
+    def minimo(self, pos, neg, limite=INFINITO):
+        """
+        (g, estado) do estado de menor g contido em (pos, neg), ou None
+        se nenhum tiver g < limite.
+        """
+        exigidos = sorted(pos)
+        fim = len(exigidos)
+        melhor = limite
+        resultado = None
+        pilha = [(self.raiz, 0)]
+
+        while pilha:
+            (menor, filhos, g, estado), k = pilha.pop()
+            if menor >= melhor:
+                continue
+            if k == fim and g < melhor:
+                melhor = g
+                resultado = (g, estado)
+
+            proximo = exigidos[k] if k < fim else None
+            for p, filho in filhos.items():
+                if p in neg:
+                    continue
+                if proximo is None:
+                    pilha.append((filho, k))
+                elif p == proximo:
+                    pilha.append((filho, k + 1))
+                elif p < proximo:
+                    pilha.append((filho, k))
+
+        return resultado
 
 
 # -----------------------------------------------------------------------
-# Busca Bidirecional
+# Nível de cada fato no grafo de planejamento relaxado a partir do
+# estado inicial (h_max com ações de custo 1). É a heurística do lado
+# de trás do MM: um parcial precisa de pelo menos o maior nível entre
+# os fatos que exige.
 # -----------------------------------------------------------------------
-def bidirecional(INI, OBJ, acoes):
+def niveis(INI, acoes):
+    nivel = {p: 0 for p in INI}
+    pre = [[p for p in ac.pre if p > 0] for ac in acoes]
+    restantes = list(range(len(acoes)))
+    n = 0
+
+    while restantes:
+        n += 1
+        novos = []
+        pendentes = []
+        for i in restantes:
+            if all(p in nivel for p in pre[i]):
+                novos.extend(p for p in acoes[i].add if p not in nivel)
+            else:
+                pendentes.append(i)
+        if not novos:
+            break
+        for p in novos:
+            nivel.setdefault(p, n)
+        restantes = pendentes
+
+    return nivel
+
+
+# -----------------------------------------------------------------------
+# Busca bidirecional heurística MM
+#
+# A* para frente sobre estados e para trás sobre estados parciais,
+# sempre expandindo o lado com a menor prioridade pr = max(g + h, 2g).
+# Para frente, h é a heurística passada; para trás, o nível do fato
+# exigido mais caro (niveis). Cada nó gerado é casado com o outro lado
+# e U guarda o plano mais barato encontrado.
+#
+# Para quando U <= max(C, fmin_frente, fmin_tras, gmin_frente +
+# gmin_tras + 1), com C a menor prioridade das duas filas.
+# -----------------------------------------------------------------------
+def mm(INI, OBJ, acoes, h=heuristica_lmcut):
     """
+    h(estado, OBJ, acoes) deve ser admissível para o custo ser ótimo.
     Retorna: (custo, caminho, nos_expandidos)
     """
 
-    # Caso trivial
     if satisfaz_objetivo(INI, OBJ):
         return 0, [], 0
 
-    # FRONT (da esquerda)
-    frente = {INI}
-    fila_f = deque([INI])
-    pai_f = {INI: (None, None)}
+    regressao = Regressao(INI, OBJ, acoes)
+    nivel = niveis(INI, acoes)
 
-    # BACK (meta →)
-    # Para o lado do objetivo, precisamos de um ESTADO-OBJETIVO REAL
-    # OBJ é parcial, então geramos um estado mínimo satisfatório
-    objetivo = gerar_estado_objetivo_parcial(OBJ)
-    tras = {objetivo}
-    fila_t = deque([objetivo])
-    pai_t = {objetivo: (None, None)}
+    def h_tras(pos):
+        return max((nivel.get(p, INFINITO) for p in pos), default=0)
 
+    # FRENTE: estado -> g e (pai, índice da ação)
+    g_f = {INI: 0}
+    pai_f = {INI: (None, None)}
+    estados = IndiceEstados()
+    estados.inserir(INI, 0)
+
+    # TRÁS: parciais em listas paralelas; o item no índice guarda (g, id)
+    inicial = (frozenset(g for g in OBJ if g > 0), frozenset(-g for g in OBJ if g < 0))
+    parciais = [inicial]
+    pai_t = [None]
+    acao_t = [None]
+    g_t = [0]
+    vistos = {inicial: 0}
+    indice = IndiceParciais()
+    itens = [indice.inserir(inicial[0], inicial[1], (0, 0))]
+
+    # Três filas por lado, com remoção preguiçosa: por prioridade, por f
+    # e por g. Entradas (chave, desempate, nó, g)
+    frente = ([], [], [])
+    tras = ([], [], [])
+    fechados_f = set()
+    fechados_t = set()
+    desempate = count()
+
+    def valido_f(n, g):
+        return n not in fechados_f and g_f[n] == g
+
+    def valido_t(t, g):
+        return t not in fechados_t and g_t[t] == g
+
+    def inserir(filas, n, g, hn):
+        c = next(desempate)
+        heapq.heappush(filas[0], (max(g + hn, 2 * g), c, n, g))
+        heapq.heappush(filas[1], (g + hn, c, n, g))
+        heapq.heappush(filas[2], (g, c, n, g))
+
+    def minimo(fila, valido):
+        while fila and not valido(fila[0][2], fila[0][3]):
+            heapq.heappop(fila)
+        return fila[0][0] if fila else INFINITO
+
+    inserir(frente, INI, 0, h(INI, OBJ, acoes))
+    inserir(tras, 0, 0, h_tras(inicial[0]))
+
+    U = INFINITO
+    encontro = None   # (estado da frente, id do parcial)
     nos = 0
 
-    while fila_f and fila_t:
-        # ------------------------------------------------------
-        # Expansão da frente
-        # ------------------------------------------------------
-        atual = fila_f.popleft()
-        nos += 1
-
-        for prox, acao in sucessores(atual, acoes):
-            if prox not in frente:
-                frente.add(prox)
-                pai_f[prox] = (atual, acao)
-                fila_f.append(prox)
-
-                # Se encontrou o lado de trás
-                if prox in tras:
-                    caminho = reconstruir_caminho(prox, pai_f, pai_t)
-                    return len(caminho), caminho, nos
-
-        # ------------------------------------------------------
-        # Expansão de trás (predecessores)
-        # ------------------------------------------------------
-        atual = fila_t.popleft()
-
-        for prev, acao in predecessores(atual, acoes):
-            if prev not in tras:
-                tras.add(prev)
-                pai_t[prev] = (atual, acao)
-                fila_t.append(prev)
-
-                if prev in frente:
-                    caminho = reconstruir_caminho(prev, pai_f, pai_t)
-                    return len(caminho), caminho, nos
+    while True:
+        pr_f = minimo(frente[0], valido_f)
+        pr_t = minimo(tras[0], valido_t)
+        if pr_f == INFINITO or pr_t == INFINITO:
+            break
 
-    return None, [], nos
+        limite = max(min(pr_f, pr_t),
+                     minimo(frente[1], valido_f), minimo(tras[1], valido_t),
+                     minimo(frente[2], valido_f) + minimo(tras[2], valido_t) + 1)
+        if U <= limite:
+            break
 
+        nos += 1
 
-# -----------------------------------------------------------------------
-# Gera um estado mínimo que satisfaz OBJ
-#
-# OBJ contém predicados +p e -p. Para construir um estado válido:
-#   - inclua apenas os +p
-#   - nunca inclua os -p
-# -----------------------------------------------------------------------
-def gerar_estado_objetivo_parcial(OBJ):
-    est = []
-
-    for g in OBJ:
-        if g > 0:
-            est.append(g)
-
-    return tuple(sorted(est))
+        if pr_f <= pr_t:
+            # --------------------------------------------------
+            # Expansão da frente
+            # --------------------------------------------------
+            _, _, atual, g = heapq.heappop(frente[0])
+            fechados_f.add(atual)
+            g += 1
+
+            for prox, i in sucessores_ids(atual, acoes):
+                if prox in g_f and g_f[prox] <= g:
+                    continue
+                g_f[prox] = g
+                pai_f[prox] = (atual, i)
+                fechados_f.discard(prox)
+                estados.inserir(prox, g)
+
+                casado = indice.encontrar(prox)
+                if casado is not None and g + casado[0] < U:
+                    U = g + casado[0]
+                    encontro = (prox, casado[1])
+
+                hn = h(prox, OBJ, acoes)
+                if g + hn < U:
+                    inserir(frente, prox, g, hn)
+
+        else:
+            # --------------------------------------------------
+            # Expansão de trás (regressão)
+            # --------------------------------------------------
+            _, _, atual, g = heapq.heappop(tras[0])
+            fechados_t.add(atual)
+            g += 1
+
+            for i, pos, neg in regressao.regredir(*parciais[atual]):
+                hn = h_tras(pos)
+                if g + hn >= U:
+                    continue
+
+                chave = (pos, neg)
+                novo = vistos.get(chave)
+                if novo is None:
+                    novo = len(parciais)
+                    vistos[chave] = novo
+                    parciais.append(chave)
+                    pai_t.append(atual)
+                    acao_t.append(i)
+                    g_t.append(g)
+                    itens.append(indice.inserir(pos, neg, (g, novo)))
+                elif g < g_t[novo]:
+                    pai_t[novo] = atual
+                    acao_t[novo] = i
+                    g_t[novo] = g
+                    itens[novo][1] = (g, novo)
+                    fechados_t.discard(novo)
+                else:
+                    continue
+
+                casado = estados.minimo(pos, neg, U - g)
+                if casado is not None:
+                    U = g + casado[0]
+                    encontro = (casado[1], novo)
+
+                inserir(tras, novo, g, hn)
+
+    if encontro is None:
+        return None, [], nos
+
+    estado, t = encontro
+    caminho = reconstruir_caminho(estado, t, pai_f, pai_t, acao_t, acoes)
+    return len(caminho), caminho, nos
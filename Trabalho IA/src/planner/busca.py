@@ -4,8 +4,9 @@
 #   - sucessores
 #   - BFS
 #   - DFS limitada
-#   - IDS
+#   - IDS (retomando da fronteira da iteração anterior)
 #   - A*
+#   - GBFS (busca gulosa com h_FF e operadores preferidos)
 #
 # Cada estado é representado como uma tupla ordenada de ints positivos.
 # Cada ação é um objeto Acao contendo pré-condições e efeitos.
@@ -16,14 +17,19 @@
 #
 # -------------------------------------------------------------------------
 
-from collections import deque
+from array import array
 import heapq
 
-from planner.heuristica import heuristica
+from planner.heuristica import heuristica, heuristica_ff, heuristica_lmcut, heuristica_blocos, INFINITO
+from planner.nos import PoolNos
+from planner.fechados import ListaFechada, largura_para
+from planner.sucessores import obter_gerador
+from planner.objetivo import obter_contador
 
 
 # -------------------------------------------------------------------------
-# Gera sucessores aplicando TODAS as ações possíveis
+# Gera sucessores aplicando as ações aplicáveis, encontradas pelo
+# gerador pré-compilado (planner/sucessores.py)
 # -------------------------------------------------------------------------
 def sucessores(estado, acoes):
     """
@@ -33,13 +39,36 @@ def sucessores(estado, acoes):
     Retorna uma lista:
         [(novo_estado, nome_da_acao), ...]
     """
+    return [(novo, acoes[i].nome) for novo, i in sucessores_ids(estado, acoes)]
+
+
+def sucessores_ids(estado, acoes):
+    """
+    Igual a sucessores, mas devolve o índice da ação na lista:
+        [(novo_estado, indice_da_acao), ...]
+    """
+    est_set = set(estado)
+    suc = []
+
+    for i in obter_gerador(acoes).aplicaveis(est_set):
+        novo = acoes[i].aplicar(est_set)
+        suc.append((novo, i))
+
+    return suc
+
+
+def sucessores_contados(estado, acoes, contador, faltam):
+    """
+    Igual a sucessores_ids, levando junto a contagem de objetivos
+    não satisfeitos de cada sucessor (calculada a partir de faltam):
+        [(novo_estado, indice_da_acao, faltam_novo), ...]
+    """
     est_set = set(estado)
     suc = []
 
-    for ac in acoes:
-        if ac.aplicavel(est_set):
-            novo = ac.aplicar(est_set)
-            suc.append((novo, ac.nome))
+    for i in obter_gerador(acoes).aplicaveis(est_set):
+        novo = acoes[i].aplicar(est_set)
+        suc.append((novo, i, faltam + contador.delta(i, est_set)))
 
     return suc
 
@@ -71,110 +100,350 @@ def satisfaz_objetivo(estado, OBJ):
 # -------------------------------------------------------------------------
 # BFS
 # -------------------------------------------------------------------------
-def bfs(INI, OBJ, acoes):
-    fila = deque([(INI, 0, [])])
-    visit = {INI}
-    nos = 0
+def bfs(INI, OBJ, acoes, estatisticas=None):
+    """
+    Se estatisticas (dict) for passado, recebe a memória da lista fechada.
+    """
+    # Os estados ficam só na lista fechada empacotada; a ordem de
+    # inserção no pool é a própria ordem da fila
+    contador = obter_contador(acoes, OBJ)
+    visit = ListaFechada(largura_para(INI, OBJ, acoes))
+    pool = PoolNos(visit)
+    sid, _ = visit.adicionar(INI)
+    pool.adicionar_id(sid, -1, -1, 0, contador.faltando(set(INI)))
+    cabeca = 0
 
-    while fila:
-        estado, custo, caminho = fila.popleft()
-        nos += 1
+    while cabeca < len(pool):
+        custo = pool.g[cabeca]
 
-        if satisfaz_objetivo(estado, OBJ):
-            return custo, caminho, nos
+        if pool.faltam[cabeca] == 0:
+            resultado = custo, pool.caminho(cabeca, acoes), cabeca + 1
+            break
 
-        for prox, mov in sucessores(estado, acoes):
-            if prox not in visit:
-                visit.add(prox)
-                fila.append((prox, custo + 1, caminho + [mov]))
+        estado = pool.estado_de(cabeca)
+        for prox, i, faltam in sucessores_contados(estado, acoes, contador, pool.faltam[cabeca]):
+            sid, novo = visit.adicionar(prox)
+            if novo:
+                pool.adicionar_id(sid, cabeca, i, custo + 1, faltam)
 
-    return None, [], nos
+        cabeca += 1
+    else:
+        resultado = None, [], cabeca
+
+    if estatisticas is not None:
+        estatisticas["memoria_fechados"] = visit.memoria()
+
+    return resultado
 
 
 # -------------------------------------------------------------------------
 # DFS com limite de profundidade
 # -------------------------------------------------------------------------
 def dfs_limited(INI, OBJ, acoes, limite=30):
-    pilha = [(INI, 0, [])]
-    visit = set()
+    contador = obter_contador(acoes, OBJ)
+    pilha = [(INI, 0, [], contador.faltando(set(INI)))]
+    # Estado -> menor profundidade em que foi visto: um estado alcançado
+    # de novo mais raso precisa ser expandido de novo, senão o limite
+    # corta planos que existem (DFS chega primeiro pelo caminho longo)
+    visit = {}
     nos = 0
 
     while pilha:
-        estado, custo, caminho = pilha.pop()
+        estado, custo, caminho, faltam = pilha.pop()
         nos += 1
 
-        if estado in visit:
+        if visit.get(estado, limite + 1) <= custo:
             continue
-        visit.add(estado)
+        visit[estado] = custo
 
-        if satisfaz_objetivo(estado, OBJ):
+        if faltam == 0:
             return custo, caminho, nos
 
         if custo >= limite:
             continue
 
-        for prox, mov in sucessores(estado, acoes):
-            pilha.append((prox, custo + 1, caminho + [mov]))
+        for prox, i, f in sucessores_contados(estado, acoes, contador, faltam):
+            pilha.append((prox, custo + 1, caminho + [acoes[i].nome], f))
 
     return None, [], nos
 
 
 # -------------------------------------------------------------------------
-# Busca em profundidade iterativa
+# Busca em profundidade iterativa que retoma da fronteira anterior
+#
+# Enquanto couber no orçamento (bytes), os estados da profundidade L
+# ficam numa lista fechada compacta, com o caminho até cada um num
+# array('H') (L índices de ação por estado), e a iteração L + 1 só
+# expande essa fronteira. Duplicatas são descartadas contra a fronteira
+# nova e as duas anteriores, o que basta para ações reversíveis como as
+# do mundo dos blocos (sem isso só há trabalho repetido).
+#
+# Se a fronteira nova estourar o orçamento, ela é descartada e as
+# iterações seguintes fazem DFS limitada a partir de cada estado da
+# última fronteira guardada, em vez de recomeçar da raiz.
 # -------------------------------------------------------------------------
-def ids(INI, OBJ, acoes, max_lim=50):
-    total = 0
+ORCAMENTO_FRONTEIRA = 32 * 1024 * 1024
+
+
+def ids(INI, OBJ, acoes, max_lim=50, orcamento=ORCAMENTO_FRONTEIRA):
+    contador = obter_contador(acoes, OBJ)
+    faltam_ini = contador.faltando(set(INI))
+    if faltam_ini == 0:
+        return 0, [], 1
+
+    largura = largura_para(INI, OBJ, acoes)
+    atual = ListaFechada(largura)
+    atual.adicionar(INI)
+    caminhos = array('H')
+    faltam = array('i', [faltam_ini])
+    anterior = None
+    prof = 0
+    nos = 0
+    L = 0
+
+    while L < max_lim:
+        L += 1
+        proxima = ListaFechada(largura)
+        novos_caminhos = array('H')
+        novos_faltam = array('i')
+        base = atual.memoria() + caminhos.itemsize * len(caminhos)
+        if anterior is not None:
+            base += anterior.memoria()
+        estourou = False
+
+        for sid in range(len(atual)):
+            caminho = caminhos[sid * prof:(sid + 1) * prof]
+            nos += 1
 
-    for L in range(max_lim):
-        pilha = [(INI, 0, [])]
-        visit = set()
-        nos = 0
+            for prox, i, f in sucessores_contados(atual[sid], acoes, contador, faltam[sid]):
+                if f == 0:
+                    return L, [acoes[j].nome for j in caminho.tolist() + [i]], nos
+                if prox in atual or (anterior is not None and prox in anterior):
+                    continue
+                _, novo = proxima.adicionar(prox)
+                if novo:
+                    novos_caminhos.extend(caminho)
+                    novos_caminhos.append(i)
+                    novos_faltam.append(f)
+
+            usada = base + proxima.memoria() + novos_caminhos.itemsize * len(novos_caminhos)
+            if usada > orcamento:
+                estourou = True
+                break
+
+        if estourou:
+            # A iteração L é refeita regenerando a partir da fronteira guardada
+            L -= 1
+            break
+        if not len(proxima):
+            return None, [], nos
+
+        anterior, atual, caminhos, faltam, prof = atual, proxima, novos_caminhos, novos_faltam, L
+
+    while L < max_lim:
+        L += 1
+        corte = False
+
+        for sid in range(len(atual)):
+            plano, n, c = _dfs_limitado(atual[sid], faltam[sid], L - prof, acoes, contador)
+            nos += n
+            corte = corte or c
+            if plano is not None:
+                caminho = caminhos[sid * prof:(sid + 1) * prof].tolist()
+                return L, [acoes[j].nome for j in caminho + plano], nos
+
+        if not corte:
+            break
 
-        while pilha:
-            estado, custo, caminho = pilha.pop()
-            nos += 1
+    return None, [], nos
 
-            if estado in visit:
-                continue
-            visit.add(estado)
 
-            if satisfaz_objetivo(estado, OBJ):
-                return custo, caminho, total + nos
+def _dfs_limitado(estado, faltam, limite, acoes, contador):
+    """
+    DFS com pilha explícita até a profundidade limite, evitando só os
+    estados do próprio caminho (memória linear no limite).
 
-            if custo < L:
-                for prox, mov in sucessores(estado, acoes):
-                    pilha.append((prox, custo + 1, caminho + [mov]))
+    Retorna (índices das ações do plano ou None, nós expandidos,
+    True se algum nó ficou no limite).
+    """
+    estados = [estado]
+    no_caminho = {estado}
+    plano = []
+    pilha = [sucessores_contados(estado, acoes, contador, faltam)]
+    posicoes = [0]
+    nos = 1
+    corte = False
 
-        total += nos
+    while pilha:
+        lista = pilha[-1]
+        k = posicoes[-1]
+        if k == len(lista):
+            pilha.pop()
+            posicoes.pop()
+            no_caminho.discard(estados.pop())
+            if plano:
+                plano.pop()
+            continue
+        posicoes[-1] = k + 1
 
-    return None, [], total
+        prox, i, f = lista[k]
+        if prox in no_caminho:
+            continue
+        if f == 0:
+            plano.append(i)
+            return plano, nos, corte
+        if len(estados) >= limite:
+            corte = True
+            continue
+
+        nos += 1
+        estados.append(prox)
+        no_caminho.add(prox)
+        plano.append(i)
+        pilha.append(sucessores_contados(prox, acoes, contador, f))
+        posicoes.append(0)
+
+    return None, nos, corte
 
 
 # -------------------------------------------------------------------------
-# A* usando heurística definida em heuristics.py
+# A* usando uma heurística de heuristica.py (padrão: contagem de objetivos)
 # -------------------------------------------------------------------------
-def astar(INI, OBJ, acoes):
-    aberta = [(heuristica(INI, OBJ), 0, INI, [])]  # (f=g+h, g, estado, caminho)
+def astar(INI, OBJ, acoes, h=heuristica):
+    """
+    h(estado, OBJ, acoes) deve ser admissível para o custo ser ótimo.
+    Retorna (custo, caminho, nós expandidos).
+    """
+    contador = obter_contador(acoes, OBJ)
+    # A contagem de objetivos já vem do contador de cada nó
+    contagem = h is heuristica
+
+    pool = PoolNos()
+    faltam_ini = contador.faltando(set(INI))
+    raiz = pool.adicionar(INI, -1, -1, 0, faltam_ini)
+    h_ini = faltam_ini if contagem else h(INI, OBJ, acoes)
+    aberta = [(h_ini, 0, raiz)]  # (f=g+h, g, índice do nó)
     visit = {}
     nos = 0
 
     while aberta:
-        f, g, estado, caminho = heapq.heappop(aberta)
+        _, g, n = heapq.heappop(aberta)
+        estado = pool.estado_de(n)
         nos += 1
 
-        if satisfaz_objetivo(estado, OBJ):
-            return g, caminho, nos
+        if pool.faltam[n] == 0:
+            return g, pool.caminho(n, acoes), nos
 
         if estado in visit and visit[estado] <= g:
             continue
 
         visit[estado] = g
 
-        for prox, mov in sucessores(estado, acoes):
+        for prox, i, faltam in sucessores_contados(estado, acoes, contador, pool.faltam[n]):
             ng = g + 1
 
             if prox not in visit or visit[prox] > ng:
-                nf = ng + heuristica(prox, OBJ)
-                heapq.heappush(aberta, (nf, ng, prox, caminho + [mov]))
+                nf = ng + (faltam if contagem else h(prox, OBJ, acoes))
+                heapq.heappush(aberta, (nf, ng, pool.adicionar(prox, n, i, ng, faltam)))
 
     return None, [], nos
+
+
+def astar_lmcut(INI, OBJ, acoes):
+    return astar(INI, OBJ, acoes, heuristica_lmcut)
+
+
+def astar_blocos(INI, OBJ, acoes):
+    return astar(INI, OBJ, acoes, heuristica_blocos)
+
+
+# -------------------------------------------------------------------------
+# Busca gulosa (GBFS) com h_FF e operadores preferidos
+# -------------------------------------------------------------------------
+BONUS_PREFERIDOS = 1000
+
+
+def gbfs(INI, OBJ, acoes, estatisticas=None):
+    """
+    Avaliação preguiçosa: cada nó entra na fila com o h do pai e só é
+    avaliado ao sair. Sucessores gerados por ações úteis entram também
+    na fila de preferidos; as filas se alternam, e a de preferidos
+    ganha BONUS_PREFERIDOS escolhas a cada melhora do melhor h.
+
+    O plano não é necessariamente ótimo.
+    """
+    objetivo = obter_contador(acoes, OBJ)
+    faltam_ini = objetivo.faltando(set(INI))
+    if faltam_ini == 0:
+        return 0, [], 1
+
+    # Cada estado inserido na lista fechada ganha exatamente um nó,
+    # então o índice do nó é o próprio id do estado
+    visit = ListaFechada(largura_para(INI, OBJ, acoes))
+    pool = PoolNos(visit)
+    sid, _ = visit.adicionar(INI)
+    pool.adicionar_id(sid, -1, -1, 0, faltam_ini)
+
+    contador = 0
+    filas = ([(0, contador, 0)], [])
+    expandido = bytearray(1)
+    melhor = INFINITO
+    bonus = 0
+    vez = 0
+    nos = 0
+    resultado = None
+
+    while filas[0] or filas[1]:
+        if filas[1] and (bonus > 0 or vez or not filas[0]):
+            fila = filas[1]
+            bonus -= 1
+        else:
+            fila = filas[0]
+        vez ^= 1
+
+        _, _, n = heapq.heappop(fila)
+        if expandido[n]:
+            continue
+        expandido[n] = 1
+        nos += 1
+
+        estado = pool.estado_de(n)
+        h, uteis = heuristica_ff(estado, OBJ, acoes)
+        if h == INFINITO:
+            continue
+        if h < melhor:
+            melhor = h
+            bonus += BONUS_PREFERIDOS
+
+        g = pool.g[n] + 1
+        for prox, i, faltam in sucessores_contados(estado, acoes, objetivo, pool.faltam[n]):
+            sid, novo = visit.adicionar(prox)
+            if not novo:
+                # Já gerado: se veio agora por uma ação útil, vira preferido
+                if i in uteis and not expandido[sid]:
+                    contador += 1
+                    heapq.heappush(filas[1], (h, contador, sid))
+                continue
+
+            pool.adicionar_id(sid, n, i, g, faltam)
+            expandido.append(0)
+
+            if faltam == 0:
+                resultado = g, pool.caminho(sid, acoes), nos
+                break
+
+            contador += 1
+            heapq.heappush(filas[0], (h, contador, sid))
+            if i in uteis:
+                heapq.heappush(filas[1], (h, contador, sid))
+
+        if resultado is not None:
+            break
+
+    if resultado is None:
+        resultado = None, [], nos
+
+    if estatisticas is not None:
+        estatisticas["memoria_fechados"] = visit.memoria()
+
+    return resultado
@@ -0,0 +1,142 @@
+# fechados.py
+# -------------------------------------------------------------------------
+# Lista fechada compacta com endereçamento aberto.
+#
+# Um conjunto Python de tuplas gasta centenas de bytes por estado. Aqui
+# cada estado vira uma chave de largura fixa (um bit por proposição)
+# guardada num único bytearray, na ordem de inserção; a posição é o id
+# do estado. A tabela de espalhamento guarda apenas índices (array('i'))
+# com sondagem linear e dobra de tamanho ao passar da carga máxima.
+#
+#   chaves   -> bytearray com n * largura bytes
+#   hashes   -> array('Q') com o hash de cada chave
+#   indices  -> array('i') da tabela de espalhamento (-1 = vazio)
+# -------------------------------------------------------------------------
+
+from array import array
+
+VAZIO = -1
+CARGA_MAXIMA = 0.5
+MASCARA_64 = (1 << 64) - 1
+
+
+def largura_para(INI, OBJ, acoes):
+    """
+    Número de bytes necessário para um bit por proposição da instância.
+    """
+    maior = max(INI, default=0)
+    maior = max(maior, max((abs(g) for g in OBJ), default=0))
+    for ac in acoes:
+        maior = max(maior, max(ac.add, default=0), max(ac.delete, default=0),
+                    max((abs(p) for p in ac.pre), default=0))
+    return maior // 8 + 1
+
+
+class ListaFechada:
+    """
+    Conjunto de estados (tuplas de proposições) empacotados em bytes.
+    """
+
+    def __init__(self, largura, capacidade=1024):
+        self.largura = largura
+        self.chaves = bytearray()
+        self.hashes = array('Q')
+
+        tamanho = 1
+        while tamanho < capacidade:
+            tamanho *= 2
+        self.indices = array('i', [VAZIO]) * tamanho
+        self.mascara = tamanho - 1
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def __getitem__(self, sid):
+        """
+        Devolve o estado de id sid como tupla ordenada de proposições.
+        """
+        w = self.largura
+        return self.desempacotar(self.chaves[sid * w:(sid + 1) * w])
+
+    def empacotar(self, estado):
+        x = 0
+        for p in estado:
+            x |= 1 << p
+        return x.to_bytes(self.largura, "little")
+
+    @staticmethod
+    def desempacotar(chave):
+        x = int.from_bytes(chave, "little")
+        estado = []
+        while x:
+            baixo = x & -x
+            estado.append(baixo.bit_length() - 1)
+            x ^= baixo
+        return tuple(estado)
+
+    # ----------------------------------------------------
+
+    def _procurar(self, h, chave):
+        w = self.largura
+        indices = self.indices
+        mascara = self.mascara
+        pos = h & mascara
+
+        while True:
+            sid = indices[pos]
+            if sid == VAZIO:
+                return pos, VAZIO
+            if self.hashes[sid] == h and self.chaves[sid * w:(sid + 1) * w] == chave:
+                return pos, sid
+            pos = (pos + 1) & mascara
+
+    def adicionar(self, estado):
+        """
+        Insere o estado se ainda não estiver na lista.
+
+        Retorna (id do estado, True se foi inserido agora).
+        """
+        return self.adicionar_chave(self.empacotar(estado))
+
+    def adicionar_chave(self, chave):
+        """
+        Igual a adicionar, com o estado já empacotado.
+        """
+        h = hash(chave) & MASCARA_64
+        pos, sid = self._procurar(h, chave)
+        if sid != VAZIO:
+            return sid, False
+
+        sid = len(self.hashes)
+        self.chaves += chave
+        self.hashes.append(h)
+        self.indices[pos] = sid
+
+        if len(self.hashes) > CARGA_MAXIMA * len(self.indices):
+            self._redimensionar()
+        return sid, True
+
+    def __contains__(self, estado):
+        chave = self.empacotar(estado)
+        return self._procurar(hash(chave) & MASCARA_64, chave)[1] != VAZIO
+
+    def _redimensionar(self):
+        tamanho = len(self.indices) * 2
+        self.indices = array('i', [VAZIO]) * tamanho
+        self.mascara = tamanho - 1
+
+        indices = self.indices
+        mascara = self.mascara
+        for sid, h in enumerate(self.hashes):
+            pos = h & mascara
+            while indices[pos] != VAZIO:
+                pos = (pos + 1) & mascara
+            indices[pos] = sid
+
+    def memoria(self):
+        """
+        Bytes ocupados pelos buffers da tabela.
+        """
+        return (len(self.chaves)
+                + self.hashes.itemsize * len(self.hashes)
+                + self.indices.itemsize * len(self.indices))
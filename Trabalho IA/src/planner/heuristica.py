@@ -11,12 +11,24 @@
 # Retorna:
 #   h(estado) : valor heurístico inteiro
 #
+# heuristica_ff recebe também a lista de ações e devolve (h, ações úteis).
+# heuristica_lmcut e heuristica_blocos recebem (estado, OBJ, acoes) e
+# devolvem h.
+#
 # -------------------------------------------------------------------
 
-def heuristica(estado, OBJ):
+import heapq
+
+from planner.mapeamento import propos_rev
+
+INFINITO = float("inf")
+
+
+def heuristica(estado, OBJ, acoes=None):
     """
     Heurística admissível simples:
     Conta quantos predicados do objetivo ainda NÃO estão satisfeitos.
+    (acoes é ignorado; existe só para ter a mesma assinatura das outras)
 
     OBJ contém ints positivos e negativos:
         +p -> proposição p deve estar no estado
@@ -41,11 +53,372 @@ def heuristica(estado, OBJ):
 
 
 # -------------------------------------------------------------------
-# Se quiser adicionar mais heurísticas no futuro, coloque aqui:
+# h_FF (relaxação sem deletes)
+# -------------------------------------------------------------------
 #
-# def h_max(...):
-# def h_add(...):
-# def h_relaxed(...):
+# Os custos dos fatos são calculados como no h_add (Dijkstra com um
+# contador de pré-condições pendentes por ação). Depois, a partir dos
+# objetivos, segue-se a melhor ação de cada fato para extrair um plano
+# relaxado; h_FF é o número de ações desse plano.
 #
-# E no search.py basta trocar a heurística usada no A*.
+# As ações do plano relaxado aplicáveis no próprio estado são as
+# "ações úteis", usadas como operadores preferidos na busca gulosa.
 # -------------------------------------------------------------------
+
+class Relaxacao:
+    """
+    Listas de incidência fato -> ações, montadas uma vez por lista de ações.
+    Pré-condições negativas são ignoradas na relaxação.
+    """
+
+    def __init__(self, acoes):
+        self.acoes = acoes
+        self.pre = [tuple(p for p in ac.pre if p > 0) for ac in acoes]
+        self.usada_por = {}
+        self.sem_pre = []
+
+        for i, pre in enumerate(self.pre):
+            for p in pre:
+                self.usada_por.setdefault(p, []).append(i)
+            if not pre:
+                self.sem_pre.append(i)
+
+    def custos(self, est_set, objetivos):
+        """
+        Retorna (custo, suporte): custo relaxado dos fatos alcançados e a
+        ação que os alcança mais barato. Para quando todos os objetivos
+        positivos já tiverem custo definitivo.
+        """
+        custo = {p: 0 for p in est_set}
+        suporte = {}
+        faltam = [len(pre) for pre in self.pre]
+        acumulado = [0] * len(faltam)
+        restantes = set(objetivos)
+        acoes = self.acoes
+
+        fila = [(0, p) for p in est_set]
+        for i in self.sem_pre:
+            for e in acoes[i].add:
+                if e not in custo:
+                    custo[e] = 1
+                    suporte[e] = i
+                    fila.append((1, e))
+        heapq.heapify(fila)
+
+        while fila and restantes:
+            c, p = heapq.heappop(fila)
+            if c > custo[p]:
+                continue
+            restantes.discard(p)
+
+            for i in self.usada_por.get(p, ()):
+                acumulado[i] += c
+                faltam[i] -= 1
+                if faltam[i] == 0:
+                    nc = acumulado[i] + 1
+                    for e in acoes[i].add:
+                        if nc < custo.get(e, INFINITO):
+                            custo[e] = nc
+                            suporte[e] = i
+                            heapq.heappush(fila, (nc, e))
+
+        return custo, suporte
+
+
+_relaxacao = (None, None)
+
+
+def obter_relaxacao(acoes):
+    global _relaxacao
+
+    if _relaxacao[0] is not acoes:
+        _relaxacao = (acoes, Relaxacao(acoes))
+
+    return _relaxacao[1]
+
+
+def heuristica_ff(estado, OBJ, acoes):
+    """
+    Retorna (h_FF, ações úteis). h é INFINITO se algum objetivo positivo
+    não é alcançável nem na relaxação; objetivos negativos violados
+    contam 1 cada.
+    """
+    relax = obter_relaxacao(acoes)
+    est_set = set(estado)
+    positivos = [g for g in OBJ if g > 0 and g not in est_set]
+    negativos = sum(1 for g in OBJ if g < 0 and -g in est_set)
+
+    custo, suporte = relax.custos(est_set, positivos)
+
+    plano = set()
+    pilha = []
+    for g in positivos:
+        if g not in custo:
+            return INFINITO, []
+        pilha.append(g)
+
+    marcados = set(pilha)
+    while pilha:
+        i = suporte[pilha.pop()]
+        if i in plano:
+            continue
+        plano.add(i)
+        for p in relax.pre[i]:
+            if p not in est_set and p not in marcados:
+                marcados.add(p)
+                pilha.append(p)
+
+    uteis = [i for i in plano if all(p in est_set for p in relax.pre[i])]
+    return len(plano) + negativos, uteis
+
+
+# -------------------------------------------------------------------
+# LM-cut (admissível)
+# -------------------------------------------------------------------
+#
+# Repete até h_max(objetivo) chegar a zero:
+#   1. h_max com os custos atuais, guardando o suporte de cada ação
+#      (a pré-condição de maior custo);
+#   2. zona do objetivo: fatos ligados ao objetivo por ações de custo 0
+#      no grafo de justificação (suporte -> efeito);
+#   3. corte: ações alcançáveis a partir do estado, sem passar pela
+#      zona, com algum efeito dentro dela;
+#   4. h += menor custo do corte, descontado de todas as ações do corte.
+#
+# Só a primeira rodada calcula h_max do zero; nas seguintes os custos
+# apenas diminuem, e a redução é propagada a partir do corte.
+#
+# O fato artificial INICIO é pré-condição das ações sem pré-condição,
+# e FIM é o efeito da ação artificial do objetivo (custo 0).
+# -------------------------------------------------------------------
+
+INICIO = 0
+FIM = -1
+
+
+class LMCut:
+    """
+    Estruturas do LM-cut, montadas uma vez por lista de ações e objetivo.
+    """
+
+    def __init__(self, acoes, OBJ):
+        self.pre = [tuple(p for p in ac.pre if p > 0) or (INICIO,) for ac in acoes]
+        self.efeitos = [tuple(ac.add) for ac in acoes]
+
+        # Ação artificial do objetivo, sempre a última
+        self.pre.append(tuple(g for g in OBJ if g > 0) or (INICIO,))
+        self.efeitos.append((FIM,))
+        self.custo_original = [1] * len(acoes) + [0]
+
+        self.usada_por = {}
+        self.adicionada_por = {}
+        for i, pre in enumerate(self.pre):
+            for p in pre:
+                self.usada_por.setdefault(p, []).append(i)
+            for e in self.efeitos[i]:
+                self.adicionada_por.setdefault(e, []).append(i)
+
+    def hmax(self, est_set, custo_acao):
+        """
+        Retorna (custo dos fatos, suporte das ações alcançadas).
+        """
+        custo = {p: 0 for p in est_set}
+        custo[INICIO] = 0
+        suporte = {}
+        faltam = [len(pre) for pre in self.pre]
+
+        fila = [(0, p) for p in custo]
+        heapq.heapify(fila)
+
+        while fila:
+            c, p = heapq.heappop(fila)
+            if c > custo[p]:
+                continue
+
+            for i in self.usada_por.get(p, ()):
+                faltam[i] -= 1
+                if faltam[i] == 0:
+                    # A última pré-condição a sair da fila é a mais cara
+                    suporte[i] = p
+                    nc = c + custo_acao[i]
+                    for e in self.efeitos[i]:
+                        if nc < custo.get(e, INFINITO):
+                            custo[e] = nc
+                            heapq.heappush(fila, (nc, e))
+
+        return custo, suporte
+
+    def reduzir(self, corte, m, custo, suporte, custo_acao):
+        """
+        Desconta m das ações do corte e propaga a redução de h_max a
+        partir dos efeitos delas (os custos só diminuem).
+        """
+        fila = []
+        for i in corte:
+            custo_acao[i] -= m
+            nc = custo[suporte[i]] + custo_acao[i]
+            for e in self.efeitos[i]:
+                if nc < custo[e]:
+                    custo[e] = nc
+                    heapq.heappush(fila, (nc, e))
+
+        while fila:
+            c, p = heapq.heappop(fila)
+            if c > custo[p]:
+                continue
+            for i in self.usada_por.get(p, ()):
+                if suporte.get(i) != p:
+                    continue
+                s = max(self.pre[i], key=custo.__getitem__)
+                suporte[i] = s
+                nc = custo[s] + custo_acao[i]
+                for e in self.efeitos[i]:
+                    if nc < custo[e]:
+                        custo[e] = nc
+                        heapq.heappush(fila, (nc, e))
+
+    def avaliar(self, estado):
+        est_set = set(estado)
+        custo_acao = self.custo_original[:]
+        h = 0
+
+        custo, suporte = self.hmax(est_set, custo_acao)
+        if FIM not in custo:
+            return INFINITO
+
+        while custo[FIM] > 0:
+            zona = {FIM}
+            pilha = [FIM]
+            while pilha:
+                e = pilha.pop()
+                for i in self.adicionada_por.get(e, ()):
+                    s = suporte.get(i)
+                    if custo_acao[i] == 0 and s is not None and s not in zona:
+                        zona.add(s)
+                        pilha.append(s)
+
+            corte = set()
+            alcancados = set(est_set)
+            alcancados.add(INICIO)
+            pilha = list(alcancados)
+            while pilha:
+                p = pilha.pop()
+                for i in self.usada_por.get(p, ()):
+                    if suporte.get(i) != p:
+                        continue
+                    for e in self.efeitos[i]:
+                        if e in zona:
+                            corte.add(i)
+                        elif e not in alcancados:
+                            alcancados.add(e)
+                            pilha.append(e)
+
+            m = min(custo_acao[i] for i in corte)
+            h += m
+            self.reduzir(corte, m, custo, suporte, custo_acao)
+
+        return h
+
+
+_lmcut = (None, None, None)
+
+
+def heuristica_lmcut(estado, OBJ, acoes):
+    """
+    LM-cut sobre a relaxação sem deletes (pré-condições e objetivos
+    negativos são ignorados, o que mantém a admissibilidade).
+    """
+    global _lmcut
+
+    if _lmcut[0] is not acoes or _lmcut[1] != OBJ:
+        _lmcut = (acoes, OBJ, LMCut(acoes, OBJ))
+
+    return _lmcut[2].avaliar(estado)
+
+
+# -------------------------------------------------------------------
+# Heurística específica do mundo dos blocos (admissível)
+# -------------------------------------------------------------------
+#
+# A posição de cada bloco sai dos nomes das proposições (on_x_y,
+# ontable_x, holding_x) em propos_rev. Subindo cada torre a partir da
+# mesa, um bloco precisa sair do lugar se o objetivo o quer sobre outro
+# suporte, se o objetivo quer outro bloco sobre o suporte dele, ou se
+# algum bloco abaixo dele precisa sair. Cada um custa pelo menos 2
+# ações (tirar e colocar) e o bloco na mão custa 1. O(blocos) por
+# estado, sem grafo relaxado.
+#
+# -------------------------------------------------------------------
+
+class Blocos:
+    def __init__(self, OBJ):
+        # pid -> (predicado, bloco, suporte), só para as proposições de posição
+        self.fatos = {}
+        for pid, nome in propos_rev.items():
+            partes = nome.split("_")
+            if partes[0] == "on" and len(partes) == 3:
+                self.fatos[pid] = ("on", partes[1], partes[2])
+            elif partes[0] in ("ontable", "holding") and len(partes) == 2:
+                self.fatos[pid] = (partes[0], partes[1], None)
+
+        if not any(f[0] != "holding" for f in self.fatos.values()):
+            raise ValueError("heuristica_blocos só vale para o mundo dos blocos")
+
+        # suporte final de cada bloco (None = mesa) e bloco exigido sobre cada suporte
+        self.destino = {}
+        self.exigido = {}
+        for g in OBJ:
+            if g not in self.fatos:
+                continue
+            predicado, bloco, suporte = self.fatos[g]
+            if predicado == "on":
+                self.destino[bloco] = suporte
+                self.exigido[suporte] = bloco
+            elif predicado == "ontable":
+                self.destino[bloco] = None
+
+    def avaliar(self, estado):
+        h = 0
+        acima = {}
+        na_mesa = []
+        for p in estado:
+            fato = self.fatos.get(p)
+            if fato is None:
+                continue
+            predicado, bloco, suporte = fato
+            if predicado == "on":
+                acima[suporte] = bloco
+            elif predicado == "ontable":
+                na_mesa.append(bloco)
+            else:
+                h += 1
+
+        for bloco in na_mesa:
+            suporte = None
+            errado = False
+            while bloco is not None:
+                if not errado:
+                    errado = ((bloco in self.destino and self.destino[bloco] != suporte)
+                              or (suporte is not None and self.exigido.get(suporte, bloco) != bloco))
+                if errado:
+                    h += 2
+                suporte = bloco
+                bloco = acima.get(bloco)
+
+        return h
+
+
+_blocos = (None, None, None)
+
+
+def heuristica_blocos(estado, OBJ, acoes):
+    """
+    Blocos fora do lugar (x2) + bloco na mão. Os nomes são lidos uma vez
+    por instância (acoes identifica a instância carregada).
+    """
+    global _blocos
+
+    if _blocos[0] is not acoes or _blocos[1] != OBJ:
+        _blocos = (acoes, OBJ, Blocos(OBJ))
+
+    return _blocos[2].avaliar(estado)
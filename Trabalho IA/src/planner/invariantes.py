@@ -0,0 +1,86 @@
+# invariantes.py
+# -------------------------------------------------------------------------
+# Síntese de invariantes (grupos de mutex), usada pela regressão da busca
+# bidirecional (planner/bidirecional.py) para descartar estados parciais
+# impossíveis.
+#
+# Um grupo G de proposições é invariante ("no máximo uma verdadeira")
+# se o estado inicial tem no máximo uma proposição de G e toda ação que
+# torna verdadeira uma proposição de G também apaga outra de G que está
+# na sua pré-condição. No mundo dos blocos aparecem, por exemplo,
+# {on_x_*, ontable_x, holding_x} e {handempty, holding_*}.
+#
+# Cada grupo nasce de uma proposição e cresce por busca com retrocesso:
+# a cada ação que viola o grupo, tenta incluir um dos fatos que ela
+# apaga. LIMITE_EXPANSOES limita o trabalho por semente.
+# -------------------------------------------------------------------------
+LIMITE_EXPANSOES = 2000
+
+
+def grupos_mutex(INI, OBJ, acoes):
+    """
+    Lista de conjuntos de proposições mutuamente exclusivas.
+    """
+    add = []
+    dele = []
+    adicionado_por = {}
+    excluidas = {-g for g in OBJ if g < 0}
+    for i, ac in enumerate(acoes):
+        pre = {p for p in ac.pre if p > 0}
+        excluidas.update(-p for p in ac.pre if p < 0)
+        excluidas.update(p for p in ac.delete if p not in pre)
+        add.append(set(ac.add) - pre)
+        dele.append((set(ac.delete) & pre) - set(ac.add))
+        for p in add[i]:
+            adicionado_por.setdefault(p, []).append(i)
+
+    inicial = set(INI)
+
+    def consistente(grupo):
+        if len(inicial & grupo) > 1:
+            return False
+        for p in grupo:
+            for i in adicionado_por.get(p, ()):
+                if len(add[i] & grupo) > 1:
+                    return False
+        return True
+
+    def violacao(grupo):
+        for p in grupo:
+            for i in adicionado_por.get(p, ()):
+                if not dele[i] & grupo:
+                    return i
+        return None
+
+    def expandir(grupo, orcamento):
+        if orcamento[0] <= 0:
+            return None
+        orcamento[0] -= 1
+
+        i = violacao(grupo)
+        if i is None:
+            return grupo
+
+        for c in sorted(dele[i] - excluidas):
+            novo = grupo | {c}
+            if consistente(novo):
+                r = expandir(novo, orcamento)
+                if r is not None:
+                    return r
+        return None
+
+    fatos = set(inicial)
+    for ac in acoes:
+        fatos.update(ac.add)
+
+    grupos = []
+    cobertos = set()
+    for p in sorted(fatos):
+        if p in cobertos or p in excluidas:
+            continue
+        grupo = expandir(frozenset([p]), [LIMITE_EXPANSOES])
+        if grupo is not None and len(grupo) > 1:
+            grupos.append(grupo)
+            cobertos |= grupo
+
+    return grupos
@@ -0,0 +1,76 @@
+# nos.py
+# -------------------------------------------------------------------------
+# Pool de nós para as buscas do planejador.
+#
+# Em vez de guardar uma cópia do caminho (caminho + [mov]) em cada nó
+# gerado, o que faz a memória crescer O(profundidade²), cada nó é apenas
+# um índice em colunas paralelas de array('i'):
+#
+#   estado[n] -> id do estado (posição em self.estados)
+#   pai[n]    -> índice do nó pai (-1 na raiz)
+#   acao[n]   -> índice da ação na lista de ações (-1 na raiz)
+#   g[n]      -> custo acumulado
+#   faltam[n] -> objetivos ainda não satisfeitos (planner/objetivo.py)
+#
+# O caminho é reconstruído seguindo os índices dos pais.
+#
+# Os estados podem ficar numa lista própria ou numa lista fechada
+# empacotada (planner/fechados.py); nesse caso, adicionar_id recebe
+# o id do estado já inserido nela.
+# -------------------------------------------------------------------------
+
+from array import array
+
+
+class PoolNos:
+    """
+    Armazena os nós da busca em colunas paralelas.
+    """
+
+    def __init__(self, estados=None):
+        self.estados = [] if estados is None else estados
+        self.estado = array('i')
+        self.pai = array('i')
+        self.acao = array('i')
+        self.g = array('i')
+        self.faltam = array('i')
+
+    def __len__(self):
+        return len(self.pai)
+
+    def adicionar(self, estado, pai, acao, g, faltam=0):
+        """
+        Insere um novo nó e retorna o seu índice.
+        """
+        self.estados.append(estado)
+        self.estado.append(len(self.estados) - 1)
+        self.pai.append(pai)
+        self.acao.append(acao)
+        self.g.append(g)
+        self.faltam.append(faltam)
+        return len(self.pai) - 1
+
+    def adicionar_id(self, sid, pai, acao, g, faltam=0):
+        """
+        Insere um nó cujo estado já está guardado com o id sid.
+        """
+        self.estado.append(sid)
+        self.pai.append(pai)
+        self.acao.append(acao)
+        self.g.append(g)
+        self.faltam.append(faltam)
+        return len(self.pai) - 1
+
+    def estado_de(self, n):
+        return self.estados[self.estado[n]]
+
+    def caminho(self, n, acoes):
+        """
+        Reconstrói a lista de nomes de ações da raiz até o nó n.
+        """
+        seq = []
+        while self.pai[n] != -1:
+            seq.append(acoes[self.acao[n]].nome)
+            n = self.pai[n]
+        seq.reverse()
+        return seq
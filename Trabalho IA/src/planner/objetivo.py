@@ -0,0 +1,83 @@
+# objetivo.py
+# -------------------------------------------------------------------------
+# Contagem incremental dos objetivos ainda não satisfeitos.
+#
+# Cada nó guarda quantos literais de OBJ faltam. Ao aplicar uma ação, só
+# os efeitos que tocam o objetivo podem mudar essa contagem, então o
+# valor do filho sai do valor do pai em O(|efeitos|):
+#
+#   ganha  -> add de objetivo positivo    (falta um a menos se era falso)
+#   perde  -> delete de objetivo positivo (falta um a mais se era verdadeiro)
+#   viola  -> add de objetivo negativo    (falta um a mais se era falso)
+#   libera -> delete de objetivo negativo (falta um a menos se era verdadeiro)
+#
+# Fatos que estão no add e no delete da mesma ação terminam verdadeiros
+# (Acao.aplicar remove antes de adicionar) e por isso só contam no add.
+#
+# O teste de objetivo vira "faltam == 0" e a heurística de contagem de
+# objetivos (heuristica.heuristica) é o próprio contador.
+# -------------------------------------------------------------------------
+
+
+class ContadorObjetivo:
+    """
+    Variação da contagem de objetivos não satisfeitos por ação.
+    """
+
+    def __init__(self, acoes, OBJ):
+        self.positivos = [g for g in OBJ if g > 0]
+        self.negativos = [-g for g in OBJ if g < 0]
+        positivos = set(self.positivos)
+        negativos = set(self.negativos)
+
+        self.efeitos = []
+        for ac in acoes:
+            add = set(ac.add)
+            self.efeitos.append((
+                [p for p in ac.add if p in positivos],
+                [p for p in ac.delete if p in positivos and p not in add],
+                [p for p in ac.add if p in negativos],
+                [p for p in ac.delete if p in negativos and p not in add],
+            ))
+
+    def faltando(self, est_set):
+        """
+        Contagem completa (usada só na raiz).
+        """
+        return (sum(1 for p in self.positivos if p not in est_set)
+                + sum(1 for p in self.negativos if p in est_set))
+
+    def delta(self, i, est_set):
+        """
+        Quanto a contagem muda ao aplicar a ação i no estado est_set.
+        """
+        ganha, perde, viola, libera = self.efeitos[i]
+        d = 0
+        for p in ganha:
+            if p not in est_set:
+                d -= 1
+        for p in perde:
+            if p in est_set:
+                d += 1
+        for p in viola:
+            if p not in est_set:
+                d += 1
+        for p in libera:
+            if p in est_set:
+                d -= 1
+        return d
+
+
+# -------------------------------------------------------------------------
+# Um contador por (lista de ações, objetivo), reaproveitado entre buscas
+# -------------------------------------------------------------------------
+_ultimo = (None, None, None)
+
+
+def obter_contador(acoes, OBJ):
+    global _ultimo
+
+    if _ultimo[0] is not acoes or _ultimo[1] != OBJ:
+        _ultimo = (acoes, OBJ, ContadorObjetivo(acoes, OBJ))
+
+    return _ultimo[2]
@@ -0,0 +1,235 @@
+# paralelo.py
+# -------------------------------------------------------------------------
+# BFS por camadas em paralelo, com a fronteira em memória compartilhada.
+#
+# Cada camada é um único bloco de SharedMemory com os estados empacotados
+# como na lista fechada (um bit por proposição, largura fixa), em ordem.
+# Para cada camada:
+#
+#   1. cada processo expande uma fatia contígua da camada e manda os
+#      filhos, em lotes, para o dono de cada um (crc32 do estado
+#      empacotado % processos); um marcador None fecha a camada;
+#   2. o dono descarta os filhos que já estão na sua lista fechada e
+#      responde quantos estados novos ficou;
+#   3. o coordenador cria o bloco da próxima camada e diz a cada dono
+#      onde gravar os seus estados novos; o dono devolve o pai (índice
+#      na camada anterior) e a ação de cada um.
+#
+# O coordenador só guarda pai e ação (dois ints por estado) para refazer
+# o plano. Um objetivo gerado na camada d + 1 é ótimo; a busca termina ao
+# fim dessa camada.
+# -------------------------------------------------------------------------
+
+import multiprocessing as mp
+import os
+import zlib
+from array import array
+from multiprocessing import shared_memory
+
+from planner.busca import satisfaz_objetivo, sucessores_ids
+from planner.fechados import ListaFechada, largura_para
+
+# Filhos por mensagem entre processos
+LOTE = 1024
+
+
+def _trabalhador(dono, processos, INI, OBJ, acoes, tarefas, caixas, respostas):
+    largura = largura_para(INI, OBJ, acoes)
+    visit = ListaFechada(largura)
+    empacotar = visit.empacotar
+    desempacotar = visit.desempacotar
+    novos = bytearray()
+    pais = array('i')
+    acoes_novas = array('i')
+    nos = 0
+
+    def receber(chaves, pais_lote, acoes_lote):
+        for k in range(len(pais_lote)):
+            _, novo = visit.adicionar_chave(bytes(chaves[k * largura:(k + 1) * largura]))
+            if novo:
+                novos.extend(chaves[k * largura:(k + 1) * largura])
+                pais.append(pais_lote[k])
+                acoes_novas.append(acoes_lote[k])
+
+    while True:
+        comando = tarefas[dono].get()
+
+        if comando[0] == "fim":
+            respostas.put((dono, nos, visit.memoria()))
+            return
+
+        if comando[0] == "inicial":
+            visit.adicionar_chave(comando[1])
+
+        elif comando[0] == "expandir":
+            _, nome, inicio, fim = comando
+            bloco = shared_memory.SharedMemory(name=nome)
+            saidas = [(bytearray(), array('i'), array('i')) for _ in range(processos)]
+            achado = None
+
+            for idx in range(inicio, fim):
+                estado = desempacotar(bytes(bloco.buf[idx * largura:(idx + 1) * largura]))
+                nos += 1
+                for prox, i in sucessores_ids(estado, acoes):
+                    if achado is None and satisfaz_objetivo(prox, OBJ):
+                        achado = (idx, i)
+
+                    chave = empacotar(prox)
+                    destino = zlib.crc32(chave) % processos
+                    chaves, pais_lote, acoes_lote = saidas[destino]
+                    chaves.extend(chave)
+                    pais_lote.append(idx)
+                    acoes_lote.append(i)
+                    if len(pais_lote) >= LOTE:
+                        if destino == dono:
+                            receber(chaves, pais_lote, acoes_lote)
+                        else:
+                            caixas[destino].put((bytes(chaves), pais_lote.tobytes(), acoes_lote.tobytes()))
+                        saidas[destino] = (bytearray(), array('i'), array('i'))
+            bloco.close()
+
+            # Resto dos lotes e o marcador de fim da camada para cada dono
+            for destino in range(processos):
+                chaves, pais_lote, acoes_lote = saidas[destino]
+                if destino == dono:
+                    receber(chaves, pais_lote, acoes_lote)
+                    continue
+                if pais_lote:
+                    caixas[destino].put((bytes(chaves), pais_lote.tobytes(), acoes_lote.tobytes()))
+                caixas[destino].put(None)
+
+            marcadores = 0
+            while marcadores < processos - 1:
+                lote = caixas[dono].get()
+                if lote is None:
+                    marcadores += 1
+                    continue
+                chaves, pais_lote, acoes_lote = lote
+                receber(chaves, array('i', pais_lote), array('i', acoes_lote))
+
+            respostas.put((dono, len(pais), achado))
+
+        elif comando[0] == "gravar":
+            _, nome, deslocamento = comando
+            bloco = shared_memory.SharedMemory(name=nome)
+            bloco.buf[deslocamento * largura:deslocamento * largura + len(novos)] = novos
+            bloco.close()
+            respostas.put((dono, pais.tobytes(), acoes_novas.tobytes()))
+            novos = bytearray()
+            pais = array('i')
+            acoes_novas = array('i')
+
+
+def bfs_paralelo(INI, OBJ, acoes, processos=None, estatisticas=None):
+    """
+    processos: número de processos (padrão: os.cpu_count()).
+    Se estatisticas (dict) for passado, recebe a memória das listas
+    fechadas e o tamanho da maior camada.
+    Retorna (custo, caminho, nós expandidos).
+    """
+    if satisfaz_objetivo(INI, OBJ):
+        return 0, [], 0
+
+    if processos is None:
+        processos = os.cpu_count() or 1
+
+    largura = largura_para(INI, OBJ, acoes)
+    chave = ListaFechada(largura).empacotar(INI)
+
+    # O primeiro bloco é criado antes dos processos para que eles herdem o
+    # resource_tracker; senão cada um abre o seu e, ao terminar, tenta
+    # apagar de novo os blocos que só anexou
+    camada = shared_memory.SharedMemory(create=True, size=largura)
+    camada.buf[:largura] = chave
+    n = 1
+
+    tarefas = [mp.Queue() for _ in range(processos)]
+    caixas = [mp.Queue() for _ in range(processos)]
+    respostas = mp.Queue()
+    trabalhadores = [mp.Process(target=_trabalhador,
+                                args=(dono, processos, INI, OBJ, acoes, tarefas, caixas, respostas),
+                                daemon=True)
+                     for dono in range(processos)]
+    for p in trabalhadores:
+        p.start()
+
+    def coletar():
+        por_dono = [None] * processos
+        for _ in range(processos):
+            resposta = respostas.get()
+            por_dono[resposta[0]] = resposta[1:]
+        return por_dono
+
+    tarefas[zlib.crc32(chave) % processos].put(("inicial", chave))
+
+    # pais_camada[d][k], acoes_camada[d][k]: origem do estado k da camada d + 1
+    pais_camada = []
+    acoes_camada = []
+    achado = None
+    maior = 1
+    nos = 0
+    memoria = 0
+
+    try:
+        while True:
+            fatia = -(-n // processos)
+            for dono in range(processos):
+                tarefas[dono].put(("expandir", camada.name, min(n, dono * fatia), min(n, (dono + 1) * fatia)))
+            contagens = []
+            for total, achado_dono in coletar():
+                contagens.append(total)
+                if achado is None and achado_dono is not None:
+                    achado = achado_dono
+
+            camada.close()
+            camada.unlink()
+            camada = None
+
+            n = sum(contagens)
+            if achado is not None or n == 0:
+                break
+
+            camada = shared_memory.SharedMemory(create=True, size=n * largura)
+            deslocamento = 0
+            for dono in range(processos):
+                tarefas[dono].put(("gravar", camada.name, deslocamento))
+                deslocamento += contagens[dono]
+
+            pais = array('i')
+            acoes_novas = array('i')
+            for pais_dono, acoes_dono in coletar():
+                pais.frombytes(pais_dono)
+                acoes_novas.frombytes(acoes_dono)
+            pais_camada.append(pais)
+            acoes_camada.append(acoes_novas)
+            maior = max(maior, n)
+
+        for dono in range(processos):
+            tarefas[dono].put(("fim",))
+        for nos_dono, memoria_dono in coletar():
+            nos += nos_dono
+            memoria += memoria_dono
+        for p in trabalhadores:
+            p.join()
+    finally:
+        if camada is not None:
+            camada.close()
+            camada.unlink()
+        for p in trabalhadores:
+            if p.is_alive():
+                p.terminate()
+
+    if estatisticas is not None:
+        estatisticas["memoria_fechados"] = memoria
+        estatisticas["maior_camada"] = maior
+
+    if achado is None:
+        return None, [], nos
+
+    idx, i = achado
+    plano = [i]
+    for d in range(len(pais_camada) - 1, -1, -1):
+        plano.append(acoes_camada[d][idx])
+        idx = pais_camada[d][idx]
+    plano.reverse()
+    return len(plano), [acoes[i].nome for i in plano], nos
@@ -5,7 +5,7 @@
 #
 # Este arquivo contém:
 #   - parse_token_list
-#   - carregar_instancia
+#   - carregar_instancia (já com a poda de planner/preprocessamento.py)
 #
 # Ele converte um arquivo .strips em:
 #   INI  = estado inicial (tuple de ints positivos)
@@ -32,6 +32,7 @@
 
 from planner.acoes import Acao
 from planner.mapeamento import get_pid
+from planner.preprocessamento import podar_alcancaveis
 
 
 # ---------------------------------------------------------------------
@@ -66,6 +67,10 @@ def carregar_instancia(path: str):
 
     Ações:
         criadas como objetos Acao
+
+    Antes de retornar, a tarefa passa pela poda de alcançabilidade
+    relaxada (planner/preprocessamento.py): ações inalcançáveis e fatos
+    estáticos são removidos e as proposições renumeradas em 1..n.
     """
     with open(path, "r", encoding="utf-8", errors="ignore") as f:
         raw_lines = [l.rstrip("\n").strip() for l in f.readlines()]
@@ -162,7 +167,7 @@ def carregar_instancia(path: str):
             pid = get_pid(tok)
             OBJ.append(pid)
 
-    return INI, tuple(OBJ), acoes
+    return podar_alcancaveis(INI, tuple(OBJ), acoes)
 
 def carregar_strips(path):
     INI, OBJ, ACOES = carregar_instancia(path)
@@ -0,0 +1,81 @@
+# portfolio.py
+# -------------------------------------------------------------------------
+# Portfólio de algoritmos em paralelo.
+#
+# Cada algoritmo roda num processo próprio sobre a mesma instância (cada
+# processo lê o arquivo de novo, o que também preenche planner.mapeamento
+# nele). Sem prazo, o primeiro plano encontrado vence e os outros
+# processos são cancelados; com prazo (segundos), vence o plano mais
+# barato encontrado até lá. O tempo até o plano passa a ser o mínimo entre
+# os algoritmos, não a soma como em main.rodar_algoritmo.
+#
+# Um algoritmo que falha (exceção ou sem plano) só sai da disputa.
+# -------------------------------------------------------------------------
+
+import multiprocessing as mp
+import time
+from queue import Empty
+
+from planner.parser import carregar_instancia
+
+# Intervalo (s) entre as verificações dos processos
+ESPERA = 0.05
+
+
+def _rodar(indice, func, caminho, fila):
+    inicio = time.time()
+    try:
+        INI, OBJ, ACOES = carregar_instancia(caminho)
+        custo, plano, nos = func(INI, OBJ, ACOES)
+    except Exception as erro:
+        fila.put((indice, None, [], 0, time.time() - inicio, repr(erro)))
+        return
+    fila.put((indice, custo, plano, nos, time.time() - inicio, None))
+
+
+def portfolio(caminho, algoritmos, prazo=None):
+    """
+    algoritmos: lista de (nome, função), como em main.rodar_algoritmo.
+
+    Retorna (vencedor, resultados): vencedor é o índice em algoritmos do
+    que deu o plano (ou None) e resultados leva o índice de cada um que
+    terminou a (custo, caminho, nós, tempo, erro).
+    """
+    fila = mp.Queue()
+    processos = [mp.Process(target=_rodar, args=(i, func, caminho, fila), daemon=True)
+                 for i, (_, func) in enumerate(algoritmos)]
+
+    inicio = time.time()
+    for p in processos:
+        p.start()
+
+    resultados = {}
+    melhor = None
+    try:
+        while len(resultados) < len(processos):
+            restante = None if prazo is None else prazo - (time.time() - inicio)
+            if restante is not None and restante <= 0:
+                break
+            try:
+                indice, custo, plano, nos, tempo, erro = fila.get(
+                    timeout=ESPERA if restante is None else min(ESPERA, restante))
+            except Empty:
+                # Processo morto sem responder (ex.: sem memória)
+                for i, p in enumerate(processos):
+                    if i not in resultados and not p.is_alive() and p.exitcode != 0:
+                        resultados[i] = (None, [], 0, time.time() - inicio, f"código de saída {p.exitcode}")
+                continue
+
+            resultados[indice] = (custo, plano, nos, tempo, erro)
+            if custo is not None and (melhor is None or custo < resultados[melhor][0]):
+                melhor = indice
+            if melhor is not None and prazo is None:
+                break
+    finally:
+        for p in processos:
+            if p.is_alive():
+                p.terminate()
+        for p in processos:
+            p.join()
+
+    return melhor, resultados
@@ -0,0 +1,106 @@
+# preprocessamento.py
+# -------------------------------------------------------------------------
+# Poda por alcançabilidade relaxada, feita uma vez logo após a leitura.
+#
+# As instâncias trazem todas as ações instanciadas (stack, unstack,
+# pick-up, put-down), inclusive as que nunca podem ser executadas a
+# partir do estado inicial. Este passo:
+#
+#   - calcula os fatos e ações alcançáveis ignorando os deletes
+#   - descarta as ações inalcançáveis
+#   - remove os fatos estáticos (sempre verdadeiros ou sempre falsos)
+#     das pré-condições, efeitos, estado inicial e objetivo
+#   - renumera as proposições restantes de forma densa (1..n),
+#     atualizando planner.mapeamento
+#
+# A renumeração é monótona, então a ordem dos estados e das ações
+# continua a mesma de antes.
+# -------------------------------------------------------------------------
+
+from planner import mapeamento
+from planner.acoes import Acao
+
+
+def alcancaveis(INI, acoes):
+    """
+    Retorna (fatos alcançáveis, índices das ações alcançáveis) no
+    problema relaxado (sem deletes e sem pré-condições negativas).
+    """
+    faltam = []
+    por_pre = {}
+    for i, ac in enumerate(acoes):
+        pos = [p for p in ac.pre if p > 0]
+        faltam.append(len(pos))
+        for p in pos:
+            por_pre.setdefault(p, []).append(i)
+
+    fatos = set()
+    prontas = {i for i, n in enumerate(faltam) if n == 0}
+    fila = list(INI)
+    for i in prontas:
+        fila.extend(acoes[i].add)
+
+    while fila:
+        p = fila.pop()
+        if p in fatos:
+            continue
+        fatos.add(p)
+        for i in por_pre.get(p, ()):
+            faltam[i] -= 1
+            if faltam[i] == 0:
+                prontas.add(i)
+                fila.extend(acoes[i].add)
+
+    return fatos, prontas
+
+
+def podar_alcancaveis(INI, OBJ, acoes):
+    """
+    Aplica a poda e devolve (INI, OBJ, acoes) já renumerados.
+
+    Se algum objetivo for estaticamente impossível, a tarefa é
+    devolvida sem alterações (a busca apenas não encontra plano).
+    """
+    fatos, prontas = alcancaveis(INI, acoes)
+
+    apagados = set()
+    for i in prontas:
+        apagados.update(acoes[i].delete)
+
+    sempre = {p for p in INI if p not in apagados}
+    mantidos = fatos - sempre
+
+    def estatico(literal):
+        """
+        None se o fato muda de valor; senão, se o literal vale sempre.
+        """
+        p = abs(literal)
+        if p in mantidos:
+            return None
+        return (p in sempre) == (literal > 0)
+
+    if any(estatico(g) is False for g in OBJ):
+        return INI, OBJ, acoes
+
+    novo = {p: k for k, p in enumerate(sorted(mantidos), 1)}
+
+    def renumerar(literais):
+        return [novo[p] if p > 0 else -novo[-p] for p in literais if abs(p) in novo]
+
+    podadas = []
+    for i in sorted(prontas):
+        ac = acoes[i]
+        if any(estatico(p) is False for p in ac.pre):
+            continue
+        podadas.append(Acao(ac.nome, renumerar(ac.pre), renumerar(ac.add), renumerar(ac.delete)))
+
+    # Atualiza o mapeamento global para os novos ids
+    nomes = {novo[p]: mapeamento.propos_rev[p] for p in mantidos}
+    mapeamento.propos_map.clear()
+    mapeamento.propos_rev.clear()
+    for pid, nome in nomes.items():
+        mapeamento.propos_map[nome] = pid
+        mapeamento.propos_rev[pid] = nome
+    mapeamento._next_pid = len(nomes) + 1
+
+    return tuple(sorted(renumerar(INI))), tuple(renumerar(OBJ)), podadas
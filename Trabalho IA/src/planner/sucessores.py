@@ -0,0 +1,94 @@
+# sucessores.py
+# -------------------------------------------------------------------------
+# Gerador de sucessores pré-compilado (árvore de decisão / trie sobre as
+# pré-condições positivas das ações).
+#
+# Sem ele, cada expansão testa TODAS as ações com ac.aplicavel, mesmo
+# que só algumas poucas sejam aplicáveis no estado. A trie é montada uma
+# única vez por lista de ações:
+#
+#   - as pré-condições de cada ação são ordenadas pelos fatos mais
+#     frequentes primeiro (no mundo dos blocos: handempty / holding_x)
+#   - cada nó agrupa as ações pelo próximo fato exigido
+#   - a consulta só desce pelos filhos cujo fato está no estado
+#
+# Ações com pré-condições negativas são conferidas por completo no final.
+# -------------------------------------------------------------------------
+
+
+class GeradorSucessores:
+    """
+    Devolve os índices das ações aplicáveis em um estado.
+    """
+
+    def __init__(self, acoes):
+        self.acoes = acoes
+
+        frequencia = {}
+        for ac in acoes:
+            for p in ac.pre:
+                if p > 0:
+                    frequencia[p] = frequencia.get(p, 0) + 1
+        ordem = {p: k for k, p in enumerate(sorted(frequencia, key=lambda p: (-frequencia[p], p)))}
+
+        itens = []
+        for i, ac in enumerate(acoes):
+            pos = sorted((p for p in ac.pre if p > 0), key=ordem.__getitem__)
+            itens.append((i, pos))
+
+        self.conferir = {i for i, ac in enumerate(acoes) if any(p < 0 for p in ac.pre)}
+        self.raiz = self._construir(itens, 0)
+
+    def _construir(self, itens, k):
+        """
+        Nó = (imediatas, ((fato, filho), ...)).
+        """
+        imediatas = []
+        por_fato = {}
+
+        for i, pos in itens:
+            if len(pos) == k:
+                imediatas.append(i)
+            else:
+                por_fato.setdefault(pos[k], []).append((i, pos))
+
+        filhos = tuple((p, self._construir(grupo, k + 1)) for p, grupo in por_fato.items())
+        return imediatas, filhos
+
+    def aplicaveis(self, est_set):
+        """
+        est_set : conjunto de proposições verdadeiras
+        """
+        resultado = []
+        pilha = [self.raiz]
+
+        while pilha:
+            imediatas, filhos = pilha.pop()
+            resultado.extend(imediatas)
+            for p, filho in filhos:
+                if p in est_set:
+                    pilha.append(filho)
+
+        if self.conferir:
+            acoes = self.acoes
+            resultado = [i for i in resultado
+                         if i not in self.conferir or acoes[i].aplicavel(est_set)]
+
+        # Mantém a ordem original das ações (mesma ordem de expansão de antes)
+        resultado.sort()
+        return resultado
+
+
+# -------------------------------------------------------------------------
+# O gerador é montado uma vez por lista de ações e reaproveitado
+# -------------------------------------------------------------------------
+_ultimo = (None, None)
+
+
+def obter_gerador(acoes):
+    global _ultimo
+
+    if _ultimo[0] is not acoes:
+        _ultimo = (acoes, GeradorSucessores(acoes))
+
+    return _ultimo[1]
@@ -0,0 +1,66 @@
+# conftest.py
+# -------------------------------------------------------------------------
+# Apoio comum aos testes do planner: toda função de teste com o argumento
+# "instancia" roda em cada instância de OTIMOS, e o caminho devolvido é
+# refeito a partir do estado inicial (toda ação precisa ser aplicável e o
+# último estado precisa satisfazer o objetivo).
+# -------------------------------------------------------------------------
+
+import os
+import sys
+
+import pytest
+
+SRC = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SRC)
+
+from planner.parser import carregar_instancia
+from planner.busca import satisfaz_objetivo
+
+# Comprimento do plano ótimo de cada instância usada nos testes
+OTIMOS = {
+    "blocks-4-0": 6,
+    "blocks-5-0": 12,
+    "blocks-7-0": 20,
+}
+
+
+def pytest_generate_tests(metafunc):
+    if "instancia" in metafunc.fixturenames:
+        metafunc.parametrize("instancia", sorted(OTIMOS))
+
+
+@pytest.fixture
+def otimo(instancia):
+    return OTIMOS[instancia]
+
+
+@pytest.fixture
+def caminho(instancia):
+    return os.path.join(SRC, "instancias", instancia + ".strips")
+
+
+@pytest.fixture
+def tarefa(caminho):
+    """
+    (INI, OBJ, acoes) da instância.
+    """
+    return carregar_instancia(caminho)
+
+
+@pytest.fixture
+def custo_valido():
+    def custo_valido(INI, OBJ, acoes, caminho):
+        """
+        Refaz o caminho (nomes das ações) a partir de INI e devolve o
+        número de ações.
+        """
+        por_nome = {a.nome: a for a in acoes}
+        estado = INI
+        for nome in caminho:
+            acao = por_nome[nome]
+            assert acao.aplicavel(set(estado)), f"{nome} não aplicável"
+            estado = acao.aplicar(set(estado))
+        assert satisfaz_objetivo(estado, OBJ)
+        return len(caminho)
+    return custo_valido
@@ -0,0 +1,31 @@
+# test_planner.py
+# -------------------------------------------------------------------------
+# BFS, DFS limitada e A* com h_add rodados nas instâncias de teste (ver
+# conftest.py); o caminho devolvido é refeito a partir do estado
+# inicial, e o da BFS precisa ter o comprimento ótimo. Os demais
+# algoritmos têm cada um o seu test_planner_*.py.
+# -------------------------------------------------------------------------
+
+import pytest
+
+from planner.busca import bfs, dfs_limited, astar
+
+# (nome, função, ótima)
+ALGORITMOS = [
+    ("BFS", bfs, True),
+    ("DFS limitada", dfs_limited, False),
+    ("A*", astar, False),
+]
+
+
+@pytest.mark.parametrize("nome, func, otima", ALGORITMOS, ids=[a[0] for a in ALGORITMOS])
+def test_caminho_valido(tarefa, nome, func, otima, otimo, custo_valido):
+    INI, OBJ, acoes = tarefa
+    custo, caminho, _ = func(INI, OBJ, acoes)
+    assert custo == len(caminho)
+
+    comprimento = custo_valido(INI, OBJ, acoes, caminho)
+    if otima:
+        assert comprimento == otimo
+    else:
+        assert comprimento >= otimo
@@ -0,0 +1,31 @@
+# test_planner_bidirecional.py
+# -------------------------------------------------------------------------
+# Busca bidirecional: o caminho precisa ser válido (não necessariamente
+# mínimo). Os grupos de mutex usados na regressão precisam valer em todos
+# os estados do caminho da BFS: no máximo uma proposição de cada grupo.
+# -------------------------------------------------------------------------
+
+from planner.bidirecional import bidirecional
+from planner.busca import bfs
+from planner.invariantes import grupos_mutex
+
+
+def test_bidirecional(tarefa, otimo, custo_valido):
+    INI, OBJ, acoes = tarefa
+    custo, caminho, _ = bidirecional(INI, OBJ, acoes)
+    assert custo == len(caminho)
+    assert custo_valido(INI, OBJ, acoes, caminho) >= otimo
+
+
+def test_grupos_mutex(tarefa):
+    INI, OBJ, acoes = tarefa
+    grupos = grupos_mutex(INI, OBJ, acoes)
+    assert grupos
+
+    por_nome = {a.nome: a for a in acoes}
+    estado = set(INI)
+    _, caminho, _ = bfs(INI, OBJ, acoes)
+    for nome in [None] + caminho:
+        if nome is not None:
+            estado = set(por_nome[nome].aplicar(estado))
+        assert all(len(grupo & estado) <= 1 for grupo in grupos)
@@ -0,0 +1,20 @@
+# test_planner_blocos.py
+# -------------------------------------------------------------------------
+# A* com a heurística do mundo dos blocos: o caminho precisa ser válido e
+# a heurística no estado inicial não pode passar do ótimo.
+# -------------------------------------------------------------------------
+
+from planner.busca import astar_blocos
+from planner.heuristica import heuristica_blocos
+
+
+def test_a_estrela(tarefa, otimo, custo_valido):
+    INI, OBJ, acoes = tarefa
+    custo, caminho, _ = astar_blocos(INI, OBJ, acoes)
+    assert custo == len(caminho)
+    assert custo_valido(INI, OBJ, acoes, caminho) >= otimo
+
+
+def test_admissivel_no_inicio(tarefa, otimo):
+    INI, OBJ, acoes = tarefa
+    assert 0 < heuristica_blocos(INI, OBJ, acoes) <= otimo
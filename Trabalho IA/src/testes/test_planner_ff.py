@@ -0,0 +1,14 @@
+# test_planner_ff.py
+# -------------------------------------------------------------------------
+# GBFS com h_FF: o caminho precisa ser válido (não necessariamente
+# mínimo).
+# -------------------------------------------------------------------------
+
+from planner.busca import gbfs
+
+
+def test_gbfs(tarefa, otimo, custo_valido):
+    INI, OBJ, acoes = tarefa
+    custo, caminho, _ = gbfs(INI, OBJ, acoes)
+    assert custo == len(caminho)
+    assert custo_valido(INI, OBJ, acoes, caminho) >= otimo
@@ -0,0 +1,32 @@
+# test_planner_ids.py
+# -------------------------------------------------------------------------
+# IDS que retoma a iteração a partir da fronteira guardada e DFS limitada
+# que revisita estados alcançados com profundidade menor: o IDS precisa
+# dar o ótimo com qualquer orçamento, e a DFS precisa achar caminho com
+# limite igual ao ótimo e nenhum com limite menor.
+# -------------------------------------------------------------------------
+
+import pytest
+
+from planner.busca import ids, dfs_limited
+
+
+@pytest.mark.parametrize("orcamento", [None, 4096, 0])
+def test_ids(tarefa, orcamento, otimo, custo_valido):
+    if orcamento is not None and otimo > 12:
+        pytest.skip("sem a fronteira inteira guardada, o IDS leva cerca de um minuto aqui")
+    INI, OBJ, acoes = tarefa
+    if orcamento is None:
+        custo, caminho, _ = ids(INI, OBJ, acoes)
+    else:
+        custo, caminho, _ = ids(INI, OBJ, acoes, orcamento=orcamento)
+    assert custo == len(caminho)
+    assert custo_valido(INI, OBJ, acoes, caminho) == otimo
+
+
+def test_dfs_no_limite(tarefa, otimo, custo_valido):
+    INI, OBJ, acoes = tarefa
+    custo, caminho, _ = dfs_limited(INI, OBJ, acoes, limite=otimo - 1)
+    assert custo is None
+    custo, caminho, _ = dfs_limited(INI, OBJ, acoes, limite=otimo)
+    assert custo_valido(INI, OBJ, acoes, caminho) == otimo
@@ -0,0 +1,20 @@
+# test_planner_lmcut.py
+# -------------------------------------------------------------------------
+# A* com LM-cut: o caminho precisa ser ótimo, e o LM-cut no estado
+# inicial não pode passar do ótimo.
+# -------------------------------------------------------------------------
+
+from planner.busca import astar_lmcut
+from planner.heuristica import heuristica_lmcut
+
+
+def test_a_estrela(tarefa, otimo, custo_valido):
+    INI, OBJ, acoes = tarefa
+    custo, caminho, _ = astar_lmcut(INI, OBJ, acoes)
+    assert custo == len(caminho)
+    assert custo_valido(INI, OBJ, acoes, caminho) == otimo
+
+
+def test_admissivel_no_inicio(tarefa, otimo):
+    INI, OBJ, acoes = tarefa
+    assert 0 < heuristica_lmcut(INI, OBJ, acoes) <= otimo
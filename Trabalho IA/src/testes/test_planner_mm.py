@@ -0,0 +1,13 @@
+# test_planner_mm.py
+# -------------------------------------------------------------------------
+# MM com LM-cut: o caminho precisa ser ótimo.
+# -------------------------------------------------------------------------
+
+from planner.bidirecional import mm
+
+
+def test_mm(tarefa, otimo, custo_valido):
+    INI, OBJ, acoes = tarefa
+    custo, caminho, _ = mm(INI, OBJ, acoes)
+    assert custo == len(caminho)
+    assert custo_valido(INI, OBJ, acoes, caminho) == otimo
@@ -0,0 +1,24 @@
+# test_planner_objetivo.py
+# -------------------------------------------------------------------------
+# Contagem incremental de objetivos: nos dois primeiros níveis a partir do
+# estado inicial, o valor herdado do pai precisa ser igual à contagem
+# completa do filho.
+# -------------------------------------------------------------------------
+
+from planner.busca import sucessores_contados
+from planner.objetivo import obter_contador
+
+
+def test_contagem_incremental(tarefa):
+    INI, OBJ, acoes = tarefa
+    contador = obter_contador(acoes, OBJ)
+
+    nivel = [(INI, contador.faltando(set(INI)))]
+    for _ in range(2):
+        proximo = []
+        for estado, faltam in nivel:
+            for prox, _, f in sucessores_contados(estado, acoes, contador, faltam):
+                assert f == contador.faltando(set(prox))
+                proximo.append((prox, f))
+        nivel = proximo
+    assert nivel
@@ -0,0 +1,21 @@
+# test_planner_paralelo.py
+# -------------------------------------------------------------------------
+# BFS paralela com a fronteira em memória compartilhada: o caminho
+# precisa ser ótimo para qualquer número de processos, e as estatísticas
+# trazem a maior camada e a memória das listas fechadas.
+# -------------------------------------------------------------------------
+
+import pytest
+
+from planner.paralelo import bfs_paralelo
+
+
+@pytest.mark.parametrize("processos", [1, 2, 3])
+def test_bfs_paralelo(tarefa, processos, otimo, custo_valido):
+    INI, OBJ, acoes = tarefa
+    estatisticas = {}
+    custo, caminho, _ = bfs_paralelo(INI, OBJ, acoes, processos=processos, estatisticas=estatisticas)
+    assert custo == len(caminho)
+    assert custo_valido(INI, OBJ, acoes, caminho) == otimo
+    assert estatisticas["maior_camada"] > 1
+    assert estatisticas["memoria_fechados"] > 0
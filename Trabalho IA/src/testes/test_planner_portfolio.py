@@ -0,0 +1,24 @@
+# test_planner_portfolio.py
+# -------------------------------------------------------------------------
+# Portfólio: sem prazo, o caminho do primeiro que termina precisa ser
+# válido; com prazo, vence o mais barato entre os que terminaram.
+# -------------------------------------------------------------------------
+
+from planner.busca import bfs, gbfs, astar_lmcut
+from planner.portfolio import portfolio
+
+
+def test_primeiro_plano(caminho, tarefa, otimo, custo_valido):
+    INI, OBJ, acoes = tarefa
+    vencedor, resultados = portfolio(caminho, [("BFS", bfs), ("GBFS (FF)", gbfs)])
+    custo, plano, _, _, erro = resultados[vencedor]
+    assert erro is None
+    assert custo_valido(INI, OBJ, acoes, plano) == custo >= otimo
+
+
+def test_mais_barato_no_prazo(caminho, tarefa, otimo, custo_valido):
+    INI, OBJ, acoes = tarefa
+    vencedor, resultados = portfolio(caminho, [("GBFS (FF)", gbfs), ("A* (LM-cut)", astar_lmcut)], prazo=60)
+    assert len(resultados) == 2
+    custo, plano, _, _, _ = resultados[vencedor]
+    assert custo_valido(INI, OBJ, acoes, plano) == custo == otimo
@@ -1,17 +1,24 @@
 from dataclasses import dataclass
-from typing import Set, Optional
+from typing import Set, Optional, Union
 
 # Representa uma ação do problema (nome, precondições e efeitos)
+# As máscaras são preenchidas pela compilação da tarefa (codigo/tarefa.py)
 @dataclass
 class Acao:
     acao: str
     precondicao: Set[int]
     poscondicao: Set[int]
+    mascaraPre: int = 0
+    mascaraTeste: int = 0
+    mascaraAdd: int = 0
+    mascaraDel: int = 0
 
 # Nó usado na busca: guarda o estado, o pai e qual ação gerou o nó
+# O estado é um conjunto de proposições ou, na tarefa compilada, um inteiro
 @dataclass
 class No:
-    estado: Set[int]
+    estado: Union[Set[int], int]
     pai: Optional['No']
     acao: Optional[int]
     profundidade: Optional[int]
+    chave: Optional[int] = None
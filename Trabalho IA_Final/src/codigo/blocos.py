@@ -0,0 +1,93 @@
+from codigo.tarefa import iterar_bits
+
+
+# ------------------------------------------------------------
+# Heurística específica do mundo dos blocos (admissível).
+#
+# Os nomes das proposições (on_x_y, ontable_x, holding_x) dão a posição
+# de cada bloco. Subindo cada torre a partir da mesa, um bloco precisa
+# sair do lugar quando:
+#   - o objetivo manda ele ficar sobre outro suporte;
+#   - o objetivo manda outro bloco ficar sobre o suporte dele;
+#   - algum bloco abaixo dele precisa sair do lugar.
+# Cada um desses blocos exige pelo menos duas ações próprias (tirar e
+# colocar), e o bloco na mão exige uma. Custo O(blocos) por estado,
+# sem grafo relaxado.
+# ------------------------------------------------------------
+
+SOBRE = 0
+MESA = 1
+SEGURANDO = 2
+
+
+class HeuristicaBlocos:
+    admissivel = True
+
+    def __init__(self, tarefa):
+        nomes = tarefa.parser.mapeamentoReverso
+
+        # bit -> (tipo, bloco, suporte) para as proposições de posição
+        self.fatos = {}
+        self.mascara = 0
+        for b, pid in enumerate(tarefa.props):
+            fato = self._ler(nomes[pid])
+            if fato is not None:
+                self.fatos[b] = fato
+                self.mascara |= 1 << b
+
+        if not any(tipo != SEGURANDO for tipo, _, _ in self.fatos.values()):
+            raise ValueError("A heurística de blocos só vale para o mundo dos blocos (on_x_y / ontable_x).")
+
+        # Suporte final de cada bloco (None = mesa) e bloco exigido sobre cada suporte
+        self.destino = {}
+        self.exigido = {}
+        for b in iterar_bits(tarefa.objetivo & self.mascara):
+            tipo, bloco, suporte = self.fatos[b]
+            if tipo == SOBRE:
+                self.destino[bloco] = suporte
+                self.exigido[suporte] = bloco
+            elif tipo == MESA:
+                self.destino[bloco] = None
+
+    @staticmethod
+    def _ler(nome):
+        partes = nome.split("_")
+        if partes[0] == "on" and len(partes) == 3:
+            return SOBRE, partes[1], partes[2]
+        if partes[0] == "ontable" and len(partes) == 2:
+            return MESA, partes[1], None
+        if partes[0] == "holding" and len(partes) == 2:
+            return SEGURANDO, partes[1], None
+        return None
+
+    def __call__(self, estado, objetivo):
+        # O objetivo já foi lido no construtor
+        fatos = self.fatos
+        destino = self.destino
+        exigido = self.exigido
+
+        h = 0
+        acima = {}
+        naMesa = []
+        for b in iterar_bits(estado & self.mascara):
+            tipo, bloco, suporte = fatos[b]
+            if tipo == SOBRE:
+                acima[suporte] = bloco
+            elif tipo == MESA:
+                naMesa.append(bloco)
+            else:
+                h += 1
+
+        for bloco in naMesa:
+            suporte = None
+            errado = False
+            while bloco is not None:
+                if not errado:
+                    errado = ((bloco in destino and destino[bloco] != suporte)
+                              or (suporte is not None and exigido.get(suporte, bloco) != bloco))
+                if errado:
+                    h += 2
+                suporte = bloco
+                bloco = acima.get(bloco)
+
+        return h
@@ -1,47 +1,178 @@
-from collections import deque
+from array import array
 from heapq import heappush, heappop
 from itertools import count
-from codigo.acoes import No, Acao
-from typing import Set
+from codigo.acoes import No
+from codigo.tarefa import Tarefa, iterar_bits
+from codigo.nos import PoolNos
+from codigo.zobrist import Zobrist, TabelaTransposicao
+from codigo.invariantes import TarefaSAS
+from codigo.fechados import ListaFechada, VAZIO
+from codigo.sucessores import GeradorSucessores, AplicaveisIncremental
+from codigo.regressao import Regressao, IndiceParciais, IndiceEstados
+from codigo.pdb import HeuristicaPDB
+from codigo.blocos import HeuristicaBlocos
+from codigo.heuristicas import (HeuristicaRelaxada, HeuristicaFF, HeuristicaObjetivos,
+                                HeuristicaLMCut, CacheHeuristica, INFINITO)
+from codigo.vetorizado import HeuristicaVetorizada
+from codigo.paralelo import hdaEstrela, bfsCamadas
 import time
 
 
+# Heuristicas disponíveis para o A* (nome -> construtor sobre a Busca)
+HEURISTICAS = {
+    "hadd": lambda busca: HeuristicaRelaxada(busca.tarefa, "add"),
+    "hmax": lambda busca: HeuristicaRelaxada(busca.tarefa, "max"),
+    "hadd_np": lambda busca: HeuristicaVetorizada(busca.tarefa, "add"),
+    "hmax_np": lambda busca: HeuristicaVetorizada(busca.tarefa, "max"),
+    "ff": lambda busca: HeuristicaFF(busca.tarefa),
+    "objetivos": lambda busca: HeuristicaObjetivos(busca.tarefa),
+    "lmcut": lambda busca: HeuristicaLMCut(busca.tarefa),
+    "pdb": lambda busca: HeuristicaPDB(busca.tarefaSAS(), combinar="soma"),
+    "pdbmax": lambda busca: HeuristicaPDB(busca.tarefaSAS(), combinar="max"),
+    "blocos": lambda busca: HeuristicaBlocos(busca.tarefa),
+}
+
+# Heurística usada quando nenhuma foi escolhida; a GBFS com operadores
+# preferidos precisa das ações úteis, que só o h_FF fornece
+HEURISTICA_PADRAO = "hadd"
+HEURISTICA_GBFS = "ff"
+
+# Buscas guiadas por heurística; executar_busca as repete com a contagem
+# de objetivos (HEURISTICA_BASE) para comparar o número de expansões
+BUSCAS_HEURISTICAS = {"MM", "IDA*", "A*", "HDA*", "WA*", "AWA*", "GBFS", "GBFS-puro"}
+HEURISTICA_BASE = "objetivos"
+
+# Expansões extras da fila de preferidos quando o h melhora (GBFS)
+BONUS_PREFERIDOS = 1000
+
+# Número de valores heurísticos guardados no cache LRU do A*
+CAPACIDADE_CACHE = 100000
+
+# Peso do A* ponderado e sequência de pesos do A* anytime
+PESO_PADRAO = 2
+PESOS_ANYTIME = (5, 3, 2, 1.5, 1)
+
+# Tamanho da tabela de transposição do IDA* (2^bits entradas)
+BITS_TRANSPOSICAO = 18
+
+# Bytes que o IDS pode gastar guardando a fronteira entre iterações
+ORCAMENTO_FRONTEIRA = 32 * 1024 * 1024
+
+
+# h = 0, para DLS e IDS usarem o laço do IDA*
+def _semHeuristica(chave, estado, objetivo):
+    return 0
+
+
+
 class Busca:
     def __init__(self, parser):
         self.parser = parser
         self.relevantes = set()
+        self.relevantesNeg = set()
+        self.acoesRelevantes = set()
+        self.tarefa = None
+        self.sas = None
+        self.estatisticas = {}
+        # None: a heurística padrão de cada busca (HEURISTICA_PADRAO, ou
+        # HEURISTICA_GBFS na busca gulosa com operadores preferidos)
+        self.nomeHeuristica = None
+        self.heuristicas = {}
+        self.capacidadeCache = CAPACIDADE_CACHE
 
         if hasattr(self.parser, "estadoFinal") and hasattr(self.parser, "acoes"):
             self._build_relevantes()
+            self._compilar()
+
+    # ----------------------------------------------------
+    # Análise de relevância para trás (uma vez por tarefa)
+    #
+    # Parte do objetivo e regride pelo grafo de ações: uma ação é
+    # relevante se adiciona um fato relevante (ou apaga um fato que
+    # precisa ficar falso), e então suas pré-condições também passam
+    # a ser relevantes. Ações irrelevantes nunca ajudam a alcançar o
+    # objetivo e ficam de fora da tabela compilada.
+    # ----------------------------------------------------
 
     def _build_relevantes(self):
         self.relevantes = set()
-
+        self.relevantesNeg = set()
+        self.acoesRelevantes = set()
+
+        adicionadoPor = {}
+        apagadoPor = {}
+        for aid, acao in self.parser.acoes.items():
+            for e in acao.poscondicao:
+                if e > 0:
+                    adicionadoPor.setdefault(e, []).append(aid)
+                else:
+                    apagadoPor.setdefault(-e, []).append(aid)
+
+        fila = []
         for p in self.parser.estadoFinal:
-            self.relevantes.add(abs(p))
+            fila.append(p)
+
+        while fila:
+            p = fila.pop()
+            if p > 0:
+                if p in self.relevantes:
+                    continue
+                self.relevantes.add(p)
+                alcancam = adicionadoPor.get(p, ())
+            else:
+                if -p in self.relevantesNeg:
+                    continue
+                self.relevantesNeg.add(-p)
+                alcancam = apagadoPor.get(-p, ())
+
+            for aid in alcancam:
+                if aid not in self.acoesRelevantes:
+                    self.acoesRelevantes.add(aid)
+                    fila.extend(self.parser.acoes[aid].precondicao)
+
+    # ----------------------------------------------------
+    # Compilação da tarefa (estados como inteiros/bitsets)
+    # ----------------------------------------------------
 
-        for _, acao in self.parser.acoes.items():
-            for p in acao.precondicao:
-                self.relevantes.add(abs(p))
-            for p in acao.poscondicao:
-                self.relevantes.add(abs(p))
+    def _compilar(self):
+        # Só as ações e os fatos relevantes entram na tarefa compilada;
+        # a busca não faz nenhum filtro por nó.
+        acoes = [aid for aid in self.parser.acoes if aid in self.acoesRelevantes]
+        self.tarefa = Tarefa(self.parser, acoes, self.relevantes | self.relevantesNeg)
+        self.zobrist = Zobrist(self.tarefa)
+        self.gerador = GeradorSucessores(self.tarefa, self.tarefaSAS())
+        self.incremental = AplicaveisIncremental(self.tarefa, self.gerador)
+
+    # Tradução SAS+ (grupos de mutex), feita uma única vez por tarefa
+    def tarefaSAS(self):
+        if self.sas is None or self.sas.tarefa is not self.tarefa:
+            self.sas = TarefaSAS(self.tarefa)
+        return self.sas
+
+    def _listaFechada(self):
+        sas = self.tarefaSAS()
+        return ListaFechada(sas.empacotarEstado, sas.desempacotarEstado, sas.largura)
+
+    def _noInicial(self):
+        if self.tarefa is None:
+            self._build_relevantes()
+            self._compilar()
+        inicial = self.tarefa.inicial
+        return No(estado=inicial, pai=None, acao=None, profundidade=0, chave=self.zobrist.hash(inicial))
 
     # -------------------------
     # Funções utilitárias
     # -------------------------
 
-    def verificarFinalizacao(self, objetivo: Set[int], estadoAtual: Set[int]):
-        return objetivo.issubset(estadoAtual)
-
-    def verificaPreCondicao(self, acao: Acao, no: No):
-        return acao.precondicao.issubset(no.estado)
+    def verificarFinalizacao(self, objetivo: int, estadoAtual: int):
+        return estadoAtual & self.tarefa.objetivoTeste == objetivo
 
     # -------------------------
     # Impressão da solução
     # -------------------------
 
     def imprimeEstado(self, no: No):
-        nomes = [self.parser.mapeamentoReverso[i] for i in no.estado]
+        nomes = [self.parser.mapeamentoReverso[i] for i in self.tarefa.decodificar(no.estado)]
         print(", ".join(nomes))
 
     def imprimeArvore(self, no: No, n=0):
@@ -56,183 +187,758 @@ class Busca:
         self.imprimeEstado(no)
         return n + 1
 
+    def imprimeEstatisticas(self):
+        if "expandidos" in self.estatisticas:
+            print(f"Nós expandidos: {self.estatisticas['expandidos']}")
+        if "expandidos_base" in self.estatisticas:
+            print(f"Nós expandidos com a contagem de objetivos: {self.estatisticas['expandidos_base']}")
+        if "memoria_fechados" in self.estatisticas:
+            print(f"Memória da lista fechada: {self.estatisticas['memoria_fechados'] / 1024:.2f} KB")
+
     # -------------------------
-    # Aplicar ação
+    # Busca em Largura (BFS)
     # -------------------------
 
-    def realizarAcao(self, acao: Acao, no: No):
-        novoEstado = set(no.estado)
+    def buscaEmLargura(self):
+        inicial = self._noInicial()
+        ops = self.tarefa.ops
+        ids = self.tarefa.ids
+        aplicaveis = self.gerador.aplicaveis
+        objetivo = self.tarefa.objetivo
+        teste = self.tarefa.objetivoTeste
+
+        # Em BFS a ordem de inserção no pool já é a ordem da fila
+        fechados = self._listaFechada()
+        empacotar = fechados.empacotar
+        pool = PoolNos(fechados)
+        zobrist = self.zobrist
+        sid = fechados.inserir(inicial.chave, empacotar(inicial.estado), 0)
+        pool.adicionar(sid, -1, -1, 0, inicial.chave)
+        cabeca = 0
+
+        while cabeca < len(pool):
+            estado = pool.estadoDe(cabeca)
+
+            if estado & teste == objetivo:
+                self.estatisticas["expandidos"] = cabeca
+                self.estatisticas["memoria_fechados"] = fechados.memoria()
+                return pool.paraNo(cabeca)
+
+            g = pool.g[cabeca] + 1
+            chave = pool.chave[cabeca]
+
+            for i in aplicaveis(estado):
+                _, _, naoDel, add = ops[i]
+
+                novo = (estado & naoDel) | add
+                h = zobrist.atualizar(chave, i, estado, novo)
+                empacotado = empacotar(novo)
+
+                if fechados.buscar(h, empacotado) == VAZIO:
+                    sid = fechados.inserir(h, empacotado, len(pool))
+                    pool.adicionar(sid, cabeca, ids[i], g, h)
+
+            cabeca += 1
+
+        self.estatisticas["expandidos"] = cabeca
+        self.estatisticas["memoria_fechados"] = fechados.memoria()
+        return None
 
-        for efeito in acao.poscondicao:
-            if efeito > 0:
-                novoEstado.add(efeito)
-            else:
-                novoEstado.discard(-efeito)
+    # ----------------------------------------------------
+    # Busca bidirecional: BFS para frente a partir do estado inicial e
+    # regressão sobre estados parciais a partir do objetivo
+    # (codigo/regressao.py). A cada passo é expandida a camada inteira
+    # da fronteira menor. Os dois lados se encontram por subsunção: um
+    # estado gerado para frente é procurado nos parciais
+    # (IndiceParciais) e um parcial gerado para trás, nos estados já
+    # gerados para frente (IndiceEstados). O plano é o caminho até o
+    # estado seguido das ações da regressão, aplicadas para frente. O
+    # comprimento não é garantidamente mínimo.
+    # ----------------------------------------------------
 
-        return No(
-            estado=novoEstado,
-            pai=no,
-            acao=self.parser.get_pid(acao.acao),
-            profundidade=no.profundidade + 1
-        )
+    def buscaBidirecional(self):
+        inicial = self._noInicial()
+        objetivo = self.tarefa.objetivo
+        ops = self.tarefa.ops
+        ids = self.tarefa.ids
+        aplicaveis = self.gerador.aplicaveis
+        zobrist = self.zobrist
+        regressao = Regressao(self.tarefa, self.tarefaSAS().grupos)
+
+        if self.verificarFinalizacao(objetivo, inicial.estado):
+            return inicial
+
+        fechados = self._listaFechada()
+        empacotar = fechados.empacotar
+        pool = PoolNos(fechados)
+        sid = fechados.inserir(inicial.chave, empacotar(inicial.estado), 0)
+        raiz = pool.adicionar(sid, -1, -1, 0, inicial.chave)
+        estados = IndiceEstados(self.tarefaSAS())
+        estados.inserir(inicial.estado, 0, raiz)
+
+        # Lado de trás em colunas; o id cresce com g (BFS por camadas)
+        trasTeste = [self.tarefa.objetivoTeste]
+        trasPre = [objetivo]
+        trasPai = array('i', [-1])
+        trasAcao = array('i', [-1])
+        trasG = array('i', [0])
+        indice = IndiceParciais()
+        indice.inserir(trasTeste[0], trasPre[0], 0)
+
+        camadaFrente = [raiz]
+        camadaTras = [0]
+        encontro = None
+        expandidos = 0
+
+        while camadaFrente and camadaTras and encontro is None:
+            proxima = []
+
+            if len(camadaFrente) <= len(camadaTras):
+                for atual in camadaFrente:
+                    estado = pool.estadoDe(atual)
+                    g = pool.g[atual] + 1
+                    chave = pool.chave[atual]
+                    expandidos += 1
+
+                    for i in aplicaveis(estado):
+                        _, _, naoDel, add = ops[i]
+                        novoEstado = (estado & naoDel) | add
+                        hz = zobrist.atualizar(chave, i, estado, novoEstado)
+                        empacotado = empacotar(novoEstado)
+                        if fechados.buscar(hz, empacotado) != VAZIO:
+                            continue
+
+                        sid = fechados.inserir(hz, empacotado, len(pool))
+                        novo = pool.adicionar(sid, atual, ids[i], g, hz)
+                        proxima.append(novo)
+                        estados.inserir(novoEstado, g, novo)
+
+                        t = indice.encontrar(novoEstado)
+                        if t is not None and (encontro is None or g + trasG[t] < encontro[0]):
+                            encontro = (g + trasG[t], novo, t)
+                camadaFrente = proxima
 
-    # --------------------------------------------
-    # Filtrar ações relevantes (reduz a expansão)
-    # --------------------------------------------
+            else:
+                for atual in camadaTras:
+                    g = trasG[atual] + 1
+                    expandidos += 1
+
+                    for i, teste, pre in regressao.regredir(trasTeste[atual], trasPre[atual]):
+                        if indice.buscar(teste, pre) is not None:
+                            continue
+
+                        novo = len(trasPre)
+                        trasTeste.append(teste)
+                        trasPre.append(pre)
+                        trasPai.append(atual)
+                        trasAcao.append(i)
+                        trasG.append(g)
+                        indice.inserir(teste, pre, novo)
+                        proxima.append(novo)
+
+                        casado = estados.minimo(teste, pre, INFINITO if encontro is None else encontro[0] - g)
+                        if casado is not None:
+                            encontro = (casado[0] + g, casado[1], novo)
+                camadaTras = proxima
+
+        self.estatisticas["expandidos"] = expandidos
+        self.estatisticas["memoria_fechados"] = fechados.memoria()
+        self.estatisticas["estados_parciais"] = len(trasPre)
+
+        if encontro is None:
+            return None
 
-    def acao_relevante(self, acao: Acao):
-        if not self.relevantes:
-            self._build_relevantes()
+        # Caminho até o encontro, depois as ações da regressão para frente
+        _, atual, t = encontro
+        no = pool.paraNo(atual)
+        while trasPai[t] != -1:
+            i = trasAcao[t]
+            _, _, naoDel, add = ops[i]
+            no = No((no.estado & naoDel) | add, no, ids[i], no.profundidade + 1)
+            t = trasPai[t]
+        return no
 
-        for e in acao.poscondicao:
-            if e > 0 and e in self.relevantes:
-                return True
+    # ----------------------------------------------------
+    # Busca bidirecional heurística MM (meet in the middle)
+    #
+    # A* para frente sobre estados completos e para trás sobre estados
+    # parciais (regressão), sempre expandindo o lado com a menor
+    # prioridade pr = max(g + h, 2g). Para frente, h é a heurística
+    # escolhida; para trás, h é o h_max do estado inicial até os fatos
+    # exigidos pelo parcial, calculado uma vez só.
+    #
+    # Todo nó gerado é casado com o outro lado (IndiceParciais para os
+    # estados, IndiceEstados para os parciais) e U guarda o plano mais
+    # barato encontrado. A busca para quando U não passa do limite
+    # inferior max(C, fmin_frente, fmin_tras, gmin_frente + gmin_tras + 1),
+    # com C a menor prioridade nas duas filas; com heurística
+    # admissível, o plano é ótimo.
+    # ----------------------------------------------------
 
-        for p in acao.precondicao:
-            if abs(p) in self.relevantes:
-                return True
+    def buscaMM(self):
+        inicial = self._noInicial()
+        objetivo = self.tarefa.objetivo
+        ops = self.tarefa.ops
+        ids = self.tarefa.ids
+        aplicaveis = self.gerador.aplicaveis
+        zobrist = self.zobrist
+        sas = self.tarefaSAS()
+        regressao = Regressao(self.tarefa, sas.grupos)
+
+        if self.verificarFinalizacao(objetivo, inicial.estado):
+            return inicial
+
+        heuristica = self._cacheHeuristica()
+        custoInicial = HeuristicaRelaxada(self.tarefa, "max").custos(inicial.estado)
+
+        def hTras(pre):
+            return max((custoInicial[b] for b in iterar_bits(pre)), default=0)
+
+        fechados = self._listaFechada()
+        empacotar = fechados.empacotar
+        pool = PoolNos(fechados)
+        sid = fechados.inserir(inicial.chave, empacotar(inicial.estado), 0)
+        raiz = pool.adicionar(sid, -1, -1, 0, inicial.chave)
+        estados = IndiceEstados(sas)
+        estados.inserir(inicial.estado, 0, raiz)
+
+        trasTeste = [self.tarefa.objetivoTeste]
+        trasPre = [objetivo]
+        trasPai = array('i', [-1])
+        trasAcao = array('i', [-1])
+        trasG = array('i', [0])
+        parciais = IndiceParciais()
+        parciais.inserir(trasTeste[0], trasPre[0], (0, 0))
+
+        # Cada lado tem três filas com remoção preguiçosa, por
+        # prioridade, por f e por g: (chave, desempate, nó, g)
+        contador = count()
+        frente = ([], [], [])
+        tras = ([], [], [])
+        expandidosFrente = set()
+        expandidosTras = set()
 
-        return False
+        def validoFrente(n, g):
+            return n not in expandidosFrente and fechados.valores[pool.estado[n]] == n
 
-    # -------------------------
-    # Busca em Largura (BFS)
-    # -------------------------
+        def validoTras(t, g):
+            return t not in expandidosTras and trasG[t] == g
 
-    def buscaEmLargura(self):
-        fila = deque([self.parser.noInicial])
-        visitados = {frozenset(self.parser.noInicial.estado)}
+        def inserir(filas, n, g, h):
+            c = next(contador)
+            heappush(filas[0], (max(g + h, 2 * g), c, n, g))
+            heappush(filas[1], (g + h, c, n, g))
+            heappush(filas[2], (g, c, n, g))
 
-        while fila:
-            noAtual = fila.popleft()
+        def minimo(fila, valido):
+            while fila and not valido(fila[0][2], fila[0][3]):
+                heappop(fila)
+            return fila[0][0] if fila else INFINITO
 
-            if self.verificarFinalizacao(self.parser.estadoFinal, noAtual.estado):
-                return noAtual
+        inserir(frente, raiz, 0, heuristica(inicial.chave, inicial.estado, objetivo))
+        inserir(tras, 0, 0, hTras(objetivo))
 
-            for _, acao in self.parser.acoes.items():
-                if not self.acao_relevante(acao):
-                    continue
+        U = INFINITO
+        encontro = None
+        expandidos = 0
 
-                if self.verificaPreCondicao(acao, noAtual):
-                    novo = self.realizarAcao(acao, noAtual)
-                    est = frozenset(novo.estado)
+        while True:
+            prFrente = minimo(frente[0], validoFrente)
+            prTras = minimo(tras[0], validoTras)
+            if prFrente == INFINITO or prTras == INFINITO:
+                break
 
-                    if est not in visitados:
-                        visitados.add(est)
-                        fila.append(novo)
+            limite = max(min(prFrente, prTras),
+                         minimo(frente[1], validoFrente), minimo(tras[1], validoTras),
+                         minimo(frente[2], validoFrente) + minimo(tras[2], validoTras) + 1)
+            if U <= limite:
+                break
 
-        return None
+            expandidos += 1
+
+            if prFrente <= prTras:
+                _, _, atual, g = heappop(frente[0])
+                expandidosFrente.add(atual)
+                estado = pool.estadoDe(atual)
+                chave = pool.chave[atual]
+                g += 1
+                novos = []
+                chaves = []
+                novosEstados = []
+
+                for i in aplicaveis(estado):
+                    _, _, naoDel, add = ops[i]
+                    novoEstado = (estado & naoDel) | add
+                    hz = zobrist.atualizar(chave, i, estado, novoEstado)
+                    empacotado = empacotar(novoEstado)
+
+                    anterior = fechados.buscar(hz, empacotado)
+                    if anterior != VAZIO and g >= pool.g[fechados.valores[anterior]]:
+                        continue
+
+                    sid = fechados.inserir(hz, empacotado, len(pool))
+                    novo = pool.adicionar(sid, atual, ids[i], g, hz)
+                    estados.inserir(novoEstado, g, novo)
+
+                    casado = parciais.encontrar(novoEstado)
+                    if casado is not None and g + casado[0] < U:
+                        U = g + casado[0]
+                        encontro = (novo, casado[1])
+
+                    novos.append(novo)
+                    chaves.append(hz)
+                    novosEstados.append(novoEstado)
+
+                if novos:
+                    for novo, h in zip(novos, heuristica.lote(chaves, novosEstados, objetivo)):
+                        if g + h < U:
+                            inserir(frente, novo, g, h)
 
-    # -------------------------
-    # Heurística H_ADD (simples)
-    # -------------------------
+            else:
+                _, _, atual, g = heappop(tras[0])
+                expandidosTras.add(atual)
+                g += 1
+
+                for i, teste, pre in regressao.regredir(trasTeste[atual], trasPre[atual]):
+                    h = hTras(pre)
+                    if g + h >= U:
+                        continue
+
+                    anterior = parciais.buscar(teste, pre)
+                    if anterior is None:
+                        novo = len(trasPre)
+                        trasTeste.append(teste)
+                        trasPre.append(pre)
+                        trasPai.append(atual)
+                        trasAcao.append(i)
+                        trasG.append(g)
+                        parciais.inserir(teste, pre, (g, novo))
+                    elif g < anterior[0]:
+                        novo = anterior[1]
+                        trasPai[novo] = atual
+                        trasAcao[novo] = i
+                        trasG[novo] = g
+                        expandidosTras.discard(novo)
+                        parciais.atualizar(teste, pre, (g, novo))
+                    else:
+                        continue
+
+                    casado = estados.minimo(teste, pre, U - g)
+                    if casado is not None:
+                        U = g + casado[0]
+                        encontro = (casado[1], novo)
+
+                    inserir(tras, novo, g, h)
+
+        self.estatisticas["expandidos"] = expandidos
+        self.estatisticas["memoria_fechados"] = fechados.memoria()
+        self.estatisticas["estados_parciais"] = len(trasPre)
+        self.estatisticas.update(heuristica.estatisticas())
+
+        if encontro is None:
+            return None
+
+        atual, t = encontro
+        no = pool.paraNo(atual)
+        while trasPai[t] != -1:
+            i = trasAcao[t]
+            _, _, naoDel, add = ops[i]
+            no = No((no.estado & naoDel) | add, no, ids[i], no.profundidade + 1)
+            t = trasPai[t]
+        return no
+
+    # -------------------------------------------------
+    # Heurística escolhida pelo nome (ver HEURISTICAS);
+    # cada função é criada uma vez por busca
+    # -------------------------------------------------
+
+    def funcaoHeuristica(self, nome=None):
+        if nome is None:
+            nome = self.nomeHeuristica or HEURISTICA_PADRAO
+        if nome not in HEURISTICAS:
+            raise ValueError(f"Heurística desconhecida: {nome}")
+
+        if nome not in self.heuristicas:
+            self.heuristicas[nome] = HEURISTICAS[nome](self)
+        return self.heuristicas[nome]
 
     def heuristica(self, estado, objetivo):
-        custos = {lit: 0 for lit in estado}
-        usadas = set()
-        mudou = True
+        return self.funcaoHeuristica()(estado, objetivo)
 
-        while mudou:
-            mudou = False
+    # ----------------------------------------------------
+    # Busca de melhor escolha (A*, A* ponderado e GBFS puro)
+    #
+    # Prioridade f = g + peso * h; com gulosa=True, f = h e um estado
+    # nunca é reaberto. custoMaximo poda os nós que não podem levar a
+    # um plano mais barato que o já conhecido (g + h com heurística
+    # admissível, só g caso contrário). prazo é um instante de
+    # time.time() depois do qual a busca desiste.
+    #
+    # Devolve (nó da solução ou None, True se a busca terminou sem
+    # estourar o prazo).
+    # ----------------------------------------------------
 
-            if all(g in custos for g in objetivo):
-                break
+    def _buscaMelhorPrimeiro(self, heuristica, peso=1, gulosa=False, custoMaximo=INFINITO, prazo=None):
+        inicial = self._noInicial()
+        objetivo = self.tarefa.objetivo
+        ops = self.tarefa.ops
+        ids = self.tarefa.ids
+        aplicaveis = self.gerador.aplicaveis
 
-            for aid, acao in self.parser.acoes.items():
-                if aid in usadas:
-                    continue
+        fechados = self._listaFechada()
+        empacotar = fechados.empacotar
+        pool = PoolNos(fechados)
+        zobrist = self.zobrist
+        sid = fechados.inserir(inicial.chave, empacotar(inicial.estado), 0)
+        raiz = pool.adicionar(sid, -1, -1, 0, inicial.chave)
+
+        admissivel = heuristica.admissivel
+        h_ini = heuristica(inicial.chave, inicial.estado, objetivo)
+        f_ini = h_ini if gulosa else peso * h_ini
 
-                if acao.precondicao.issubset(custos.keys()):
-                    custo_pre = [custos[p] for p in acao.precondicao]
-                    novo_custo = 1 + sum(custo_pre) if custo_pre else 1
+        heap = []
+        contador = count()
+        if not (admissivel and h_ini >= custoMaximo):
+            heappush(heap, (f_ini, h_ini, next(contador), raiz))
+
+        # Com heurística admissível e peso 1, o teste de objetivo só pode
+        # ser feito na expansão (senão o plano pode não ser ótimo)
+        testeNaGeracao = not admissivel or peso != 1 or gulosa
+        expandidos = 0
+        completo = True
+        resultado = None
+
+        # Na lista fechada, o valor de cada estado é o índice do melhor nó
+        while heap and resultado is None:
+            _, _, _, atual = heappop(heap)
+
+            # Entrada antiga: o estado já foi alcançado por um nó melhor
+            if fechados.valores[pool.estado[atual]] != atual:
+                continue
+
+            estado = pool.estadoDe(atual)
+
+            if self.verificarFinalizacao(objetivo, estado):
+                resultado = pool.paraNo(atual)
+                break
 
-                    for efeito in acao.poscondicao:
-                        if efeito > 0:
-                            if efeito not in custos or novo_custo < custos[efeito]:
-                                custos[efeito] = novo_custo
-                                mudou = True
+            if prazo is not None and expandidos & 255 == 0 and time.time() > prazo:
+                completo = False
+                break
 
-                    usadas.add(aid)
+            expandidos += 1
+            g = pool.g[atual] + 1
+            if g >= custoMaximo:
+                continue
+            chave = pool.chave[atual]
+            novos = []
+            chaves = []
+            estados = []
+
+            for i in aplicaveis(estado):
+                _, _, naoDel, add = ops[i]
+
+                novoEstado = (estado & naoDel) | add
+
+                hz = zobrist.atualizar(chave, i, estado, novoEstado)
+                empacotado = empacotar(novoEstado)
+
+                if testeNaGeracao and self.verificarFinalizacao(objetivo, novoEstado):
+                    sid = fechados.inserir(hz, empacotado, len(pool))
+                    resultado = pool.paraNo(pool.adicionar(sid, atual, ids[i], g, hz))
+                    break
+
+                anterior = fechados.buscar(hz, empacotado)
+
+                # h só é calculado para nós que entram na fila; um estado
+                # reaberto com g menor reaproveita o valor do cache
+                if anterior == VAZIO or (not gulosa and g < pool.g[fechados.valores[anterior]]):
+                    sid = fechados.inserir(hz, empacotado, len(pool))
+                    novos.append(pool.adicionar(sid, atual, ids[i], g, hz))
+                    chaves.append(hz)
+                    estados.append(novoEstado)
+
+            # Os sucessores são avaliados juntos (heurísticas vetorizadas
+            # calculam o lote inteiro numa passada só)
+            if resultado is None and novos:
+                for novo, h in zip(novos, heuristica.lote(chaves, estados, objetivo)):
+                    if admissivel and g + h >= custoMaximo:
+                        continue
+                    f = h if gulosa else g + peso * h
+                    heappush(heap, (f, h, next(contador), novo))
 
-        if not all(g in custos for g in objetivo):
-            return float("inf")
+        self.estatisticas["expandidos"] = expandidos
+        self.estatisticas["memoria_fechados"] = fechados.memoria()
+        return resultado, completo
 
-        return sum(custos[g] for g in objetivo)
+    def _cacheHeuristica(self):
+        return CacheHeuristica(self.funcaoHeuristica(), self.capacidadeCache)
 
     # -------------------------
     # Busca A*
     # -------------------------
 
     def buscaAEstrela(self):
-        self._build_relevantes()
+        heuristica = self._cacheHeuristica()
+        resultado, _ = self._buscaMelhorPrimeiro(heuristica)
+        self.estatisticas.update(heuristica.estatisticas())
+        return resultado
 
-        inicial = self.parser.noInicial
-        objetivo = self.parser.estadoFinal
+    # -------------------------
+    # BFS por camadas em paralelo (ver codigo/paralelo.py)
+    # -------------------------
 
-        g_ini = inicial.profundidade or 0
-        h_ini = self.heuristica(inicial.estado, objetivo)
-        f_ini = g_ini + h_ini
+    def buscaEmLarguraParalela(self, processos=None):
+        resultado, estatisticas = bfsCamadas(self, processos)
+        self.estatisticas.update(estatisticas)
+        return resultado
 
-        heap = []
-        contador = count()
-        heappush(heap, (f_ini, h_ini, next(contador), inicial))
+    # -------------------------
+    # A* paralelo (HDA*, ver codigo/paralelo.py)
+    # -------------------------
 
-        visitados = {frozenset(inicial.estado & self.relevantes): g_ini}
+    def buscaHDAEstrela(self, processos=None):
+        resultado, estatisticas = hdaEstrela(self, processos)
+        self.estatisticas.update(estatisticas)
+        return resultado
 
-        while heap:
-            _, _, _, noAtual = heappop(heap)
-            red = frozenset(noAtual.estado & self.relevantes)
+    # -------------------------
+    # A* ponderado (WA*)
+    # -------------------------
 
-            if self.verificarFinalizacao(objetivo, noAtual.estado):
-                return noAtual
+    def buscaAEstrelaPonderada(self, peso=PESO_PADRAO):
+        heuristica = self._cacheHeuristica()
+        resultado, _ = self._buscaMelhorPrimeiro(heuristica, peso)
+        self.estatisticas.update(heuristica.estatisticas())
+        return resultado
 
-            for _, acao in self.parser.acoes.items():
-                if not self.acao_relevante(acao):
-                    continue
-                if not self.verificaPreCondicao(acao, noAtual):
-                    continue
+    # -------------------------
+    # GBFS puro (só h, sem operadores preferidos)
+    # -------------------------
 
-                novo = self.realizarAcao(acao, noAtual)
+    def buscaGulosaPura(self):
+        heuristica = self._cacheHeuristica()
+        resultado, _ = self._buscaMelhorPrimeiro(heuristica, gulosa=True)
+        self.estatisticas.update(heuristica.estatisticas())
+        return resultado
 
-                if self.verificarFinalizacao(objetivo, novo.estado):
-                    return novo
+    # ----------------------------------------------------
+    # A* ponderado anytime com reinícios (RWA*)
+    #
+    # Roda WA* com os pesos de "pesos", em ordem decrescente, sempre do
+    # zero mas com o cache de h compartilhado. Cada rodada só aceita
+    # planos mais baratos que o melhor já encontrado, e cada melhora é
+    # passada na hora a aoMelhorar(no, peso, tempo), se houver. Se uma
+    # rodada esgota a busca sem achar plano melhor, o atual é ótimo e
+    # a busca para.
+    #
+    # Com heurística inadmissível a poda é só por g (g + h poderia
+    # cortar o plano ótimo): a última rodada (peso 1) é exaustiva entre
+    # os estados com g menor que o custo do melhor plano e pode ser
+    # bem mais lenta que as anteriores; tempoLimite a interrompe.
+    # ----------------------------------------------------
 
-                g = novo.profundidade
-                h = self.heuristica(novo.estado, objetivo)
-                f = g + h
+    def buscaAnytime(self, pesos=PESOS_ANYTIME, tempoLimite=None, aoMelhorar=None):
+        heuristica = self._cacheHeuristica()
+        inicio = time.time()
+        prazo = None if tempoLimite is None else inicio + tempoLimite
+        melhor = None
+        custo = INFINITO
+        planos = []
+        expandidos = 0
+        memoria = 0
+
+        for peso in pesos:
+            resultado, _ = self._buscaMelhorPrimeiro(heuristica, peso, custoMaximo=custo, prazo=prazo)
+            expandidos += self.estatisticas["expandidos"]
+            memoria = max(memoria, self.estatisticas["memoria_fechados"])
+
+            # Sem plano melhor: ou o prazo acabou ou o atual já é o melhor
+            if resultado is None:
+                break
 
-                red_novo = frozenset(novo.estado & self.relevantes)
+            melhor = resultado
+            custo = resultado.profundidade
+            tempo = time.time() - inicio
+            planos.append((custo, peso, tempo))
+            if aoMelhorar is not None:
+                aoMelhorar(resultado, peso, tempo)
 
-                if red_novo not in visitados or g < visitados[red_novo]:
-                    visitados[red_novo] = g
-                    heappush(heap, (f, h, next(contador), novo))
+        self.estatisticas["expandidos"] = expandidos
+        self.estatisticas["memoria_fechados"] = memoria
+        self.estatisticas["planos"] = planos
+        self.estatisticas.update(heuristica.estatisticas())
+        return melhor
 
-        return None
+    # ----------------------------------------------------
+    # Busca gulosa (GBFS) com operadores preferidos
+    #
+    # Avaliação preguiçosa: o nó entra na fila com o h do pai e só é
+    # avaliado quando sai dela. Os sucessores gerados por ações úteis
+    # (h_FF) entram também numa segunda fila; as duas são alternadas,
+    # e a de preferidos ganha BONUS_PREFERIDOS vezes de prioridade a
+    # cada melhora do melhor h já visto. Sem heurística escolhida, usa
+    # HEURISTICA_GBFS; uma heurística sem ações úteis é um erro (para
+    # busca gulosa sem preferidos há a GBFS-puro).
+    # ----------------------------------------------------
+
+    def buscaGulosa(self):
+        inicial = self._noInicial()
+        objetivo = self.tarefa.objetivo
+        ops = self.tarefa.ops
+        ids = self.tarefa.ids
+        aplicaveis = self.gerador.aplicaveis
+        nome = self.nomeHeuristica or HEURISTICA_GBFS
+        avaliar = getattr(self.funcaoHeuristica(nome), "avaliar", None)
+        if avaliar is None:
+            raise ValueError(f"A GBFS usa as ações úteis do h_FF e a heurística {nome} não as fornece; "
+                             f"use \"{HEURISTICA_GBFS}\" ou a GBFS-puro.")
+
+        fechados = self._listaFechada()
+        empacotar = fechados.empacotar
+        pool = PoolNos(fechados)
+        zobrist = self.zobrist
+        sid = fechados.inserir(inicial.chave, empacotar(inicial.estado), 0)
+        raiz = pool.adicionar(sid, -1, -1, 0, inicial.chave)
+
+        if self.verificarFinalizacao(objetivo, inicial.estado):
+            return pool.paraNo(raiz)
+
+        contador = count()
+        filas = ([(0, next(contador), raiz)], [])
+        expandido = bytearray()
+        melhor = INFINITO
+        bonus = 0
+        vez = 0
+        expandidos = 0
+        resultado = None
+
+        while filas[0] or filas[1]:
+            # Escolhe a fila: bônus dos preferidos, senão alterna
+            if filas[1] and (bonus > 0 or vez or not filas[0]):
+                fila = filas[1]
+                if bonus > 0:
+                    bonus -= 1
+            else:
+                fila = filas[0]
+            vez ^= 1
+
+            _, _, atual = heappop(fila)
+            if atual < len(expandido) and expandido[atual]:
+                continue
+            if len(expandido) <= atual:
+                expandido.extend(bytes(len(pool) - len(expandido)))
+            expandido[atual] = 1
+
+            estado = pool.estadoDe(atual)
+            h, uteis = avaliar(estado, objetivo)
+            if h == INFINITO:
+                continue
+            if h < melhor:
+                melhor = h
+                bonus += BONUS_PREFERIDOS
+            expandidos += 1
+
+            g = pool.g[atual] + 1
+            chave = pool.chave[atual]
+
+            for i in aplicaveis(estado):
+                _, _, naoDel, add = ops[i]
+                novoEstado = (estado & naoDel) | add
+
+                hz = zobrist.atualizar(chave, i, estado, novoEstado)
+                empacotado = empacotar(novoEstado)
+                anterior = fechados.buscar(hz, empacotado)
+                if anterior != VAZIO:
+                    # Já gerado por outra ação: se ainda não foi expandido
+                    # e agora veio por uma ação útil, vira preferido
+                    no = fechados.valores[anterior]
+                    if i in uteis and not (no < len(expandido) and expandido[no]):
+                        heappush(filas[1], (h, next(contador), no))
+                    continue
+
+                sid = fechados.inserir(hz, empacotado, len(pool))
+                novo = pool.adicionar(sid, atual, ids[i], g, hz)
+
+                if self.verificarFinalizacao(objetivo, novoEstado):
+                    resultado = pool.paraNo(novo)
+                    break
+
+                entrada = (h, next(contador), novo)
+                heappush(filas[0], entrada)
+                if i in uteis:
+                    heappush(filas[1], entrada)
+
+            if resultado is not None:
+                break
+
+        self.estatisticas["expandidos"] = expandidos
+        self.estatisticas["memoria_fechados"] = fechados.memoria()
+        return resultado
 
     # -------------------------
     # Dispatcher
     # -------------------------
 
-    def executar_busca(self, tipo="BFS", limite=None):
-        import tracemalloc
-
-        tracemalloc.start()
-        inicio_tempo = time.time()
+    # --------------------
+    # Seleção da busca (sem impressão nem medição; usada também pelo
+    # portfólio em codigo/portfolio.py)
+    # --------------------
 
-        # --------------------
-        # Seleção da busca
-        # --------------------
+    def buscar(self, tipo="BFS", limite=None, peso=None, tempoLimite=None, processos=None, aoMelhorar=None):
         if tipo == "BFS":
-            resultado = self.buscaEmLargura()
+            return self.buscaEmLargura()
+        elif tipo == "BFS-paralelo":
+            return self.buscaEmLarguraParalela(processos)
         elif tipo =="DLS":
             if limite is None:
                 raise ValueError("Para DLS (Busca em Profundidade Limitada), informe um limite.")
-            resultado = self.buscaEmProfundidadeLimitada(self.parser.noInicial, limite, {})
+            return self.buscaEmProfundidadeLimitada(limite)
         elif tipo == "IDS":
-            resultado = self.iddfs(self.parser.noInicial)
+            return self.iddfs()
+        elif tipo == "Bidirecional":
+            return self.buscaBidirecional()
+        elif tipo == "MM":
+            return self.buscaMM()
+        elif tipo == "IDA*":
+            return self.buscaIDAEstrela()
         elif tipo == "A*":
-            resultado = self.buscaAEstrela()
-        else:
-            raise ValueError(f"Tipo de busca desconhecido: {tipo}")
+            return self.buscaAEstrela()
+        elif tipo == "HDA*":
+            return self.buscaHDAEstrela(processos)
+        elif tipo == "WA*":
+            return self.buscaAEstrelaPonderada(PESO_PADRAO if peso is None else peso)
+        elif tipo == "AWA*":
+            return self.buscaAnytime(tempoLimite=tempoLimite, aoMelhorar=aoMelhorar)
+        elif tipo == "GBFS":
+            return self.buscaGulosa()
+        elif tipo == "GBFS-puro":
+            return self.buscaGulosaPura()
+        raise ValueError(f"Tipo de busca desconhecido: {tipo}")
+
+    # ----------------------------------------------------
+    # Roda a busca medindo tempo e memória e imprime o plano. Com
+    # comparar=True, as buscas guiadas por heurística são repetidas com
+    # a contagem de objetivos e as expansões dessa rodada aparecem em
+    # "expandidos_base" (a GBFS, que precisa das ações úteis do h_FF,
+    # é comparada com a GBFS-puro).
+    # ----------------------------------------------------
+
+    def executar_busca(self, tipo="BFS", limite=None, heuristica=None, cache=None, peso=None, tempoLimite=None,
+                       processos=None, comparar=True):
+        import tracemalloc
+
+        if heuristica is not None:
+            self.funcaoHeuristica(heuristica)
+            self.nomeHeuristica = heuristica
+        if cache is not None:
+            self.capacidadeCache = cache
+
+        tracemalloc.start()
+        self.estatisticas = {}
+        inicio_tempo = time.time()
+
+        resultado = self.buscar(tipo, limite, peso, tempoLimite, processos, self._imprimeMelhora)
 
         fim_tempo = time.time()
         tempo_total = fim_tempo - inicio_tempo
@@ -243,6 +949,10 @@ class Busca:
         mem_atual, mem_pico = tracemalloc.get_traced_memory()
         tracemalloc.stop()
 
+        escolhida = self.nomeHeuristica or (HEURISTICA_GBFS if tipo == "GBFS" else HEURISTICA_PADRAO)
+        if comparar and tipo in BUSCAS_HEURISTICAS and escolhida != HEURISTICA_BASE:
+            self.estatisticas["expandidos_base"] = self._expansoesBase(tipo, limite, peso, tempoLimite, processos)
+
         # --------------------
         # Impressão
         # --------------------
@@ -252,11 +962,13 @@ class Busca:
             print(f"\nTempo de Execução: {tempo_total:.3f} segundos")
             print(f"Memória atual: {mem_atual / 1024:.2f} KB")
             print(f"Memória pico: {mem_pico / 1024:.2f} KB")
+            self.imprimeEstatisticas()
         else:
             print("\nNenhuma solução encontrada.")
             print(f"Tempo de Execução: {tempo_total:.3f} segundos")
             print(f"Memória atual: {mem_atual / 1024:.2f} KB")
             print(f"Memória pico: {mem_pico / 1024:.2f} KB")
+            self.imprimeEstatisticas()
 
         # --------------------
         # Retornar dados
@@ -265,50 +977,287 @@ class Busca:
             "solucao": resultado,
             "tempo": tempo_total,
             "memoria_atual": mem_atual,
-            "memoria_pico": mem_pico
+            "memoria_pico": mem_pico,
+            **self.estatisticas
         }
+
+    def _imprimeMelhora(self, no, peso, tempo):
+        print(f"Plano de custo {no.profundidade} encontrado (peso {peso}) em {tempo:.3f} segundos")
+
+    def _expansoesBase(self, tipo, limite, peso, tempoLimite, processos):
+        estatisticas = self.estatisticas
+        nome = self.nomeHeuristica
+        self.nomeHeuristica = HEURISTICA_BASE
+        self.estatisticas = {}
+        try:
+            self.buscar("GBFS-puro" if tipo == "GBFS" else tipo, limite, peso, tempoLimite, processos)
+            return self.estatisticas.get("expandidos")
+        finally:
+            self.nomeHeuristica = nome
+            self.estatisticas = estatisticas
         
     # ----------------------------------------------------
-    # Busca em Profundidade Limitada (usada por DLS/IDS)
+    # Aprofundamento iterativo em f = g + h (IDA*), usado também por
+    # DLS com h = 0.
+    #
+    # Cada iteração é uma busca em profundidade com pilha explícita
+    # (sem recursão) que corta os nós com f acima do limite; o próximo
+    # limite é o menor f cortado. A memória é linear na profundidade,
+    # mais a tabela de transposição de tamanho fixo, que poda estados
+    # já alcançados na mesma iteração com g menor ou igual.
+    #
+    # Um objetivo gerado dentro do limite já é ótimo (com h admissível):
+    # nenhuma iteração anterior achou plano, então nenhum custa menos
+    # que o limite atual.
     # ----------------------------------------------------
 
-    def buscaEmProfundidadeLimitada(self, noAtual, limite, visitados):
-        red = frozenset(noAtual.estado & self.relevantes)
+    def _buscaAprofundamento(self, heuristica, limite=None, limiteMaximo=INFINITO, bitsTabela=BITS_TRANSPOSICAO):
+        inicial = self._noInicial()
+        tabela = TabelaTransposicao(bitsTabela)
 
-        if red in visitados and visitados[red] <= noAtual.profundidade:
-            return None
+        if self.verificarFinalizacao(self.tarefa.objetivo, inicial.estado):
+            return inicial
 
-        visitados[red] = noAtual.profundidade
+        if limite is None:
+            limite = heuristica(inicial.chave, inicial.estado, self.tarefa.objetivo)
+        expandidos = 0
+        marca = 0
+        resultado = None
 
-        if self.verificarFinalizacao(self.parser.estadoFinal, noAtual.estado):
-            return noAtual
+        while limite <= limiteMaximo:
+            marca += 1
+            plano, proximo, n = self._dfsLimitado(inicial.estado, inicial.chave, 0, limite, heuristica, tabela, marca)
+            expandidos += n
 
-        if noAtual.profundidade >= limite:
-            return None
+            if plano is not None:
+                resultado = self._noDoPlano(plano)
+                break
+            if proximo == INFINITO:
+                break
+            limite = proximo
+
+        self.estatisticas["expandidos"] = expandidos
+        self.estatisticas["iteracoes"] = marca
+        self.estatisticas["tabela_transposicao"] = tabela.ocupadas
+        return resultado
+
+    def _dfsLimitado(self, estado, chave, g0, limite, heuristica, tabela, marca):
+        """
+        Uma iteração a partir de (estado, chave), que está na
+        profundidade g0. Devolve (plano a partir dele ou None, menor f
+        cortado, nós expandidos).
+        """
+        objetivo = self.tarefa.objetivo
+        ops = self.tarefa.ops
+        zobrist = self.zobrist
+        incremental = self.incremental
+
+        # Sem heurística, um nó no limite não tem filho dentro dele
+        cortarNoLimite = heuristica is _semHeuristica
+        proximo = INFINITO
+        expandidos = 1
+
+        # Pilha do caminho atual, em colunas: estado, hash, ações
+        # aplicáveis e a próxima delas a tentar; plano tem as ações
+        estados = [estado]
+        chaves = [chave]
+        aplicaveis = [incremental.inicial(estado)]
+        posicoes = [0]
+        plano = []
+        tabela.inserir(chave, estado, g0, marca)
+
+        while aplicaveis:
+            lista = aplicaveis[-1]
+            k = posicoes[-1]
+            if k == len(lista):
+                estados.pop()
+                chaves.pop()
+                aplicaveis.pop()
+                posicoes.pop()
+                if plano:
+                    plano.pop()
+                continue
+            posicoes[-1] = k + 1
+
+            i = lista[k]
+            estado = estados[-1]
+            _, _, naoDel, add = ops[i]
+            novo = (estado & naoDel) | add
+            g = g0 + len(estados)
+            hz = zobrist.atualizar(chaves[-1], i, estado, novo)
 
-        for _, acao in self.parser.acoes.items():
-            if not self.acao_relevante(acao):
+            anterior = tabela.buscar(hz, novo, marca)
+            if anterior is not None and anterior <= g:
                 continue
-            if not self.verificaPreCondicao(acao, noAtual):
+
+            f = g + heuristica(hz, novo, objetivo)
+            if f > limite:
+                if f < proximo:
+                    proximo = f
                 continue
+            tabela.inserir(hz, novo, g, marca)
 
-            novo = self.realizarAcao(acao, noAtual)
-            r = self.buscaEmProfundidadeLimitada(novo, limite, visitados)
+            if self.verificarFinalizacao(objetivo, novo):
+                plano.append(i)
+                return plano, proximo, expandidos
 
-            if r is not None:
-                return r
+            if cortarNoLimite and g >= limite:
+                if g + 1 < proximo:
+                    proximo = g + 1
+                continue
 
-        return None
+            estados.append(novo)
+            chaves.append(hz)
+            plano.append(i)
+            expandidos += 1
+            aplicaveis.append(incremental.filho(lista, estado, novo))
+            posicoes.append(0)
+
+        return None, proximo, expandidos
+
+    # Refaz o plano (índices locais das ações) a partir do estado inicial
+    def _noDoPlano(self, plano):
+        ops = self.tarefa.ops
+        ids = self.tarefa.ids
+        no = self._noInicial()
+        for i in plano:
+            _, _, naoDel, add = ops[i]
+            novo = (no.estado & naoDel) | add
+            chave = self.zobrist.atualizar(no.chave, i, no.estado, novo)
+            no = No(novo, no, ids[i], no.profundidade + 1, chave)
+        return no
+
+    # -------------------------
+    # IDA*
+    # -------------------------
+
+    def buscaIDAEstrela(self, bitsTabela=BITS_TRANSPOSICAO):
+        heuristica = self._cacheHeuristica()
+        resultado = self._buscaAprofundamento(heuristica, bitsTabela=bitsTabela)
+        self.estatisticas.update(heuristica.estatisticas())
+        return resultado
 
     # -------------------------
-    # IDS
+    # Busca em Profundidade Limitada (DLS)
     # -------------------------
 
-    def iddfs(self, noInicial):
+    def buscaEmProfundidadeLimitada(self, limite):
+        return self._buscaAprofundamento(_semHeuristica, limite, limite)
+
+    # ----------------------------------------------------
+    # IDS que retoma da fronteira da iteração anterior
+    #
+    # Enquanto couber no orçamento (bytes), os nós da profundidade L
+    # ficam guardados numa lista fechada compacta, junto com o caminho
+    # até cada um (array('H') com L ações por nó), e a iteração L + 1
+    # só expande essa fronteira. Duplicatas são descartadas contra a
+    # fronteira nova e as duas anteriores, o que basta quando as ações
+    # são reversíveis, como no mundo dos blocos (sem isso só há
+    # trabalho repetido, nunca perda de completude).
+    #
+    # Quando a fronteira nova estoura o orçamento, ela é descartada e as
+    # iterações seguintes voltam a regenerar a árvore, mas em
+    # profundidade a partir da última fronteira guardada, não da raiz.
+    # ----------------------------------------------------
+
+    def iddfs(self, orcamento=ORCAMENTO_FRONTEIRA):
+        inicial = self._noInicial()
+        objetivo = self.tarefa.objetivo
+        ops = self.tarefa.ops
+        aplicaveis = self.gerador.aplicaveis
+        zobrist = self.zobrist
+
+        if self.verificarFinalizacao(objetivo, inicial.estado):
+            return inicial
+
+        atual = self._listaFechada()
+        empacotar = atual.empacotar
+        atual.inserir(inicial.chave, empacotar(inicial.estado))
+        caminhos = array('H')
+        anterior = None
+        profundidade = 0
+
+        guardando = True
+        tabela = None
         limite = 0
-        while True:
-            resultado = self.buscaEmProfundidadeLimitada(noInicial, limite, {})
-            if resultado is not None:
-                return resultado
+        marca = 0
+        expandidos = 0
+        memoria = 0
+        resultado = None
+
+        while resultado is None:
             limite += 1
 
+            if guardando:
+                proxima = self._listaFechada()
+                novosCaminhos = array('H')
+                base = atual.memoria() + caminhos.itemsize * len(caminhos)
+                if anterior is not None:
+                    base += anterior.memoria()
+
+                for sid in range(len(atual)):
+                    estado = atual[sid]
+                    chave = atual.hashes[sid]
+                    caminho = caminhos[sid * profundidade:(sid + 1) * profundidade]
+                    expandidos += 1
+
+                    for i in aplicaveis(estado):
+                        _, _, naoDel, add = ops[i]
+                        novo = (estado & naoDel) | add
+                        if self.verificarFinalizacao(objetivo, novo):
+                            resultado = self._noDoPlano(caminho.tolist() + [i])
+                            break
+
+                        hz = zobrist.atualizar(chave, i, estado, novo)
+                        empacotado = empacotar(novo)
+                        if (proxima.buscar(hz, empacotado) != VAZIO or atual.buscar(hz, empacotado) != VAZIO
+                                or (anterior is not None and anterior.buscar(hz, empacotado) != VAZIO)):
+                            continue
+                        proxima.inserir(hz, empacotado)
+                        novosCaminhos.extend(caminho)
+                        novosCaminhos.append(i)
+
+                    if resultado is not None:
+                        break
+
+                    usada = base + proxima.memoria() + novosCaminhos.itemsize * len(novosCaminhos)
+                    memoria = max(memoria, usada)
+                    if usada > orcamento:
+                        guardando = False
+                        break
+
+                if resultado is not None:
+                    break
+                if guardando:
+                    # Nada novo na profundidade L: espaço esgotado
+                    if not len(proxima):
+                        break
+                    anterior, atual, caminhos, profundidade = atual, proxima, novosCaminhos, limite
+                    continue
+
+                # Estourou o orçamento: a iteração L é refeita regenerando
+                # a partir da fronteira guardada
+                proxima = novosCaminhos = anterior = None
+                tabela = TabelaTransposicao(BITS_TRANSPOSICAO)
+                limite -= 1
+                continue
+
+            marca += 1
+            algumCorte = False
+            for sid in range(len(atual)):
+                plano, proximo, n = self._dfsLimitado(atual[sid], atual.hashes[sid], profundidade, limite,
+                                                      _semHeuristica, tabela, marca)
+                expandidos += n
+                if plano is not None:
+                    caminho = caminhos[sid * profundidade:(sid + 1) * profundidade]
+                    resultado = self._noDoPlano(caminho.tolist() + plano)
+                    break
+                algumCorte = algumCorte or proximo != INFINITO
+
+            if resultado is None and not algumCorte:
+                break
+
+        self.estatisticas["expandidos"] = expandidos
+        self.estatisticas["profundidade_fronteira"] = profundidade
+        self.estatisticas["memoria_fronteira"] = memoria
+        return resultado
@@ -0,0 +1,106 @@
+from array import array
+
+
+# ------------------------------------------------------------
+# Lista fechada compacta com endereçamento aberto.
+#
+# Cada estado é guardado como uma chave empacotada de largura fixa
+# num único bytearray, na ordem de inserção (a posição é o id do
+# estado). A tabela de espalhamento guarda só índices (array('i'))
+# e usa sondagem linear; ao passar da carga máxima, dobra de tamanho.
+#
+#   chaves   -> bytearray com n * largura bytes
+#   hashes   -> array('Q') com o hash de cada estado (Zobrist)
+#   valores  -> array('i') livre para a busca (ex.: índice do nó)
+#   indices  -> array('i') com a tabela de espalhamento (-1 = vazio)
+# ------------------------------------------------------------
+
+VAZIO = -1
+CARGA_MAXIMA = 0.5
+
+
+class ListaFechada:
+    def __init__(self, empacotar, desempacotar, largura, capacidade=1024):
+        self.empacotar = empacotar
+        self.desempacotar = desempacotar
+        self.largura = largura
+
+        self.chaves = bytearray()
+        self.hashes = array('Q')
+        self.valores = array('i')
+
+        tamanho = 1
+        while tamanho < capacidade:
+            tamanho *= 2
+        self.indices = array('i', [VAZIO]) * tamanho
+        self.mascara = tamanho - 1
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def __getitem__(self, sid):
+        w = self.largura
+        return self.desempacotar(bytes(self.chaves[sid * w:(sid + 1) * w]))
+
+    def chave(self, sid):
+        w = self.largura
+        return bytes(self.chaves[sid * w:(sid + 1) * w])
+
+    # -------------------------
+    # Consulta e inserção
+    # -------------------------
+
+    def _procurar(self, h, chave):
+        w = self.largura
+        indices = self.indices
+        mascara = self.mascara
+        pos = h & mascara
+
+        while True:
+            sid = indices[pos]
+            if sid == VAZIO:
+                return pos, VAZIO
+            if self.hashes[sid] == h and self.chaves[sid * w:(sid + 1) * w] == chave:
+                return pos, sid
+            pos = (pos + 1) & mascara
+
+    # A chave já empacotada (self.empacotar(estado)) é passada pela busca,
+    # para empacotar cada estado gerado uma única vez.
+    def buscar(self, h, chave):
+        return self._procurar(h, chave)[1]
+
+    def inserir(self, h, chave, valor=0):
+        pos, sid = self._procurar(h, chave)
+        if sid != VAZIO:
+            self.valores[sid] = valor
+            return sid
+
+        sid = len(self.hashes)
+        self.chaves += chave
+        self.hashes.append(h)
+        self.valores.append(valor)
+        self.indices[pos] = sid
+
+        if len(self.hashes) > CARGA_MAXIMA * len(self.indices):
+            self._redimensionar()
+        return sid
+
+    def _redimensionar(self):
+        tamanho = len(self.indices) * 2
+        self.indices = array('i', [VAZIO]) * tamanho
+        self.mascara = tamanho - 1
+
+        indices = self.indices
+        mascara = self.mascara
+        for sid, h in enumerate(self.hashes):
+            pos = h & mascara
+            while indices[pos] != VAZIO:
+                pos = (pos + 1) & mascara
+            indices[pos] = sid
+
+    # Bytes efetivamente ocupados pelos buffers da tabela
+    def memoria(self):
+        return (len(self.chaves)
+                + self.hashes.itemsize * len(self.hashes)
+                + self.valores.itemsize * len(self.valores)
+                + self.indices.itemsize * len(self.indices))
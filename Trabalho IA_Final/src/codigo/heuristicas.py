@@ -0,0 +1,431 @@
+from collections import OrderedDict
+from heapq import heappush, heappop
+
+from codigo.tarefa import iterar_bits
+
+
+INFINITO = float("inf")
+
+
+# ------------------------------------------------------------
+# h_add / h_max por Dijkstra generalizado sobre a tarefa relaxada
+# (sem deletes). As listas de incidência fato -> ações são montadas
+# uma vez; por avaliação, cada ação guarda um contador de
+# pré-condições ainda não alcançadas e só dispara quando ele zera.
+#
+#   h_add: custo(ação) = 1 + soma dos custos das pré-condições
+#   h_max: custo(ação) = 1 + maior custo entre as pré-condições
+#
+# A busca para assim que todos os fatos do objetivo saem da fila.
+# ------------------------------------------------------------
+
+class HeuristicaRelaxada:
+    def __init__(self, tarefa, combinar="add"):
+        if combinar not in ("add", "max"):
+            raise ValueError(f"Combinação desconhecida: {combinar}")
+
+        self.tarefa = tarefa
+        self.soma = combinar == "add"
+        self.admissivel = not self.soma
+
+        self.numPre = []
+        self.efeitos = []
+        self.usadaPor = [[] for _ in tarefa.props]
+        self.semPre = []
+
+        for i, acao in enumerate(tarefa.acoes):
+            pre = list(iterar_bits(acao.mascaraPre))
+            self.numPre.append(len(pre))
+            self.efeitos.append(tuple(iterar_bits(acao.mascaraAdd)))
+            for b in pre:
+                self.usadaPor[b].append(i)
+            if not pre:
+                self.semPre.append(i)
+
+        self.usadaPor = [tuple(l) for l in self.usadaPor]
+
+    def custos(self, estado, objetivo=0, suporte=None):
+        """
+        Custo relaxado de cada fato (INFINITO se inalcançável). Com
+        objetivo, para assim que todos os fatos dele forem fixados.
+        Se "suporte" for uma lista, recebe a melhor ação de cada fato.
+        """
+        custo = [INFINITO] * len(self.usadaPor)
+        faltam = self.numPre[:]
+        acumulado = [0] * len(faltam)
+        efeitos = self.efeitos
+        usadaPor = self.usadaPor
+        soma = self.soma
+
+        # Custos são inteiros (ações de custo 1): a fila de prioridade é
+        # uma lista de baldes indexada pelo custo
+        baldes = [list(iterar_bits(estado))]
+        for b in baldes[0]:
+            custo[b] = 0
+        if self.semPre:
+            baldes.append([])
+            for i in self.semPre:
+                for e in efeitos[i]:
+                    if 1 < custo[e]:
+                        custo[e] = 1
+                        baldes[1].append(e)
+                        if suporte is not None:
+                            suporte[e] = i
+
+        restantes = bin(objetivo).count("1")
+        c = 0
+
+        while c < len(baldes):
+            for b in baldes[c]:
+                if c > custo[b]:
+                    continue
+
+                if objetivo >> b & 1:
+                    restantes -= 1
+                    if restantes == 0:
+                        return custo
+
+                for i in usadaPor[b]:
+                    if soma:
+                        acumulado[i] += c
+                    elif c > acumulado[i]:
+                        acumulado[i] = c
+
+                    faltam[i] -= 1
+                    if faltam[i] == 0:
+                        nc = acumulado[i] + 1
+                        for e in efeitos[i]:
+                            if nc < custo[e]:
+                                custo[e] = nc
+                                while len(baldes) <= nc:
+                                    baldes.append([])
+                                baldes[nc].append(e)
+                                if suporte is not None:
+                                    suporte[e] = i
+            c += 1
+
+        return custo
+
+    def __call__(self, estado, objetivo):
+        custo = self.custos(estado, objetivo)
+        valores = [custo[g] for g in iterar_bits(objetivo)]
+        if not valores:
+            return 0
+        return sum(valores) if self.soma else max(valores)
+
+
+# ------------------------------------------------------------
+# Cache de valores heurísticos com remoção LRU, indexado pelo hash
+# Zobrist do estado. O estado fica guardado junto para descartar
+# colisões de hash. capacidade <= 0 desliga o cache.
+# ------------------------------------------------------------
+
+class CacheHeuristica:
+    def __init__(self, funcao, capacidade):
+        self.funcao = funcao
+        self.capacidade = capacidade
+        self.admissivel = getattr(funcao, "admissivel", False)
+        self.tabela = OrderedDict()
+        self.acertos = 0
+        self.falhas = 0
+        self.remocoes = 0
+
+    def __call__(self, chave, estado, objetivo):
+        item = self.tabela.get(chave)
+        if item is not None and item[0] == estado:
+            self.tabela.move_to_end(chave)
+            self.acertos += 1
+            return item[1]
+
+        self.falhas += 1
+        h = self.funcao(estado, objetivo)
+        self._guardar(chave, estado, h)
+        return h
+
+    def lote(self, chaves, estados, objetivo):
+        """
+        Avalia vários estados de uma vez. As falhas do cache vão juntas
+        para funcao.lote, quando a heurística sabe avaliar em lote.
+        """
+        valores = [None] * len(estados)
+        faltando = []
+        for j, (chave, estado) in enumerate(zip(chaves, estados)):
+            item = self.tabela.get(chave)
+            if item is not None and item[0] == estado:
+                self.tabela.move_to_end(chave)
+                self.acertos += 1
+                valores[j] = item[1]
+            else:
+                faltando.append(j)
+
+        if faltando:
+            self.falhas += len(faltando)
+            avaliar = getattr(self.funcao, "lote", None)
+            if avaliar is not None:
+                calculados = avaliar([estados[j] for j in faltando], objetivo)
+            else:
+                calculados = [self.funcao(estados[j], objetivo) for j in faltando]
+            for j, h in zip(faltando, calculados):
+                valores[j] = h
+                self._guardar(chaves[j], estados[j], h)
+        return valores
+
+    def _guardar(self, chave, estado, h):
+        if self.capacidade > 0:
+            self.tabela[chave] = (estado, h)
+            self.tabela.move_to_end(chave)
+            if len(self.tabela) > self.capacidade:
+                self.tabela.popitem(last=False)
+                self.remocoes += 1
+
+    def estatisticas(self):
+        return {
+            "cache_acertos": self.acertos,
+            "cache_falhas": self.falhas,
+            "cache_remocoes": self.remocoes,
+        }
+
+
+# ------------------------------------------------------------
+# h_FF: tamanho de um plano relaxado extraído a partir dos melhores
+# suportes do h_add. As ações do plano relaxado aplicáveis no
+# próprio estado são as "ações úteis" (operadores preferidos).
+# ------------------------------------------------------------
+
+class HeuristicaFF(HeuristicaRelaxada):
+    def __init__(self, tarefa):
+        super().__init__(tarefa, "add")
+        self.admissivel = False
+        self.pre = [tuple(iterar_bits(acao.mascaraPre)) for acao in tarefa.acoes]
+        self.mascaraPre = [acao.mascaraPre for acao in tarefa.acoes]
+
+    def avaliar(self, estado, objetivo):
+        """
+        Retorna (h, ações úteis). h é INFINITO se o objetivo não é
+        alcançável nem na relaxação.
+        """
+        suporte = [-1] * len(self.usadaPor)
+        custo = self.custos(estado, objetivo, suporte)
+
+        pilha = []
+        for g in iterar_bits(objetivo):
+            if custo[g] == INFINITO:
+                return INFINITO, ()
+            if custo[g] > 0:
+                pilha.append(g)
+
+        plano = set()
+        marcados = set(pilha)
+        while pilha:
+            i = suporte[pilha.pop()]
+            if i in plano:
+                continue
+            plano.add(i)
+            for b in self.pre[i]:
+                if custo[b] > 0 and b not in marcados:
+                    marcados.add(b)
+                    pilha.append(b)
+
+        mascaraPre = self.mascaraPre
+        uteis = [i for i in plano if estado & mascaraPre[i] == mascaraPre[i]]
+        return len(plano), uteis
+
+    def __call__(self, estado, objetivo):
+        return self.avaliar(estado, objetivo)[0]
+
+
+# ------------------------------------------------------------
+# Contagem de objetivos não satisfeitos (admissível, mas fraca);
+# serve de referência para comparar o número de expansões.
+# ------------------------------------------------------------
+
+class HeuristicaObjetivos:
+    admissivel = True
+
+    def __init__(self, tarefa):
+        self.negativos = tarefa.objetivoTeste & ~tarefa.objetivo
+
+    def __call__(self, estado, objetivo):
+        return bin(objetivo & ~estado | estado & self.negativos).count("1")
+
+
+# ------------------------------------------------------------
+# LM-cut (admissível). A cada rodada:
+#   1. calcula h_max com os custos atuais das ações, guardando o
+#      suporte de cada ação (a pré-condição de maior h_max);
+#   2. zona do objetivo: fatos que chegam ao objetivo pelo grafo de
+#      justificação só com ações de custo zero;
+#   3. o corte são as ações alcançáveis a partir do estado sem
+#      entrar na zona que têm algum efeito dentro dela;
+#   4. soma o menor custo do corte a h e desconta-o das ações dele.
+# Para quando h_max(objetivo) chega a zero. Só a primeira rodada
+# calcula h_max do zero; as seguintes apenas propagam as reduções.
+#
+# Dois fatos artificiais: "inicio" (pré-condição das ações sem
+# pré-condição) e "fim", adicionado pela ação artificial do objetivo.
+# ------------------------------------------------------------
+
+class HeuristicaLMCut:
+    admissivel = True
+
+    def __init__(self, tarefa):
+        n = len(tarefa.props)
+        self.inicio = n
+        self.fim = n + 1
+
+        self.pre = []
+        self.efeitos = []
+        for acao in tarefa.acoes:
+            self.pre.append(tuple(iterar_bits(acao.mascaraPre)) or (self.inicio,))
+            self.efeitos.append(tuple(iterar_bits(acao.mascaraAdd)))
+
+        # Ação artificial do objetivo (custo 0), sempre a última
+        self.pre.append(())
+        self.efeitos.append((self.fim,))
+        self.custoOriginal = [1] * len(tarefa.acoes) + [0]
+
+        self.usadaPor = [[] for _ in range(n + 2)]
+        self.adicionadaPor = [[] for _ in range(n + 2)]
+        for i, pre in enumerate(self.pre):
+            for b in pre:
+                self.usadaPor[b].append(i)
+            for e in self.efeitos[i]:
+                self.adicionadaPor[e].append(i)
+
+        self.objetivo = None
+        self._montarObjetivo(tarefa.objetivo)
+
+    def _montarObjetivo(self, objetivo):
+        g = len(self.pre) - 1
+        for b in self.pre[g]:
+            self.usadaPor[b].remove(g)
+        self.pre[g] = tuple(iterar_bits(objetivo)) or (self.inicio,)
+        for b in self.pre[g]:
+            self.usadaPor[b].append(g)
+        self.objetivo = objetivo
+
+    def _hmax(self, estado, custoAcao):
+        """
+        h_max de cada fato e o suporte de cada ação (-1 se inalcançável).
+        O suporte é a última pré-condição a sair da fila, isto é, a de
+        maior custo.
+        """
+        custo = [INFINITO] * len(self.usadaPor)
+        suporte = [-1] * len(self.pre)
+        faltam = [len(pre) for pre in self.pre]
+        efeitos = self.efeitos
+        usadaPor = self.usadaPor
+
+        baldes = [list(iterar_bits(estado))]
+        baldes[0].append(self.inicio)
+        for b in baldes[0]:
+            custo[b] = 0
+
+        c = 0
+        while c < len(baldes):
+            # Ações de custo zero podem acrescentar fatos ao balde atual
+            for b in baldes[c]:
+                if c > custo[b]:
+                    continue
+                for i in usadaPor[b]:
+                    faltam[i] -= 1
+                    if faltam[i] == 0:
+                        suporte[i] = b
+                        nc = c + custoAcao[i]
+                        for e in efeitos[i]:
+                            if nc < custo[e]:
+                                custo[e] = nc
+                                while len(baldes) <= nc:
+                                    baldes.append([])
+                                baldes[nc].append(e)
+            c += 1
+
+        return custo, suporte
+
+    def _reduzir(self, corte, m, custo, suporte, custoAcao):
+        """
+        Desconta m das ações do corte e atualiza h_max de forma
+        incremental: os custos só diminuem, então basta propagar a
+        partir dos efeitos do corte, recalculando o suporte das ações
+        cujo suporte ficou mais barato.
+        """
+        pre = self.pre
+        efeitos = self.efeitos
+        usadaPor = self.usadaPor
+
+        fila = []
+        for i in corte:
+            custoAcao[i] -= m
+            nc = custo[suporte[i]] + custoAcao[i]
+            for e in efeitos[i]:
+                if nc < custo[e]:
+                    custo[e] = nc
+                    heappush(fila, (nc, e))
+
+        while fila:
+            c, b = heappop(fila)
+            if c > custo[b]:
+                continue
+            for i in usadaPor[b]:
+                if suporte[i] != b:
+                    continue
+                s = max(pre[i], key=custo.__getitem__)
+                suporte[i] = s
+                nc = custo[s] + custoAcao[i]
+                for e in efeitos[i]:
+                    if nc < custo[e]:
+                        custo[e] = nc
+                        heappush(fila, (nc, e))
+
+    def __call__(self, estado, objetivo):
+        if objetivo != self.objetivo:
+            self._montarObjetivo(objetivo)
+
+        custoAcao = self.custoOriginal[:]
+        efeitos = self.efeitos
+        usadaPor = self.usadaPor
+        adicionadaPor = self.adicionadaPor
+        fim = self.fim
+        h = 0
+
+        custo, suporte = self._hmax(estado, custoAcao)
+        if custo[fim] == INFINITO:
+            return INFINITO
+
+        while custo[fim] > 0:
+            # Zona do objetivo (para trás, por ações de custo zero)
+            zona = bytearray(len(custo))
+            zona[fim] = 1
+            pilha = [fim]
+            while pilha:
+                e = pilha.pop()
+                for i in adicionadaPor[e]:
+                    s = suporte[i]
+                    if custoAcao[i] == 0 and s != -1 and not zona[s]:
+                        zona[s] = 1
+                        pilha.append(s)
+
+            # Alcançáveis a partir do estado sem entrar na zona
+            corte = set()
+            alcancados = bytearray(zona)
+            pilha = list(iterar_bits(estado))
+            pilha.append(self.inicio)
+            for b in pilha:
+                alcancados[b] = 1
+            while pilha:
+                b = pilha.pop()
+                for i in usadaPor[b]:
+                    if suporte[i] != b:
+                        continue
+                    for e in efeitos[i]:
+                        if zona[e]:
+                            corte.add(i)
+                        elif not alcancados[e]:
+                            alcancados[e] = 1
+                            pilha.append(e)
+
+            m = min(custoAcao[i] for i in corte)
+            h += m
+            self._reduzir(corte, m, custo, suporte, custoAcao)
+
+        return h
@@ -0,0 +1,262 @@
+from codigo.tarefa import iterar_bits
+
+
+# ------------------------------------------------------------
+# Síntese de invariantes (grupos de mutex) e tradução SAS+
+#
+# Um grupo G de proposições é invariante ("no máximo uma verdadeira")
+# se o estado inicial tem no máximo uma proposição de G e toda ação
+# que torna verdadeira uma proposição de G também apaga outra de G
+# que está na sua pré-condição. No mundo dos blocos isso encontra,
+# por exemplo:
+#   {on_x_*, ontable_x, holding_x}   (onde está o bloco x)
+#   {clear_x, on_*_x, holding_x}      (o que está sobre x)
+#   {handempty, holding_*}
+#
+# Cada grupo escolhido vira uma variável de domínio finito; o estado
+# passa a ser uma tupla curta de inteiros pequenos.
+# ------------------------------------------------------------
+
+LIMITE_EXPANSOES = 2000
+
+
+class Invariantes:
+    def __init__(self, tarefa):
+        self.tarefa = tarefa
+        n = len(tarefa.props)
+
+        self.pre = [acao.mascaraPre for acao in tarefa.acoes]
+        self.add = [acao.mascaraAdd & ~acao.mascaraPre for acao in tarefa.acoes]
+        self.dele = [acao.mascaraDel & acao.mascaraPre & ~acao.mascaraAdd for acao in tarefa.acoes]
+
+        # Proposição -> ações que a adicionam
+        self.adicionadoPor = [[] for _ in range(n)]
+        for i, add in enumerate(self.add):
+            for b in iterar_bits(add):
+                self.adicionadoPor[b].append(i)
+
+        # Ficam fora dos grupos as proposições que aparecem negadas e as
+        # apagadas sem estar na pré-condição (efeito condicional em SAS+)
+        self.excluidas = tarefa.objetivoTeste & ~tarefa.objetivo
+        for acao in tarefa.acoes:
+            self.excluidas |= acao.mascaraTeste & ~acao.mascaraPre
+            self.excluidas |= acao.mascaraDel & ~acao.mascaraPre
+
+    # -------------------------
+    # Verificações do grupo
+    # -------------------------
+
+    def _consistente(self, grupo):
+        if bin(self.tarefa.inicial & grupo).count("1") > 1:
+            return False
+        for b in iterar_bits(grupo):
+            for i in self.adicionadoPor[b]:
+                m = self.add[i] & grupo
+                if m & (m - 1):
+                    return False
+        return True
+
+    def _violacao(self, grupo):
+        for b in iterar_bits(grupo):
+            for i in self.adicionadoPor[b]:
+                if not self.dele[i] & grupo:
+                    return i
+        return None
+
+    # Busca em profundidade com retrocesso: a cada ação que viola o
+    # grupo, tenta incluir uma das proposições que ela apaga.
+    def _expandir(self, grupo, orcamento):
+        if orcamento[0] <= 0:
+            return None
+        orcamento[0] -= 1
+
+        i = self._violacao(grupo)
+        if i is None:
+            return grupo
+
+        for c in iterar_bits(self.dele[i] & ~self.excluidas):
+            novo = grupo | (1 << c)
+            if self._consistente(novo):
+                r = self._expandir(novo, orcamento)
+                if r is not None:
+                    return r
+
+        return None
+
+    def sintetizar(self):
+        grupos = []
+        cobertos = 0
+
+        for b in range(len(self.tarefa.props)):
+            semente = 1 << b
+            if semente & (cobertos | self.excluidas):
+                continue
+            grupo = self._expandir(semente, [LIMITE_EXPANSOES])
+            if grupo is not None and grupo != semente:
+                grupos.append(grupo)
+                cobertos |= grupo
+
+        return grupos
+
+
+# ------------------------------------------------------------
+# Tarefa SAS+: uma variável por grupo de mutex escolhido e uma
+# variável binária para cada proposição que ficou de fora.
+# ------------------------------------------------------------
+
+class TarefaSAS:
+    def __init__(self, tarefa, grupos=None):
+        self.tarefa = tarefa
+
+        if grupos is None:
+            grupos = Invariantes(tarefa).sintetizar()
+        self.grupos = grupos
+
+        # Cobertura gulosa: a cada passo, o grupo com mais proposições
+        # ainda não cobertas (sem repetir proposições entre variáveis)
+        restantes = (1 << len(tarefa.props)) - 1
+        self.variaveis = []
+        grupos = list(grupos)
+        while grupos:
+            grupo = max(grupos, key=lambda g: bin(g & restantes).count("1"))
+            grupo &= restantes
+            if bin(grupo).count("1") <= 1:
+                break
+            self.variaveis.append(list(iterar_bits(grupo)))
+            restantes &= ~grupo
+        for b in iterar_bits(restantes):
+            self.variaveis.append([b])
+
+        # Valor "nenhuma" (índice len(valores)) só quando necessário
+        self.valorDe = {}
+        for v, bits in enumerate(self.variaveis):
+            for k, b in enumerate(bits):
+                self.valorDe[b] = (v, k)
+
+        self.dominios = []
+        self.nenhum = []
+        for v, bits in enumerate(self.variaveis):
+            precisa = len(bits) == 1 or not any(tarefa.inicial >> b & 1 for b in bits)
+            if not precisa:
+                mascara = sum(1 << b for b in bits)
+                precisa = any(acao.mascaraDel & mascara and not acao.mascaraAdd & mascara
+                              for acao in tarefa.acoes)
+            self.nenhum.append(len(bits) if precisa else None)
+            self.dominios.append(len(bits) + (1 if precisa else 0))
+
+        # Máscara de cada valor de cada variável (o "nenhum" vale 0)
+        self.mascaras = [[1 << b for b in bits] + [0] * (self.dominios[v] - len(bits))
+                         for v, bits in enumerate(self.variaveis)]
+
+        # Ações SAS+: pré e efeitos como tuplas (var, valor)
+        self.pre = []
+        self.efeitos = []
+        for acao in tarefa.acoes:
+            pre = {}
+            for b in iterar_bits(acao.mascaraTeste):
+                v, k = self.valorDe[b]
+                if acao.mascaraPre >> b & 1:
+                    pre[v] = k
+                else:
+                    pre[v] = self.nenhum[v]
+            efeitos = {}
+            for b in iterar_bits(acao.mascaraDel & ~acao.mascaraAdd):
+                v, _ = self.valorDe[b]
+                efeitos[v] = self.nenhum[v]
+            for b in iterar_bits(acao.mascaraAdd):
+                v, k = self.valorDe[b]
+                efeitos[v] = k
+            self.pre.append(tuple(sorted(pre.items())))
+            self.efeitos.append(tuple(sorted(efeitos.items())))
+
+        # Largura fixa do estado empacotado (base mista -> bytes)
+        total = 1
+        for d in self.dominios:
+            total *= d
+        self.largura = max(1, ((total - 1).bit_length() + 7) // 8)
+
+        # Pesos para empacotar direto do bitset: o número em base mista é
+        # base + soma dos pesos dos bits verdadeiros
+        multiplicadores = []
+        m = 1
+        for d in reversed(self.dominios):
+            multiplicadores.append(m)
+            m *= d
+        multiplicadores.reverse()
+        self.base = sum((self.nenhum[v] or 0) * multiplicadores[v] for v in range(len(self.variaveis)))
+        self.pesos = [0] * len(tarefa.props)
+        for b, (v, k) in self.valorDe.items():
+            self.pesos[b] = (k - (self.nenhum[v] or 0)) * multiplicadores[v]
+
+        self.inicial = self.codificar(tarefa.inicial)
+        objetivo = [self.valorDe[b] for b in iterar_bits(tarefa.objetivo)]
+        for b in iterar_bits(tarefa.objetivoTeste & ~tarefa.objetivo):
+            v, _ = self.valorDe[b]
+            objetivo.append((v, self.nenhum[v]))
+        self.objetivo = tuple(sorted(objetivo))
+
+    # -------------------------
+    # Conversões
+    # -------------------------
+
+    def codificar(self, estado):
+        valores = list(self.nenhum)
+        for b in iterar_bits(estado):
+            v, k = self.valorDe[b]
+            valores[v] = k
+        return tuple(valores)
+
+    def decodificar(self, valores):
+        estado = 0
+        for v, k in enumerate(valores):
+            estado |= self.mascaras[v][k]
+        return estado
+
+    def empacotar(self, valores):
+        x = 0
+        for d, k in zip(self.dominios, valores):
+            x = x * d + k
+        return x.to_bytes(self.largura, "little")
+
+    def desempacotar(self, dados):
+        x = int.from_bytes(dados, "little")
+        valores = []
+        for d in reversed(self.dominios):
+            x, k = divmod(x, d)
+            valores.append(k)
+        valores.reverse()
+        return tuple(valores)
+
+    # Empacota/desempacota diretamente o estado da tarefa em bitset
+    def empacotarEstado(self, estado):
+        x = self.base
+        pesos = self.pesos
+        while estado:
+            baixo = estado & -estado
+            x += pesos[baixo.bit_length() - 1]
+            estado ^= baixo
+        return x.to_bytes(self.largura, "little")
+
+    def desempacotarEstado(self, dados):
+        x = int.from_bytes(dados, "little")
+        estado = 0
+        for d, mascaras in zip(reversed(self.dominios), reversed(self.mascaras)):
+            x, k = divmod(x, d)
+            estado |= mascaras[k]
+        return estado
+
+    # -------------------------
+    # Semântica
+    # -------------------------
+
+    def aplicavel(self, i, valores):
+        return all(valores[v] == k for v, k in self.pre[i])
+
+    def aplicar(self, i, valores):
+        novo = list(valores)
+        for v, k in self.efeitos[i]:
+            novo[v] = k
+        return tuple(novo)
+
+    def satisfaz(self, valores):
+        return all(valores[v] == k for v, k in self.objetivo)
@@ -0,0 +1,67 @@
+from array import array
+from codigo.acoes import No
+
+
+# ------------------------------------------------------------
+# Pool de nós em colunas paralelas (array('i')), no lugar de
+# uma cadeia de objetos No. Cada nó é apenas um índice:
+#
+#   estado[n] -> id do estado (posição em self.estados)
+#   pai[n]    -> índice do nó pai (-1 na raiz)
+#   acao[n]   -> aid da ação que gerou o nó (-1 na raiz)
+#   g[n]      -> custo / profundidade
+#   chave[n]  -> hash de Zobrist do estado
+#
+# O plano é reconstruído seguindo os índices dos pais.
+# Os estados podem ficar numa lista própria ou, para economizar
+# memória, na lista fechada empacotada (codigo/fechados.py).
+# ------------------------------------------------------------
+
+class PoolNos:
+    def __init__(self, estados=None):
+        self.estados = [] if estados is None else estados
+        self.estado = array('i')
+        self.pai = array('i')
+        self.acao = array('i')
+        self.g = array('i')
+        self.chave = array('Q')
+
+    def __len__(self):
+        return len(self.pai)
+
+    def novoEstado(self, estado):
+        self.estados.append(estado)
+        return len(self.estados) - 1
+
+    def adicionar(self, sid, pai, acao, g, chave=0):
+        self.estado.append(sid)
+        self.pai.append(pai)
+        self.acao.append(acao)
+        self.g.append(g)
+        self.chave.append(chave)
+        return len(self.pai) - 1
+
+    def adicionarEstado(self, estado, pai, acao, g, chave=0):
+        return self.adicionar(self.novoEstado(estado), pai, acao, g, chave)
+
+    def estadoDe(self, n):
+        return self.estados[self.estado[n]]
+
+    def caminho(self, n):
+        nos = []
+        while n != -1:
+            nos.append(n)
+            n = self.pai[n]
+        nos.reverse()
+        return nos
+
+    def plano(self, n):
+        return [self.acao[m] for m in self.caminho(n)[1:]]
+
+    # Monta a cadeia de No apenas para o caminho da solução
+    def paraNo(self, n):
+        no = None
+        for m in self.caminho(n):
+            acao = self.acao[m]
+            no = No(self.estadoDe(m), no, None if acao == -1 else acao, self.g[m])
+        return no
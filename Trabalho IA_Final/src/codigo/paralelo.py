@@ -0,0 +1,560 @@
+import os
+import time
+import zlib
+import multiprocessing as mp
+from array import array
+from heapq import heappush, heappop
+from itertools import count
+from multiprocessing import shared_memory
+from queue import Empty
+
+from codigo.acoes import No
+from codigo.fechados import VAZIO
+from codigo.nos import PoolNos
+
+
+# ------------------------------------------------------------
+# A* paralelo com distribuição por hash (HDA*).
+#
+# Cada estado pertence a um único processo, escolhido pelo hash de
+# Zobrist (hash % processos). Cada processo tem a própria lista
+# aberta, lista fechada e cache de h, e só expande os estados que
+# são dele. Os sucessores vão em lotes de até LOTE nós pela fila
+# (multiprocessing.Queue) do dono, que descarta duplicatas, calcula
+# h e insere na sua lista aberta.
+#
+# Cada processo publica o (f, h) do topo da sua lista aberta e só
+# expande um nó que não passa do menor (f, h) publicado, a mesma
+# ordem do A* (empates em f desempatados pelo menor h). Sem isso, um
+# processo expande os nós da própria fila mesmo com f bem acima do
+# mínimo global, nós que o A* nunca expandiria.
+#
+# O teste de objetivo é o mesmo do A* (_buscaMelhorPrimeiro):
+#   - com heurística admissível, um objetivo só é aceito na expansão
+#     e o melhor custo encontrado (U) é compartilhado; nós com f >= U
+#     são descartados. A busca termina quando todos os processos
+#     estão ociosos (nada com f < U) e nenhuma mensagem está em
+#     trânsito: o coordenador (processo principal) conta as mensagens
+#     enviadas e recebidas por todos e exige duas leituras seguidas
+#     iguais, com tudo ocioso e os totais batendo. O custo é ótimo,
+#     igual ao do A*;
+#   - com heurística não admissível, o objetivo é testado na geração e
+#     o primeiro plano encontrado encerra a busca. Como no A*, o custo
+#     não é garantido e pode variar com a ordem entre os processos.
+#
+# O pai de cada nó é um id global (índice local * processos + dono);
+# no fim, o coordenador pede os pais um a um para montar o plano.
+# ------------------------------------------------------------
+
+# Nós por mensagem entre processos
+LOTE = 64
+
+# Expansões entre duas leituras da caixa de entrada (e envios dos
+# lotes). Com mais de uma, os sucessores dos outros donos esperam no
+# lote enquanto eles expandem nós piores: em blocks-7-0, com hadd e
+# 4 processos, 32 expansões por rodada davam ~300 nós expandidos
+# contra 46 do A*
+EXPANSOES_POR_RODADA = 1
+
+# Segundos de espera na caixa de entrada quando ocioso (e intervalo
+# entre as leituras do coordenador)
+ESPERA = 0.005
+
+# U antes de qualquer plano (o valor compartilhado é um int C)
+SEM_PLANO = 2 ** 31 - 1
+
+# (f, h) publicado por cada processo num int64: f << BITS_H | h, ou
+# SEM_FRONTEIRA quando não há nada a expandir
+BITS_H = 24
+SEM_FRONTEIRA = 2 ** 63 - 1
+
+
+def _chave(f, h):
+    return int(f) << BITS_H | int(h)
+
+
+def _trabalhador(dono, processos, parser, nomeHeuristica, capacidade, canais):
+    # Importado aqui porque codigo.busca importa este módulo
+    from codigo.busca import Busca
+
+    caixas, respostas, enviados, recebidos, ociosos, fronteira, melhor, vencedor, parar = canais
+
+    # Mesma compilação do processo principal: bits, hashes e ids iguais
+    busca = Busca(parser)
+    busca._noInicial()
+    busca.nomeHeuristica = nomeHeuristica
+    busca.capacidadeCache = capacidade
+    heuristica = busca._cacheHeuristica()
+    testeNaGeracao = not heuristica.admissivel
+
+    objetivo = busca.tarefa.objetivo
+    objetivoTeste = busca.tarefa.objetivoTeste
+    ops = busca.tarefa.ops
+    ids = busca.tarefa.ids
+    aplicaveis = busca.gerador.aplicaveis
+    zobrist = busca.zobrist
+
+    fechados = busca._listaFechada()
+    empacotar = fechados.empacotar
+    pool = PoolNos(fechados)
+
+    caixa = caixas[dono]
+    heap = []
+    contador = count()
+    saidas = [[] for _ in range(processos)]
+    expandidos = 0
+
+    # nos: (estado, hash, g, pai global, aid)
+    def receber(nos):
+        novos = []
+        chaves = []
+        estados = []
+        for estado, hz, g, pai, acao in nos:
+            empacotado = empacotar(estado)
+            anterior = fechados.buscar(hz, empacotado)
+            if anterior != VAZIO and g >= pool.g[fechados.valores[anterior]]:
+                continue
+            sid = fechados.inserir(hz, empacotado, len(pool))
+            novos.append(pool.adicionar(sid, pai, acao, g, hz))
+            chaves.append(hz)
+            estados.append(estado)
+
+        U = melhor.value
+        for n, h in zip(novos, heuristica.lote(chaves, estados, objetivo)):
+            f = pool.g[n] + h
+            if f < U:
+                heappush(heap, (f, h, next(contador), n))
+
+    def achou(g, n, i):
+        # Plano de custo g: o nó n (i == -1) ou o filho dele pela ação i
+        with melhor.get_lock():
+            if g < melhor.value:
+                melhor.value = g
+                vencedor[0] = dono
+                vencedor[1] = n
+                vencedor[2] = i
+
+    def enviar(destino):
+        enviados[dono] += 1
+        caixas[destino].put(saidas[destino])
+        saidas[destino] = []
+
+    while not parar.is_set():
+        while True:
+            try:
+                lote = caixa.get_nowait()
+            except Empty:
+                break
+            ociosos[dono] = 0
+            receber(lote)
+            recebidos[dono] += 1
+
+        U = melhor.value
+        rodada = 0
+        while heap and rodada < EXPANSOES_POR_RODADA:
+            f, h = heap[0][0], heap[0][1]
+            if f >= U:
+                heap.clear()
+                break
+
+            # Espera os outros processos alcançarem este (f, h)
+            fronteira[dono] = _chave(f, h)
+            if fronteira[dono] > min(fronteira):
+                break
+
+            _, _, _, atual = heappop(heap)
+            if fechados.valores[pool.estado[atual]] != atual:
+                continue
+
+            estado = pool.estadoDe(atual)
+            g = pool.g[atual]
+            if estado & objetivoTeste == objetivo:
+                achou(g, atual, -1)
+                U = melhor.value
+                continue
+
+            expandidos += 1
+            rodada += 1
+            chave = pool.chave[atual]
+            pai = atual * processos + dono
+            for i in aplicaveis(estado):
+                _, _, naoDel, add = ops[i]
+                novoEstado = (estado & naoDel) | add
+                if testeNaGeracao and novoEstado & objetivoTeste == objetivo:
+                    achou(g + 1, atual, i)
+                    U = melhor.value
+                    break
+                hz = zobrist.atualizar(chave, i, estado, novoEstado)
+                destino = hz % processos
+                saidas[destino].append((novoEstado, hz, g + 1, pai, ids[i]))
+                if destino != dono and len(saidas[destino]) >= LOTE:
+                    enviar(destino)
+
+            # Os sucessores locais entram logo na lista aberta
+            if saidas[dono]:
+                locais = saidas[dono]
+                saidas[dono] = []
+                receber(locais)
+
+        for destino in range(processos):
+            if destino != dono and saidas[destino]:
+                enviar(destino)
+
+        # Ocioso: nada com f < U e tudo já enviado
+        if not heap or heap[0][0] >= melhor.value:
+            heap.clear()
+            fronteira[dono] = SEM_FRONTEIRA
+            ociosos[dono] = 1
+        else:
+            fronteira[dono] = _chave(heap[0][0], heap[0][1])
+            if fronteira[dono] <= min(fronteira):
+                continue
+
+        # Ocioso ou à frente do menor (f, h): espera lotes novos
+        try:
+            lote = caixa.get(timeout=ESPERA)
+        except Empty:
+            continue
+        ociosos[dono] = 0
+        receber(lote)
+        recebidos[dono] += 1
+
+    # Depois da busca: avisa o coordenador e responde os pedidos de pai.
+    # Se a busca parou no primeiro plano, ainda pode haver lotes na
+    # caixa; eles são ignorados
+    respostas.put(dono)
+    while True:
+        pedido = caixa.get()
+        if isinstance(pedido, list):
+            continue
+        if pedido is None:
+            respostas.put((expandidos, fechados.memoria()))
+            return
+        respostas.put((pool.estadoDe(pedido), pool.pai[pedido], pool.acao[pedido], pool.g[pedido]))
+
+
+def hdaEstrela(busca, processos=None):
+    """
+    Devolve (nó da solução ou None, estatísticas).
+    """
+    inicial = busca._noInicial()
+    if busca.verificarFinalizacao(busca.tarefa.objetivo, inicial.estado):
+        return inicial, {"expandidos": 0, "processos": 0}
+
+    if processos is None:
+        processos = os.cpu_count() or 1
+
+    # A última posição dos contadores é a do coordenador (nó inicial)
+    caixas = [mp.Queue() for _ in range(processos)]
+    respostas = mp.Queue()
+    enviados = mp.RawArray('q', processos + 1)
+    recebidos = mp.RawArray('q', processos + 1)
+    ociosos = mp.RawArray('b', processos)
+    fronteira = mp.RawArray('q', [SEM_FRONTEIRA] * processos)
+    melhor = mp.Value('i', SEM_PLANO)
+    vencedor = mp.RawArray('i', 3)
+    parar = mp.Event()
+    canais = (caixas, respostas, enviados, recebidos, ociosos, fronteira, melhor, vencedor, parar)
+
+    trabalhadores = [mp.Process(target=_trabalhador,
+                                args=(dono, processos, busca.parser, busca.nomeHeuristica,
+                                      busca.capacidadeCache, canais),
+                                daemon=True)
+                     for dono in range(processos)]
+    for p in trabalhadores:
+        p.start()
+
+    enviados[processos] += 1
+    caixas[inicial.chave % processos].put([(inicial.estado, inicial.chave, 0, -1, -1)])
+    primeiroPlano = not busca.funcaoHeuristica().admissivel
+
+    try:
+        anterior = None
+        while True:
+            time.sleep(ESPERA)
+            if not all(p.is_alive() for p in trabalhadores):
+                raise RuntimeError("Um processo da busca paralela terminou com erro.")
+            if primeiroPlano and melhor.value != SEM_PLANO:
+                break
+            retrato = (all(ociosos), sum(enviados), sum(recebidos))
+            if retrato[0] and retrato[1] == retrato[2] and retrato == anterior:
+                break
+            anterior = retrato
+        parar.set()
+        for _ in trabalhadores:
+            respostas.get()
+
+        resultado = None
+        if melhor.value != SEM_PLANO:
+            caminho = []
+            dono, n, i = vencedor[0], vencedor[1], vencedor[2]
+            while True:
+                caixas[dono].put(n)
+                estado, pai, acao, g = respostas.get()
+                caminho.append((estado, acao, g))
+                if pai == -1:
+                    break
+                dono, n = pai % processos, pai // processos
+
+            for estado, acao, g in reversed(caminho):
+                resultado = No(estado, resultado, None if acao == -1 else acao, g)
+            # Objetivo testado na geração: falta o filho pela ação i
+            if i != -1:
+                _, _, naoDel, add = busca.tarefa.ops[i]
+                resultado = No((resultado.estado & naoDel) | add, resultado, busca.tarefa.ids[i],
+                               resultado.profundidade + 1)
+
+        for caixa in caixas:
+            caixa.put(None)
+        estatisticas = {"expandidos": 0, "memoria_fechados": 0, "processos": processos}
+        for _ in trabalhadores:
+            expandidos, memoria = respostas.get()
+            estatisticas["expandidos"] += expandidos
+            estatisticas["memoria_fechados"] += memoria
+        for p in trabalhadores:
+            p.join()
+    finally:
+        for p in trabalhadores:
+            if p.is_alive():
+                p.terminate()
+
+    return resultado, estatisticas
+
+
+# ------------------------------------------------------------
+# BFS por camadas em paralelo, com a fronteira em memória
+# compartilhada.
+#
+# Cada camada é um único bloco de SharedMemory com os estados
+# empacotados (largura fixa, codigo/invariantes.py), em ordem. Para
+# cada camada:
+#   1. cada processo expande uma fatia contígua da camada e manda
+#      os filhos, em lotes, para o dono de cada um (crc32 do estado
+#      empacotado % processos); um marcador fecha os lotes da camada;
+#   2. o dono descarta os filhos que já estão na sua lista fechada e
+#      responde quantos estados novos ficou;
+#   3. o coordenador cria o bloco da próxima camada e dá a cada dono
+#      o deslocamento onde ele grava os seus estados novos; o dono
+#      devolve o pai (índice na camada anterior) e a ação de cada um.
+# O coordenador só guarda pai e ação (dois ints por estado) para
+# refazer o plano. Um objetivo gerado na camada d + 1 é ótimo; a
+# busca termina ao fim dessa camada.
+# ------------------------------------------------------------
+
+# Filhos por mensagem entre processos
+LOTE_BFS = 1024
+
+MASCARA_64 = (1 << 64) - 1
+
+
+def _trabalhadorBFS(dono, processos, parser, tarefas, caixas, respostas):
+    from codigo.busca import Busca
+
+    busca = Busca(parser)
+    busca._noInicial()
+    objetivo = busca.tarefa.objetivo
+    objetivoTeste = busca.tarefa.objetivoTeste
+    ops = busca.tarefa.ops
+    aplicaveis = busca.gerador.aplicaveis
+    sas = busca.tarefaSAS()
+    empacotar = sas.empacotarEstado
+    desempacotar = sas.desempacotarEstado
+    largura = sas.largura
+
+    # Só o conjunto de estados já vistos deste dono (o valor não é usado)
+    fechados = busca._listaFechada()
+    novos = bytearray()
+    pais = array('i')
+    acoes = array('i')
+    expandidos = 0
+
+    def receber(chaves, paisLote, acoesLote):
+        for k in range(len(paisLote)):
+            chave = bytes(chaves[k * largura:(k + 1) * largura])
+            h = hash(chave) & MASCARA_64
+            if fechados.buscar(h, chave) != VAZIO:
+                continue
+            fechados.inserir(h, chave, 0)
+            novos.extend(chave)
+            pais.append(paisLote[k])
+            acoes.append(acoesLote[k])
+
+    while True:
+        comando = tarefas[dono].get()
+
+        if comando[0] == "fim":
+            respostas.put((dono, expandidos, fechados.memoria()))
+            return
+
+        if comando[0] == "inicial":
+            chave = comando[1]
+            fechados.inserir(hash(chave) & MASCARA_64, chave, 0)
+
+        elif comando[0] == "expandir":
+            _, nome, inicio, fim = comando
+            bloco = shared_memory.SharedMemory(name=nome)
+            saidas = [(bytearray(), array('i'), array('i')) for _ in range(processos)]
+            achado = None
+
+            for idx in range(inicio, fim):
+                estado = desempacotar(bytes(bloco.buf[idx * largura:(idx + 1) * largura]))
+                expandidos += 1
+                for i in aplicaveis(estado):
+                    _, _, naoDel, add = ops[i]
+                    novo = (estado & naoDel) | add
+                    if achado is None and novo & objetivoTeste == objetivo:
+                        achado = (idx, i)
+
+                    chave = empacotar(novo)
+                    destino = zlib.crc32(chave) % processos
+                    chaves, paisLote, acoesLote = saidas[destino]
+                    chaves.extend(chave)
+                    paisLote.append(idx)
+                    acoesLote.append(i)
+                    if len(paisLote) >= LOTE_BFS:
+                        if destino == dono:
+                            receber(*saidas[destino])
+                        else:
+                            caixas[destino].put((bytes(chaves), paisLote.tobytes(), acoesLote.tobytes()))
+                        saidas[destino] = (bytearray(), array('i'), array('i'))
+            bloco.close()
+
+            # Resto dos lotes e o marcador de fim da camada para cada dono
+            for destino in range(processos):
+                chaves, paisLote, acoesLote = saidas[destino]
+                if destino == dono:
+                    receber(chaves, paisLote, acoesLote)
+                    continue
+                if paisLote:
+                    caixas[destino].put((bytes(chaves), paisLote.tobytes(), acoesLote.tobytes()))
+                caixas[destino].put(None)
+
+            marcadores = 0
+            while marcadores < processos - 1:
+                lote = caixas[dono].get()
+                if lote is None:
+                    marcadores += 1
+                    continue
+                chaves, paisLote, acoesLote = lote
+                receber(chaves, array('i', paisLote), array('i', acoesLote))
+
+            respostas.put((dono, len(pais), achado))
+
+        elif comando[0] == "gravar":
+            _, nome, deslocamento = comando
+            bloco = shared_memory.SharedMemory(name=nome)
+            bloco.buf[deslocamento * largura:deslocamento * largura + len(novos)] = novos
+            bloco.close()
+            respostas.put((dono, pais.tobytes(), acoes.tobytes()))
+            novos = bytearray()
+            pais = array('i')
+            acoes = array('i')
+
+
+def bfsCamadas(busca, processos=None):
+    """
+    Devolve (nó da solução ou None, estatísticas).
+    """
+    inicial = busca._noInicial()
+    if busca.verificarFinalizacao(busca.tarefa.objetivo, inicial.estado):
+        return inicial, {"expandidos": 0, "processos": 0}
+
+    if processos is None:
+        processos = os.cpu_count() or 1
+
+    sas = busca.tarefaSAS()
+    largura = sas.largura
+    chave = sas.empacotarEstado(inicial.estado)
+
+    # O primeiro bloco é criado antes dos processos para que eles herdem
+    # o resource_tracker; senão cada um abre o seu e, ao terminar, tenta
+    # apagar de novo os blocos que só anexou
+    camada = shared_memory.SharedMemory(create=True, size=largura)
+    camada.buf[:largura] = chave
+    n = 1
+
+    tarefas = [mp.Queue() for _ in range(processos)]
+    caixas = [mp.Queue() for _ in range(processos)]
+    respostas = mp.Queue()
+    trabalhadores = [mp.Process(target=_trabalhadorBFS,
+                                args=(dono, processos, busca.parser, tarefas, caixas, respostas),
+                                daemon=True)
+                     for dono in range(processos)]
+    for p in trabalhadores:
+        p.start()
+
+    def coletar():
+        respostasPorDono = [None] * processos
+        for _ in range(processos):
+            resposta = respostas.get()
+            respostasPorDono[resposta[0]] = resposta[1:]
+        return respostasPorDono
+
+    tarefas[zlib.crc32(chave) % processos].put(("inicial", chave))
+
+    # paisPorCamada[d][k], acoesPorCamada[d][k]: origem do estado k da camada d + 1
+    paisPorCamada = []
+    acoesPorCamada = []
+    achado = None
+    estatisticas = {"expandidos": 0, "memoria_fechados": 0, "processos": processos, "maior_camada": 1}
+
+    try:
+        while True:
+            fatia = -(-n // processos)
+            for dono in range(processos):
+                tarefas[dono].put(("expandir", camada.name, min(n, dono * fatia), min(n, (dono + 1) * fatia)))
+            contagens = []
+            for total, achadoDono in coletar():
+                contagens.append(total)
+                if achado is None and achadoDono is not None:
+                    achado = achadoDono
+
+            camada.close()
+            camada.unlink()
+            camada = None
+
+            n = sum(contagens)
+            if achado is not None or n == 0:
+                break
+
+            camada = shared_memory.SharedMemory(create=True, size=n * largura)
+            deslocamento = 0
+            for dono in range(processos):
+                tarefas[dono].put(("gravar", camada.name, deslocamento))
+                deslocamento += contagens[dono]
+
+            pais = array('i')
+            acoes = array('i')
+            for paisDono, acoesDono in coletar():
+                pais.frombytes(paisDono)
+                acoes.frombytes(acoesDono)
+            paisPorCamada.append(pais)
+            acoesPorCamada.append(acoes)
+            estatisticas["maior_camada"] = max(estatisticas["maior_camada"], n)
+
+        for dono in range(processos):
+            tarefas[dono].put(("fim",))
+        for expandidos, memoria in coletar():
+            estatisticas["expandidos"] += expandidos
+            estatisticas["memoria_fechados"] += memoria
+        for p in trabalhadores:
+            p.join()
+    finally:
+        if camada is not None:
+            camada.close()
+            camada.unlink()
+        for p in trabalhadores:
+            if p.is_alive():
+                p.terminate()
+
+    estatisticas["camadas"] = len(paisPorCamada) + 1
+    if achado is None:
+        return None, estatisticas
+
+    idx, i = achado
+    plano = [i]
+    for d in range(len(paisPorCamada) - 1, -1, -1):
+        plano.append(acoesPorCamada[d][idx])
+        idx = paisPorCamada[d][idx]
+    plano.reverse()
+    return busca._noDoPlano(plano), estatisticas
@@ -14,6 +14,9 @@ class Parser:
 
         self.predicados_relevantes = set()
 
+        # Índice invertido: proposição -> ações que a exigem na pré-condição
+        self.indicePre = {}
+
     def get_pid(self, nome):
         pid = self.mapeamento.get(nome)
         if pid is None:
@@ -51,6 +54,7 @@ class Parser:
         self.estadoFinal.clear()
         self.noInicial.estado = set()
         self.predicados_relevantes.clear()
+        self.indicePre.clear()
 
         # ------------------------------------------------------
         # Leitura das ações
@@ -89,6 +93,9 @@ class Parser:
             aid = self.get_pid(nome)
             self.acoes[aid] = Acao(nome, pre, pos)
 
+            for p in pre:
+                self.indicePre.setdefault(abs(p), []).append(aid)
+
         # ------------------------------------------------------
         # Estado inicial
         # ------------------------------------------------------
@@ -113,6 +120,99 @@ class Parser:
 
             self.predicados_relevantes.add(abs(pid))
 
+        self.podarAlcancaveis()
+
+    # ------------------------------------------------------
+    # Pré-processamento: alcançabilidade relaxada
+    #
+    # A partir do estado inicial, ignorando os efeitos negativos,
+    # descobre quais fatos e ações podem aparecer em algum plano.
+    # Ações inalcançáveis saem da tarefa; fatos estáticos (nunca
+    # mudam de valor) saem das pré-condições, efeitos, inicial e
+    # objetivo. Por fim, os ids são renumerados de forma densa:
+    # proposições em 1..n e ações em seguida, na ordem original.
+    # ------------------------------------------------------
+    def podarAlcancaveis(self):
+        faltam = {}
+        porPre = {}
+        for aid, acao in self.acoes.items():
+            pos = [p for p in acao.precondicao if p > 0]
+            faltam[aid] = len(pos)
+            for p in pos:
+                porPre.setdefault(p, []).append(aid)
+
+        alcancados = set()
+        fila = list(self.noInicial.estado)
+        alcancaveis = {aid for aid, n in faltam.items() if n == 0}
+        for aid in alcancaveis:
+            fila.extend(e for e in self.acoes[aid].poscondicao if e > 0)
+
+        while fila:
+            p = fila.pop()
+            if p in alcancados:
+                continue
+            alcancados.add(p)
+            for aid in porPre.get(p, ()):
+                faltam[aid] -= 1
+                if faltam[aid] == 0:
+                    alcancaveis.add(aid)
+                    fila.extend(e for e in self.acoes[aid].poscondicao if e > 0)
+
+        apagados = set()
+        for aid in alcancaveis:
+            apagados.update(-e for e in self.acoes[aid].poscondicao if e < 0)
+
+        # Verdadeiro sempre: está no inicial e nada o apaga.
+        # Falso sempre: nunca é alcançado.
+        sempre = {p for p in self.noInicial.estado if p not in apagados}
+        mantidos = alcancados - sempre
+
+        def estatico(literal):
+            p = abs(literal)
+            if p in mantidos:
+                return None
+            return (p in sempre) == (literal > 0)
+
+        # Objetivo impossível de satisfazer: deixa a tarefa como está
+        # e a busca simplesmente não encontra plano
+        if any(estatico(g) is False for g in self.estadoFinal):
+            return
+
+        acoes = []
+        for aid in sorted(alcancaveis):
+            acao = self.acoes[aid]
+            if any(estatico(p) is False for p in acao.precondicao):
+                continue
+            pre = {p for p in acao.precondicao if abs(p) in mantidos}
+            pos = {e for e in acao.poscondicao if abs(e) in mantidos}
+            acoes.append((acao.acao, pre, pos))
+
+        # Renumeração densa (monótona: preserva a ordem relativa)
+        novo = {p: k for k, p in enumerate(sorted(mantidos), 1)}
+
+        def renumerar(literais):
+            return {novo[p] if p > 0 else -novo[-p] for p in literais if abs(p) in novo}
+
+        nomes = {p: self.mapeamentoReverso[p] for p in mantidos}
+        self.mapeamento.clear()
+        self.mapeamentoReverso.clear()
+        self.contMap = 1
+        for p in sorted(mantidos):
+            self.get_pid(nomes[p])
+
+        self.acoes.clear()
+        self.indicePre.clear()
+        for nome, pre, pos in acoes:
+            aid = self.get_pid(nome)
+            pre = renumerar(pre)
+            self.acoes[aid] = Acao(nome, pre, renumerar(pos))
+            for p in pre:
+                self.indicePre.setdefault(abs(p), []).append(aid)
+
+        self.noInicial.estado = renumerar(self.noInicial.estado)
+        self.estadoFinal = renumerar(self.estadoFinal)
+        self.predicados_relevantes = set(novo.values())
+
     # ------------------------------------------------------
     # Funções utilitárias
     # ------------------------------------------------------
@@ -0,0 +1,200 @@
+import hashlib
+import mmap
+import os
+from collections import deque
+
+from codigo.heuristicas import INFINITO
+
+
+# ------------------------------------------------------------
+# Bancos de padrões (PDBs) sobre as variáveis SAS+.
+#
+# Um padrão é um subconjunto de variáveis; no mundo dos blocos, as
+# variáveis do objetivo são as posições dos blocos, então cada padrão
+# é um grupo de blocos. A tarefa é projetada no padrão e a distância
+# exata de cada estado abstrato até o objetivo abstrato é calculada
+# por uma busca para trás (BFS 0-1, pois as ações custam 0 ou 1).
+#
+# A tabela é um array de bytes (uma distância por estado abstrato,
+# SEM_CAMINHO = inalcançável), gravada em disco na primeira vez e
+# depois aberta com mmap. O nome do arquivo é um hash da tarefa
+# projetada, então outra instância com o mesmo padrão reaproveita a
+# tabela e uma tarefa diferente nunca lê a tabela errada.
+# ------------------------------------------------------------
+
+SEM_CAMINHO = 255
+TAMANHO_MAXIMO = 50000
+# Tabelas ficam ao lado do pacote, não na pasta de onde o programa é rodado
+PASTA_PDB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pdbs")
+
+
+class PDB:
+    def __init__(self, sas, padrao, custos, pasta=PASTA_PDB):
+        self.padrao = tuple(padrao)
+        posicao = {v: j for j, v in enumerate(self.padrao)}
+        self.dominios = [sas.dominios[v] for v in self.padrao]
+
+        self.multiplicadores = []
+        m = 1
+        for d in reversed(self.dominios):
+            self.multiplicadores.append(m)
+            m *= d
+        self.multiplicadores.reverse()
+        self.tamanho = m
+
+        # Ações projetadas (as que não mexem no padrão viram laços e somem)
+        abstratas = set()
+        for i in range(len(sas.pre)):
+            efeitos = tuple((posicao[v], k) for v, k in sas.efeitos[i] if v in posicao)
+            if not efeitos:
+                continue
+            pre = tuple((posicao[v], k) for v, k in sas.pre[i] if v in posicao)
+            abstratas.add((pre, efeitos, custos[i]))
+        self.acoes = sorted(abstratas)
+        self.objetivo = tuple((posicao[v], k) for v, k in sas.objetivo if v in posicao)
+
+        # Índice abstrato direto do bitset: base + pesos dos bits verdadeiros
+        self.mascara = 0
+        self.pesos = {}
+        self.base = 0
+        for j, v in enumerate(self.padrao):
+            nenhum = sas.nenhum[v] or 0
+            self.base += nenhum * self.multiplicadores[j]
+            for k, b in enumerate(sas.variaveis[v]):
+                self.mascara |= 1 << b
+                self.pesos[b] = (k - nenhum) * self.multiplicadores[j]
+
+        assinatura = repr((self.dominios, self.acoes, self.objetivo)).encode()
+        nome = hashlib.sha1(assinatura).hexdigest()[:20] + ".pdb"
+        self.arquivo = os.path.join(pasta, nome)
+
+        if not os.path.exists(self.arquivo):
+            os.makedirs(pasta, exist_ok=True)
+            temporario = self.arquivo + ".tmp"
+            with open(temporario, "wb") as f:
+                f.write(self._construir())
+            os.replace(temporario, self.arquivo)
+
+        with open(self.arquivo, "rb") as f:
+            self.tabela = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.tabela) != self.tamanho:
+            raise ValueError(f"Tabela corrompida: {self.arquivo}")
+
+    def _valores(self, indice):
+        valores = []
+        for d in reversed(self.dominios):
+            indice, k = divmod(indice, d)
+            valores.append(k)
+        valores.reverse()
+        return valores
+
+    def _construir(self):
+        mult = self.multiplicadores
+
+        # Arestas invertidas: sucessor -> [(antecessor, custo)]
+        antecessores = [[] for _ in range(self.tamanho)]
+        objetivos = []
+        for indice in range(self.tamanho):
+            valores = self._valores(indice)
+            if all(valores[j] == k for j, k in self.objetivo):
+                objetivos.append(indice)
+            for pre, efeitos, custo in self.acoes:
+                if all(valores[j] == k for j, k in pre):
+                    novo = indice + sum((k - valores[j]) * mult[j] for j, k in efeitos)
+                    if novo != indice:
+                        antecessores[novo].append((indice, custo))
+
+        distancia = bytearray([SEM_CAMINHO]) * self.tamanho
+        fila = deque()
+        for indice in objetivos:
+            distancia[indice] = 0
+            fila.append(indice)
+
+        # BFS 0-1: arestas de custo zero entram na frente da fila
+        while fila:
+            atual = fila.popleft()
+            d = distancia[atual]
+            for anterior, custo in antecessores[atual]:
+                nd = min(d + custo, SEM_CAMINHO - 1)
+                if nd < distancia[anterior]:
+                    distancia[anterior] = nd
+                    if custo == 0:
+                        fila.appendleft(anterior)
+                    else:
+                        fila.append(anterior)
+
+        return bytes(distancia)
+
+    def distancia(self, estado):
+        indice = self.base
+        pesos = self.pesos
+        x = estado & self.mascara
+        while x:
+            baixo = x & -x
+            indice += pesos[baixo.bit_length() - 1]
+            x ^= baixo
+        return self.tabela[indice]
+
+
+def padroesObjetivo(sas, tamanhoMaximo=TAMANHO_MAXIMO):
+    """
+    Agrupa as variáveis do objetivo, na ordem, em padrões cujo espaço
+    abstrato não passa de tamanhoMaximo estados.
+    """
+    padroes = []
+    atual = []
+    tamanho = 1
+    for v, _ in sas.objetivo:
+        if atual and tamanho * sas.dominios[v] > tamanhoMaximo:
+            padroes.append(atual)
+            atual = []
+            tamanho = 1
+        atual.append(v)
+        tamanho *= sas.dominios[v]
+    if atual:
+        padroes.append(atual)
+    return padroes
+
+
+# ------------------------------------------------------------
+# Combinação de vários PDBs:
+#   "soma" -> partição de custo 0-1: cada ação só custa 1 no primeiro
+#             padrão em que ela tem efeito (nos demais custa 0), o que
+#             torna a soma admissível
+#   "max"  -> cada PDB com os custos originais, e fica o maior valor
+# ------------------------------------------------------------
+
+class HeuristicaPDB:
+    admissivel = True
+
+    def __init__(self, sas, padroes=None, combinar="soma", pasta=PASTA_PDB):
+        if combinar not in ("soma", "max"):
+            raise ValueError(f"Combinação desconhecida: {combinar}")
+        if padroes is None:
+            padroes = padroesObjetivo(sas)
+
+        self.soma = combinar == "soma"
+        self.pdbs = []
+        usadas = set()
+        for padrao in padroes:
+            custos = []
+            for i, efeitos in enumerate(sas.efeitos):
+                if not self.soma:
+                    custos.append(1)
+                elif i in usadas:
+                    custos.append(0)
+                elif any(v in padrao for v, _ in efeitos):
+                    custos.append(1)
+                    usadas.add(i)
+                else:
+                    custos.append(0)
+            self.pdbs.append(PDB(sas, padrao, custos, pasta))
+
+    def __call__(self, estado, objetivo):
+        # O objetivo já está embutido nas tabelas
+        valores = [pdb.distancia(estado) for pdb in self.pdbs]
+        if SEM_CAMINHO in valores:
+            return INFINITO
+        if not valores:
+            return 0
+        return sum(valores) if self.soma else max(valores)
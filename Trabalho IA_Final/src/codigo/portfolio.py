@@ -0,0 +1,133 @@
+import time
+import multiprocessing as mp
+from queue import Empty
+
+from codigo.parser import Parser
+
+
+# ------------------------------------------------------------
+# Portfólio de configurações em paralelo.
+#
+# Cada configuração (tipo de busca, heurística) roda num processo
+# próprio sobre a mesma instância; cada processo lê o arquivo e
+# compila a tarefa por conta própria. Sem prazo, o primeiro plano
+# encontrado vence e os outros processos são cancelados; com prazo
+# (segundos), vence o plano mais barato encontrado até lá. O tempo
+# até o plano passa a ser o mínimo entre as configurações, não a
+# soma.
+#
+# Configurações anytime (AWA*) mandam cada plano melhor assim que o
+# acham, então o plano de uma delas cortada pelo prazo não se perde.
+# Uma configuração que falha (erro ou busca sem plano) só sai da
+# disputa.
+# ------------------------------------------------------------
+
+PORTFOLIO_PADRAO = [
+    ("GBFS", "ff"),
+    ("A*", "blocos"),
+    ("MM", "hmax"),
+    ("AWA*", "ff"),
+    ("A*", "lmcut"),
+    ("Bidirecional", None),
+]
+
+# Intervalo (s) entre as verificações dos processos pelo coordenador
+ESPERA = 0.05
+
+
+def _plano(busca, no):
+    local = {aid: i for i, aid in enumerate(busca.tarefa.ids)}
+    plano = []
+    while no.pai is not None:
+        plano.append(local[no.acao])
+        no = no.pai
+    plano.reverse()
+    return plano
+
+
+def _rodar(indice, caminho, tipo, heuristica, fila):
+    # Importado aqui porque codigo.busca importa os outros módulos do pacote
+    from codigo.busca import Busca
+
+    inicio = time.time()
+    try:
+        parser = Parser()
+        parser.lerArquivo(caminho)
+        busca = Busca(parser)
+        if heuristica is not None:
+            busca.funcaoHeuristica(heuristica)
+            busca.nomeHeuristica = heuristica
+        if tipo == "AWA*":
+            # Mensagens com final=False: planos parciais da busca anytime
+            resultado = busca.buscaAnytime(aoMelhorar=lambda no, peso, tempo: fila.put(
+                (indice, _plano(busca, no), time.time() - inicio, None, False)))
+        else:
+            resultado = busca.buscar(tipo)
+    except Exception as erro:
+        fila.put((indice, None, time.time() - inicio, repr(erro), True))
+        return
+
+    plano = None if resultado is None else _plano(busca, resultado)
+    fila.put((indice, plano, time.time() - inicio, None, True))
+
+
+def executarPortfolio(caminho, configuracoes=PORTFOLIO_PADRAO, prazo=None):
+    """
+    Devolve um dicionário com a configuração vencedora ("tipo",
+    "heuristica"), o "plano" (índices locais das ações, ou None), o
+    "tempo" total e os "resultados": índice em configuracoes ->
+    (plano, tempo, erro) de cada configuração que terminou ou que deu
+    algum plano antes de ser cortada.
+    """
+    fila = mp.Queue()
+    processos = [mp.Process(target=_rodar, args=(i, caminho, tipo, heuristica, fila), daemon=True)
+                 for i, (tipo, heuristica) in enumerate(configuracoes)]
+
+    inicio = time.time()
+    for p in processos:
+        p.start()
+
+    resultados = {}
+    terminadas = set()
+    melhor = None
+    try:
+        while len(terminadas) < len(processos):
+            restante = None if prazo is None else prazo - (time.time() - inicio)
+            if restante is not None and restante <= 0:
+                break
+            try:
+                indice, plano, tempo, erro, final = fila.get(
+                    timeout=ESPERA if restante is None else min(ESPERA, restante))
+            except Empty:
+                # Processo morto sem responder (ex.: sem memória)
+                for i, p in enumerate(processos):
+                    if i not in terminadas and not p.is_alive() and p.exitcode != 0:
+                        terminadas.add(i)
+                        if i not in resultados:
+                            resultados[i] = (None, time.time() - inicio, f"código de saída {p.exitcode}")
+                continue
+
+            if final:
+                terminadas.add(indice)
+            # Um erro depois de planos parciais não apaga o último deles
+            if plano is not None or indice not in resultados:
+                resultados[indice] = (plano, tempo, erro)
+            if plano is not None and (melhor is None or len(plano) < len(resultados[melhor][0])):
+                melhor = indice
+            if melhor is not None and prazo is None:
+                break
+    finally:
+        for p in processos:
+            if p.is_alive():
+                p.terminate()
+        for p in processos:
+            p.join()
+
+    tipo, heuristica = configuracoes[melhor] if melhor is not None else (None, None)
+    return {
+        "tipo": tipo,
+        "heuristica": heuristica,
+        "plano": None if melhor is None else resultados[melhor][0],
+        "tempo": time.time() - inicio,
+        "resultados": resultados,
+    }
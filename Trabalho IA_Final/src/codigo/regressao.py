@@ -0,0 +1,223 @@
+from codigo.tarefa import iterar_bits
+from codigo.heuristicas import INFINITO
+
+
+# ------------------------------------------------------------
+# Regressão sobre estados parciais, para a busca bidirecional.
+#
+# Um estado parcial é um par de máscaras (teste, pre), como as
+# pré-condições de uma ação: representa todos os estados completos
+# com estado & teste == pre (os bits de pre verdadeiros e os de
+# teste & ~pre falsos). O objetivo já é um estado parcial.
+#
+# Regredir (teste, pre) por uma ação dá o estado parcial dos estados
+# em que a ação é aplicável e leva a (teste, pre):
+#   - a ação precisa contribuir (adicionar um fato exigido ou apagar
+#     um fato proibido) e não pode desfazer nada do que é exigido;
+#   - os fatos que ela fixa saem da exigência e as pré-condições dela
+#     entram.
+# Estados parciais que exigem dois fatos de um mesmo grupo de mutex
+# (invariantes SAS+) nunca são alcançáveis e são podados.
+# ------------------------------------------------------------
+
+class Regressao:
+    def __init__(self, tarefa, grupos):
+        n = len(tarefa.props)
+
+        self.acoes = []
+        self.adicionadoPor = [[] for _ in range(n)]
+        self.apagadoPor = [[] for _ in range(n)]
+        for i, acao in enumerate(tarefa.acoes):
+            dele = acao.mascaraDel & ~acao.mascaraAdd
+            preNeg = acao.mascaraTeste & ~acao.mascaraPre
+            self.acoes.append((acao.mascaraAdd, dele, acao.mascaraPre, preNeg))
+            for b in iterar_bits(acao.mascaraAdd):
+                self.adicionadoPor[b].append(i)
+            for b in iterar_bits(dele):
+                self.apagadoPor[b].append(i)
+
+        # Fato -> máscara dos fatos mutuamente exclusivos com ele
+        self.mutex = [0] * n
+        for grupo in grupos:
+            for b in iterar_bits(grupo):
+                self.mutex[b] |= grupo & ~(1 << b)
+
+    def consistente(self, pre):
+        mutex = self.mutex
+        for b in iterar_bits(pre):
+            if pre & mutex[b]:
+                return False
+        return True
+
+    def regredir(self, teste, pre):
+        """
+        Lista de (índice da ação, teste, pre) dos estados parciais
+        anteriores a (teste, pre).
+        """
+        neg = teste & ~pre
+        candidatas = set()
+        for b in iterar_bits(pre):
+            candidatas.update(self.adicionadoPor[b])
+        for b in iterar_bits(neg):
+            candidatas.update(self.apagadoPor[b])
+
+        resultado = []
+        for i in sorted(candidatas):
+            add, dele, aPre, aNeg = self.acoes[i]
+            if add & neg or dele & pre:
+                continue
+
+            fixados = add | dele
+            restoPre = pre & ~fixados
+            restoNeg = neg & ~fixados
+            if aPre & restoNeg or aNeg & restoPre:
+                continue
+
+            novoPre = restoPre | aPre
+            if not self.consistente(novoPre):
+                continue
+            resultado.append((i, novoPre | restoNeg | aNeg, novoPre))
+
+        return resultado
+
+
+# ------------------------------------------------------------
+# Índice dos estados parciais para o encontro por subsunção: um
+# estado completo encontra (teste, pre) se estado & teste == pre.
+#
+# Os parciais ficam numa trie sobre os bits de pre, em ordem
+# crescente; cada nó guarda (filhos, [[fatos proibidos, valor]]). A
+# consulta só desce pelos filhos cujo fato é verdadeiro no estado,
+# então visita apenas os prefixos contidos nele.
+# ------------------------------------------------------------
+
+class IndiceParciais:
+    def __init__(self):
+        self.raiz = ({}, [])
+        self.exatos = {}
+
+    def __len__(self):
+        return len(self.exatos)
+
+    def buscar(self, teste, pre):
+        item = self.exatos.get((teste, pre))
+        return None if item is None else item[1]
+
+    def inserir(self, teste, pre, valor):
+        if (teste, pre) in self.exatos:
+            return
+        item = [teste & ~pre, valor]
+        self.exatos[(teste, pre)] = item
+
+        no = self.raiz
+        for b in iterar_bits(pre):
+            filhos = no[0]
+            if b not in filhos:
+                filhos[b] = ({}, [])
+            no = filhos[b]
+        no[1].append(item)
+
+    def atualizar(self, teste, pre, valor):
+        self.exatos[(teste, pre)][1] = valor
+
+    def encontrar(self, estado):
+        """
+        Menor valor entre os parciais que contêm o estado (ou None).
+        """
+        bits = list(iterar_bits(estado))
+        fim = len(bits)
+        melhor = None
+        pilha = [(self.raiz, 0)]
+
+        while pilha:
+            (filhos, itens), k = pilha.pop()
+            for neg, valor in itens:
+                if not estado & neg and (melhor is None or valor < melhor):
+                    melhor = valor
+            if filhos:
+                for j in range(k, fim):
+                    filho = filhos.get(bits[j])
+                    if filho is not None:
+                        pilha.append((filho, j + 1))
+
+        return melhor
+
+
+# ------------------------------------------------------------
+# Índice dos estados completos, para o encontro no sentido
+# contrário: dado um estado parcial, o menor g entre os estados que
+# ele contém.
+#
+# Os estados ficam numa trie sobre os valores das variáveis SAS+
+# (primeiro as variáveis do objetivo, que os parciais costumam fixar).
+# Cada nó guarda o menor g da subárvore, e a consulta descarta os
+# ramos que não ficam abaixo do limite pedido; uma variável fixada
+# pelo parcial é um único filho, as outras só perdem os valores
+# proibidos.
+# ------------------------------------------------------------
+
+class IndiceEstados:
+    def __init__(self, sas):
+        self.sas = sas
+        doObjetivo = [v for v, _ in sas.objetivo]
+        self.ordem = doObjetivo + [v for v in range(len(sas.variaveis)) if v not in doObjetivo]
+        # Nó interno: [menor g, filhos]; folha: [g, nó da busca]
+        self.raiz = [INFINITO, {}]
+
+    def inserir(self, estado, g, no):
+        valores = self.sas.codificar(estado)
+        atual = self.raiz
+        for v in self.ordem:
+            if g < atual[0]:
+                atual[0] = g
+            filhos = atual[1]
+            k = valores[v]
+            proximo = filhos.get(k)
+            if proximo is None:
+                proximo = filhos[k] = [INFINITO, {}]
+            atual = proximo
+        if g < atual[0]:
+            atual[0] = g
+            atual[1] = no
+
+    def minimo(self, teste, pre, limite=INFINITO):
+        """
+        (g, nó) do estado de menor g contido em (teste, pre), ou None
+        se nenhum tiver g < limite.
+        """
+        valorDe = self.sas.valorDe
+        fixos = {}
+        proibidos = {}
+        for b in iterar_bits(pre):
+            v, k = valorDe[b]
+            fixos[v] = k
+        for b in iterar_bits(teste & ~pre):
+            v, k = valorDe[b]
+            proibidos.setdefault(v, set()).add(k)
+        restricoes = [(fixos.get(v), proibidos.get(v, ())) for v in self.ordem]
+
+        fim = len(restricoes)
+        melhor = limite
+        resultado = None
+        pilha = [(self.raiz, 0)]
+
+        while pilha:
+            (g, filhos), d = pilha.pop()
+            if g >= melhor:
+                continue
+            if d == fim:
+                melhor = g
+                resultado = (g, filhos)
+                continue
+
+            k, proibido = restricoes[d]
+            if k is not None:
+                filho = filhos.get(k)
+                if filho is not None:
+                    pilha.append((filho, d + 1))
+            else:
+                for k, filho in filhos.items():
+                    if k not in proibido:
+                        pilha.append((filho, d + 1))
+
+        return resultado
@@ -0,0 +1,171 @@
+from codigo.tarefa import iterar_bits
+
+
+# ------------------------------------------------------------
+# Gerador de sucessores: árvore de decisão sobre as variáveis SAS+
+# (grupos de mutex) das pré-condições, montada uma vez por tarefa.
+# Em vez de testar todas as ações a cada nó, a consulta desce só
+# pelos ramos compatíveis com o estado e devolve os índices das
+# ações aplicáveis.
+#
+# Cada nó é uma tupla (mascara, filhos, imediatas, restante):
+#   mascara   -> bits da variável testada no nó
+#   filhos    -> valor da variável (o bit verdadeiro) -> subárvore
+#   imediatas -> ações sem pré-condição restante (aplicáveis)
+#   restante  -> subárvore das ações que não testam essa variável
+#
+# Como no máximo um bit do grupo é verdadeiro, "estado & mascara"
+# já é a chave do filho: um único acesso a dicionário por variável.
+# ------------------------------------------------------------
+
+class GeradorSucessores:
+    def __init__(self, tarefa, sas, acoes=None):
+        self.tarefa = tarefa
+
+        if acoes is None:
+            acoes = range(len(tarefa.acoes))
+
+        variavelDe = {}
+        mascaraDe = []
+        for v, bits in enumerate(sas.variaveis):
+            mascaraDe.append(sum(1 << b for b in bits))
+            for b in bits:
+                variavelDe[b] = v
+
+        # Ordem dos testes: variáveis mais frequentes nas pré-condições
+        # primeiro (no mundo dos blocos, a mão separa pegar de soltar)
+        frequencia = {}
+        for i in acoes:
+            for b in iterar_bits(tarefa.acoes[i].mascaraPre):
+                v = variavelDe[b]
+                frequencia[v] = frequencia.get(v, 0) + 1
+        ordem = sorted(frequencia, key=lambda v: (-frequencia[v], v))
+        posicao = {v: k for k, v in enumerate(ordem)}
+
+        itens = []
+        for i in acoes:
+            acao = tarefa.acoes[i]
+            pre = sorted(((variavelDe[b], b) for b in iterar_bits(acao.mascaraPre)),
+                         key=lambda vb: posicao[vb[0]])
+            itens.append((i, pre))
+
+        # Ações com pré-condição negativa são conferidas no final
+        self.conferir = {i for i in acoes
+                         if tarefa.acoes[i].mascaraTeste != tarefa.acoes[i].mascaraPre}
+
+        self.raiz = self._construir(itens, 0, posicao, mascaraDe)
+
+    def _construir(self, itens, k, posicao, mascaraDe):
+        if not itens:
+            return None
+
+        imediatas = []
+        pendentes = []
+        for i, pre in itens:
+            if len(pre) == k:
+                imediatas.append(i)
+            else:
+                pendentes.append((i, pre))
+
+        if not pendentes:
+            return (0, {}, imediatas, None)
+
+        v = min((pre[k][0] for _, pre in pendentes), key=posicao.__getitem__)
+
+        porValor = {}
+        sem = []
+        for i, pre in pendentes:
+            if pre[k][0] == v:
+                porValor.setdefault(1 << pre[k][1], []).append((i, pre))
+            else:
+                sem.append((i, pre))
+
+        filhos = {chave: self._construir(grupo, k + 1, posicao, mascaraDe)
+                  for chave, grupo in porValor.items()}
+
+        # "sem" continua na mesma profundidade k: ainda falta testar pre[k]
+        return (mascaraDe[v], filhos, imediatas, self._construir(sem, k, posicao, mascaraDe))
+
+    def aplicaveis(self, estado):
+        resultado = []
+        pilha = [self.raiz] if self.raiz is not None else []
+
+        while pilha:
+            mascara, filhos, imediatas, restante = pilha.pop()
+            resultado.extend(imediatas)
+            if restante is not None:
+                pilha.append(restante)
+            filho = filhos.get(estado & mascara)
+            if filho is not None:
+                pilha.append(filho)
+
+        if self.conferir:
+            ops = self.tarefa.ops
+            resultado = [i for i in resultado
+                         if i not in self.conferir or estado & ops[i][0] == ops[i][1]]
+
+        # Mantém a ordem da tabela de ações (mesma ordem de expansão de antes)
+        resultado.sort()
+        return resultado
+
+
+# ------------------------------------------------------------
+# Manutenção incremental do conjunto de ações aplicáveis.
+#
+# A lista do filho é derivada da lista do pai usando o índice
+# invertido proposição -> ações (Tarefa.indicePre):
+#   - ações do pai: só continuam se nenhum fato exigido foi apagado
+#   - fatos adicionados: reconfere apenas as ações que os exigem
+#     (nenhuma delas estava na lista do pai, pois o fato era falso)
+#
+# Quando um fato adicionado é exigido por uma fração grande das ações
+# (no mundo dos blocos, handempty), reconferir uma a uma custa mais
+# que a árvore de decisão; nesse caso o filho usa a consulta completa.
+# ------------------------------------------------------------
+
+FRACAO_PESADA = 8
+
+
+class AplicaveisIncremental:
+    def __init__(self, tarefa, gerador):
+        self.gerador = gerador
+        self.ops = tarefa.ops
+
+        limite = max(1, len(tarefa.acoes) // FRACAO_PESADA)
+        self.pesados = 0
+        self.candidatas = []
+        for b, acoes in enumerate(tarefa.indicePre):
+            if bin(acoes).count("1") > limite:
+                self.pesados |= 1 << b
+                self.candidatas.append(())
+            else:
+                self.candidatas.append(tuple((i, tarefa.ops[i][0], tarefa.ops[i][1])
+                                             for i in iterar_bits(acoes)))
+
+        # Com pré-condições negativas, um fato adicionado também pode
+        # desabilitar ações: usa sempre a consulta completa
+        if gerador.conferir:
+            self.pesados = (1 << len(tarefa.props)) - 1
+
+    def inicial(self, estado):
+        return self.gerador.aplicaveis(estado)
+
+    def filho(self, aplicaveis, estado, novo):
+        entrou = novo & ~estado
+        if entrou & self.pesados:
+            return self.gerador.aplicaveis(novo)
+
+        apagou = estado & ~novo
+        ops = self.ops
+        resultado = [i for i in aplicaveis if not ops[i][1] & apagou]
+
+        while entrou:
+            baixo = entrou & -entrou
+            entrou ^= baixo
+            for i, teste, pre in self.candidatas[baixo.bit_length() - 1]:
+                # Uma ação que exige dois fatos adicionados entra só uma vez
+                if novo & teste == pre and not pre & entrou:
+                    resultado.append(i)
+
+        resultado.sort()
+        return resultado
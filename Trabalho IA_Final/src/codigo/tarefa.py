@@ -0,0 +1,125 @@
+from codigo.acoes import Acao
+
+
+# ------------------------------------------------------------
+# Tarefa compilada: cada estado é um único inteiro, com um bit
+# por proposição, e cada ação guarda máscaras de pré, add e del.
+#
+#   aplicável:  estado & teste == pre
+#   sucessor:   (estado & ~del) | add
+# ------------------------------------------------------------
+
+class Tarefa:
+    def __init__(self, parser, acoes=None, fatos=None):
+        self.parser = parser
+
+        # pid da proposição <-> posição do bit
+        self.bits = {}
+        self.props = []
+
+        # Com "fatos", só essas proposições recebem bit; as demais são
+        # ignoradas nas ações, no estado inicial e no objetivo
+        literais = []
+        for _, acao in parser.acoes.items():
+            literais.extend(acao.precondicao)
+            literais.extend(acao.poscondicao)
+        literais.extend(parser.noInicial.estado)
+        literais.extend(parser.estadoFinal)
+        for p in literais:
+            if fatos is None or abs(p) in fatos:
+                self._bit(abs(p))
+
+        if acoes is None:
+            acoes = list(parser.acoes.keys())
+
+        # Tabela de ações (índice local -> aid do parser)
+        self.ids = []
+        self.acoes = []
+        self.ops = []
+
+        for aid in acoes:
+            acao = parser.acoes[aid]
+            self.compilarAcao(acao)
+            self.ids.append(aid)
+            self.acoes.append(acao)
+            self.ops.append((acao.mascaraTeste, acao.mascaraPre, ~acao.mascaraDel, acao.mascaraAdd))
+
+        # Índice invertido do parser em nível de bits: bit -> máscara das
+        # ações (índices locais) que exigem a proposição
+        local = {aid: i for i, aid in enumerate(self.ids)}
+        self.indicePre = [0] * len(self.props)
+        for pid, aids in parser.indicePre.items():
+            if pid not in self.bits:
+                continue
+            for aid in aids:
+                if aid in local:
+                    self.indicePre[self.bits[pid]] |= 1 << local[aid]
+
+        self.inicial = self.codificar(parser.noInicial.estado)
+        self.objetivo, objetivoNeg = self.mascaras(parser.estadoFinal)
+        self.objetivoTeste = self.objetivo | objetivoNeg
+
+    def _bit(self, pid):
+        b = self.bits.get(pid)
+        if b is None:
+            b = len(self.props)
+            self.bits[pid] = b
+            self.props.append(pid)
+        return b
+
+    # -------------------------
+    # Conversões
+    # -------------------------
+
+    def mascaras(self, literais):
+        pos = neg = 0
+        for p in literais:
+            b = self.bits.get(abs(p))
+            if b is None:
+                continue
+            if p > 0:
+                pos |= 1 << b
+            else:
+                neg |= 1 << b
+        return pos, neg
+
+    def codificar(self, estado):
+        s = 0
+        for p in estado:
+            b = self.bits.get(p)
+            if b is not None:
+                s |= 1 << b
+        return s
+
+    def decodificar(self, estado):
+        return [self.props[b] for b in iterar_bits(estado)]
+
+    def compilarAcao(self, acao: Acao):
+        pre, preNeg = self.mascaras(acao.precondicao)
+        add, dele = self.mascaras(acao.poscondicao)
+        acao.mascaraPre = pre
+        acao.mascaraTeste = pre | preNeg
+        acao.mascaraAdd = add
+        acao.mascaraDel = dele
+
+    # -------------------------
+    # Semântica
+    # -------------------------
+
+    def aplicavel(self, i, estado):
+        teste, pre, _, _ = self.ops[i]
+        return estado & teste == pre
+
+    def aplicar(self, i, estado):
+        _, _, naoDel, add = self.ops[i]
+        return (estado & naoDel) | add
+
+    def satisfaz(self, estado):
+        return estado & self.objetivoTeste == self.objetivo
+
+
+def iterar_bits(mascara):
+    while mascara:
+        baixo = mascara & -mascara
+        yield baixo.bit_length() - 1
+        mascara ^= baixo
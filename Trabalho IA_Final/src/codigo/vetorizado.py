@@ -0,0 +1,112 @@
+try:
+    import numpy as np
+except ImportError:  # numpy é opcional: só esta heurística depende dele
+    np = None
+
+from codigo.heuristicas import INFINITO
+from codigo.tarefa import iterar_bits
+
+
+# ------------------------------------------------------------
+# h_add / h_max vetorizados com NumPy, avaliando um lote de estados
+# de uma vez (por exemplo, todos os sucessores de um nó).
+#
+# A matriz de custos tem uma linha por fato e uma coluna por estado do
+# lote, e é relaxada até o ponto fixo (o mesmo valor calculado pelo
+# Dijkstra de HeuristicaRelaxada). A tarefa vira incidências em arrays:
+#
+#   pré-condições -> matriz ações x K (K = maior número de pré-condições),
+#                    completada com um fato artificial de custo 0; o
+#                    custo das ações é a soma (ou o máximo) das K linhas
+#   efeitos (add) -> os fatos são agrupados pelo número de ações que os
+#                    adicionam; em cada grupo, uma matriz fatos x ações
+#                    dá o menor custo com um único min por eixo
+# ------------------------------------------------------------
+
+class HeuristicaVetorizada:
+    def __init__(self, tarefa, combinar="add"):
+        if np is None:
+            raise ImportError("A heurística vetorizada precisa do numpy (pip install numpy).")
+        if combinar not in ("add", "max"):
+            raise ValueError(f"Combinação desconhecida: {combinar}")
+
+        self.tarefa = tarefa
+        self.soma = combinar == "add"
+        self.admissivel = not self.soma
+        self.numFatos = len(tarefa.props)
+        self.largura = self.numFatos // 8 + 1
+        zero = self.numFatos
+
+        pre = [list(iterar_bits(acao.mascaraPre)) for acao in tarefa.acoes]
+        k = max((len(p) for p in pre), default=0)
+        self.colunasPre = [np.array([p[j] if j < len(p) else zero for p in pre], dtype=np.intp)
+                           for j in range(k)]
+
+        adicionadaPor = [[] for _ in range(self.numFatos)]
+        for i, acao in enumerate(tarefa.acoes):
+            for e in iterar_bits(acao.mascaraAdd):
+                adicionadaPor[e].append(i)
+
+        grupos = {}
+        for e, acoes in enumerate(adicionadaPor):
+            if acoes:
+                fatos, matriz = grupos.setdefault(len(acoes), ([], []))
+                fatos.append(e)
+                matriz.append(acoes)
+        self.grupos = [(np.array(fatos, dtype=np.intp), np.array(matriz, dtype=np.intp))
+                       for fatos, matriz in grupos.values()]
+
+    def _matrizInicial(self, estados):
+        dados = b"".join(e.to_bytes(self.largura, "little") for e in estados)
+        bits = np.unpackbits(np.frombuffer(dados, dtype=np.uint8).reshape(len(estados), self.largura),
+                             axis=1, bitorder="little")[:, :self.numFatos]
+        custo = np.full((self.numFatos + 1, len(estados)), np.inf, dtype=np.float32)
+        custo[:self.numFatos][bits.T.astype(bool)] = 0
+        custo[self.numFatos] = 0
+        return custo
+
+    def custos(self, estados):
+        """
+        Matriz (fatos x estados) com o custo relaxado de cada fato. A
+        última linha é o fato artificial de custo 0.
+        """
+        custo = self._matrizInicial(estados)
+        if not self.grupos:
+            return custo
+
+        combinar = np.add if self.soma else np.maximum
+        mudou = True
+        while mudou:
+            mudou = False
+
+            if self.colunasPre:
+                custoAcao = custo[self.colunasPre[0]]
+                for coluna in self.colunasPre[1:]:
+                    custoAcao = combinar(custoAcao, custo[coluna])
+                custoAcao += 1
+            else:
+                custoAcao = np.ones((len(self.tarefa.acoes), len(estados)), dtype=np.float32)
+
+            for fatos, matriz in self.grupos:
+                atual = custo[fatos]
+                novo = np.minimum(atual, custoAcao[matriz].min(axis=1))
+                if not np.array_equal(novo, atual):
+                    custo[fatos] = novo
+                    mudou = True
+
+        return custo
+
+    def lote(self, estados, objetivo):
+        if not estados:
+            return []
+
+        colunas = list(iterar_bits(objetivo))
+        if not colunas:
+            return [0] * len(estados)
+
+        valores = self.custos(estados)[colunas]
+        h = valores.sum(axis=0) if self.soma else valores.max(axis=0)
+        return [INFINITO if v == np.inf else int(v) for v in h]
+
+    def __call__(self, estado, objetivo):
+        return self.lote([estado], objetivo)[0]
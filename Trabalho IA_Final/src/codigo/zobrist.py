@@ -0,0 +1,78 @@
+import random
+from array import array
+from codigo.tarefa import iterar_bits
+
+
+# ------------------------------------------------------------
+# Hash de Zobrist: uma chave aleatória de 64 bits por proposição.
+# O hash de um estado é o XOR das chaves das proposições verdadeiras
+# e é atualizado a partir dos efeitos da ação, sem percorrer o estado.
+# ------------------------------------------------------------
+
+class Zobrist:
+    def __init__(self, tarefa, semente=0):
+        rnd = random.Random(semente)
+        self.chaves = [rnd.getrandbits(64) for _ in tarefa.props]
+
+        # Para cada ação: bits que mudam quando ela é aplicada "normalmente"
+        # (o que é apagado estava verdadeiro e o que é adicionado estava falso)
+        # e o XOR correspondente, usado no caminho rápido.
+        self.mudancas = []
+        self.deltas = []
+        for acao in tarefa.acoes:
+            mudanca = (acao.mascaraDel & ~acao.mascaraAdd) | acao.mascaraAdd
+            self.mudancas.append(mudanca)
+            self.deltas.append(self.hash(mudanca))
+
+    def hash(self, estado):
+        h = 0
+        for b in iterar_bits(estado):
+            h ^= self.chaves[b]
+        return h
+
+    def atualizar(self, h, i, estado, novo):
+        mudou = estado ^ novo
+        if mudou == self.mudancas[i]:
+            return h ^ self.deltas[i]
+
+        # Algum efeito não alterou o estado: aplica só os bits que mudaram
+        for b in iterar_bits(mudou):
+            h ^= self.chaves[b]
+        return h
+
+
+# ------------------------------------------------------------
+# Tabela de transposição de tamanho fixo (2^bits entradas), usada
+# pelo IDA*. O hash escolhe a posição e cada posição guarda um único
+# estado, o g com que ele foi alcançado e a iteração ("marca") em que
+# isso aconteceu. Numa colisão, a entrada de outra iteração ou mais
+# profunda é substituída: entradas rasas podam subárvores maiores.
+# ------------------------------------------------------------
+
+class TabelaTransposicao:
+    def __init__(self, bits):
+        tamanho = 1 << bits
+        self.mascara = tamanho - 1
+        self.estados = [None] * tamanho
+        self.gs = array('i', bytes(4 * tamanho))
+        self.marcas = array('i', [-1]) * tamanho
+        self.ocupadas = 0
+
+    def __len__(self):
+        return len(self.estados)
+
+    def buscar(self, h, estado, marca):
+        j = h & self.mascara
+        if self.marcas[j] == marca and self.estados[j] == estado:
+            return self.gs[j]
+        return None
+
+    def inserir(self, h, estado, g, marca):
+        j = h & self.mascara
+        if self.marcas[j] == marca and self.estados[j] != estado and self.gs[j] < g:
+            return
+        if self.estados[j] is None:
+            self.ocupadas += 1
+        self.estados[j] = estado
+        self.gs[j] = g
+        self.marcas[j] = marca
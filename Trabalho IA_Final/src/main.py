@@ -1,7 +1,8 @@
 import os
 import sys
 from codigo.parser import Parser
-from codigo.busca import Busca
+from codigo.busca import Busca, HEURISTICAS, BUSCAS_HEURISTICAS
+from codigo.portfolio import executarPortfolio, PORTFOLIO_PADRAO
 
 PASTA_INSTANCIAS = r"Trabalho IA_Final\src\instancias"
 
@@ -30,7 +31,8 @@ def escolher_arquivo():
 
 def escolher_algoritmo():
     print("\nAlgoritmos disponíveis:\n")
-    algoritmos = ["BFS", "DLS", "IDS", "A*", "Bidirecional"]
+    algoritmos = ["BFS", "DLS", "IDS", "A*", "Bidirecional", "Portfólio",
+                  "GBFS", "GBFS-puro", "WA*", "AWA*", "IDA*", "MM", "HDA*", "BFS-paralelo"]
 
     for i, nome in enumerate(algoritmos, 1):
         print(f"{i}. {nome}")
@@ -38,11 +40,47 @@ def escolher_algoritmo():
     print()
     escolha = int(input("Escolha um algoritmo: "))
 
+    alg = algoritmos[escolha - 1]
+
     limite = None
-    if escolha == 2:  # DLS
+    if alg == "DLS":
         limite = int(input("Defina o limite para a busca: "))
 
-    return algoritmos[escolha - 1], limite
+    heuristica = None
+    if alg in BUSCAS_HEURISTICAS:
+        heuristica = escolher_heuristica()
+
+    return alg, limite, heuristica
+
+
+def escolher_heuristica():
+    print("\nHeurísticas disponíveis:\n")
+    nomes = sorted(HEURISTICAS)
+
+    for i, nome in enumerate(nomes, 1):
+        print(f"{i}. {nome}")
+
+    print()
+    escolha = input("Escolha uma heurística (Enter para a padrão): ").strip()
+
+    return nomes[int(escolha) - 1] if escolha else None
+
+
+def rodar_portfolio(busca, caminho):
+    resultado = executarPortfolio(caminho)
+
+    for i, (plano, tempo, erro) in sorted(resultado["resultados"].items()):
+        tipo, heuristica = PORTFOLIO_PADRAO[i]
+        situacao = erro or ("sem plano" if plano is None else f"plano com {len(plano)} ações")
+        print(f"{tipo:12} {str(heuristica):8} | {tempo:7.3f} s | {situacao}")
+
+    if resultado["plano"] is None:
+        print("\nNenhuma solução encontrada.")
+        return
+
+    print(f"\n=== SOLUÇÃO ENCONTRADA ({resultado['tipo']}, {resultado['heuristica']}) ===")
+    busca.imprimeArvore(busca._noDoPlano(resultado["plano"]))
+    print(f"\nTempo de Execução: {resultado['tempo']:.3f} segundos")
 
 
 def main():
@@ -60,8 +98,14 @@ def main():
 
         busca = Busca(ambiente)
 
-        alg, limite = escolher_algoritmo()
-        busca.executar_busca(alg, limite)
+        alg, limite, heuristica = escolher_algoritmo()
+        if alg == "Portfólio":
+            rodar_portfolio(busca, caminho)
+        else:
+            try:
+                busca.executar_busca(alg, limite, heuristica)
+            except ValueError as erro:
+                print(f"\nErro: {erro}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,79 @@
+import os
+import sys
+
+import pytest
+
+SRC = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SRC)
+
+from codigo.parser import Parser
+from codigo.busca import Busca
+
+
+# ------------------------------------------------------------
+# Apoio comum aos testes das buscas: toda função de teste com o
+# argumento "instancia" roda em cada instância de OTIMOS, e o plano
+# devolvido é refeito a partir do estado inicial (toda ação precisa
+# ser aplicável e o último estado precisa satisfazer o objetivo).
+# ------------------------------------------------------------
+
+# Comprimento do plano ótimo de cada instância usada nos testes
+OTIMOS = {
+    "blocks-4-0": 6,
+    "blocks-5-0": 12,
+    "blocks-7-0": 20,
+}
+
+
+def pytest_generate_tests(metafunc):
+    if "instancia" in metafunc.fixturenames:
+        metafunc.parametrize("instancia", sorted(OTIMOS))
+
+
+@pytest.fixture
+def otimo(instancia):
+    return OTIMOS[instancia]
+
+
+@pytest.fixture
+def caminho(instancia):
+    return os.path.join(SRC, "instancias", instancia + ".strips")
+
+
+@pytest.fixture
+def carregar():
+    def carregar(instancia, heuristica=None):
+        parser = Parser()
+        parser.lerArquivo(os.path.join(SRC, "instancias", instancia + ".strips"))
+        busca = Busca(parser)
+        if heuristica is not None:
+            busca.funcaoHeuristica(heuristica)
+            busca.nomeHeuristica = heuristica
+        return busca
+    return carregar
+
+
+@pytest.fixture
+def comprimentoValido():
+    def comprimentoValido(busca, no):
+        """
+        Refaz o plano do nó a partir do estado inicial e devolve o
+        número de ações.
+        """
+        tarefa = busca.tarefa
+        indice = {aid: i for i, aid in enumerate(tarefa.ids)}
+
+        acoes = []
+        while no.pai is not None:
+            acoes.append(no.acao)
+            no = no.pai
+        acoes.reverse()
+
+        estado = tarefa.inicial
+        for aid in acoes:
+            i = indice[aid]
+            assert tarefa.aplicavel(i, estado), f"ação {aid} não aplicável"
+            estado = tarefa.aplicar(i, estado)
+        assert tarefa.satisfaz(estado)
+        return len(acoes)
+    return comprimentoValido
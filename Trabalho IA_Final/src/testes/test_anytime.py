@@ -0,0 +1,30 @@
+import pytest
+
+
+# ------------------------------------------------------------
+# WA*, GBFS puro e A* anytime: os planos precisam ser válidos. No
+# anytime, cada melhora passada a aoMelhorar é mais barata que a
+# anterior, o resultado é a última e, com heurística admissível, é
+# ótimo.
+# ------------------------------------------------------------
+
+@pytest.mark.parametrize("tipo", ["WA*", "GBFS-puro"])
+def test_plano_valido(instancia, tipo, otimo, carregar, comprimentoValido):
+    busca = carregar(instancia, "hadd")
+    assert comprimentoValido(busca, busca.buscar(tipo)) >= otimo
+
+
+@pytest.mark.parametrize("heuristica", ["ff", "hmax"])
+def test_anytime(instancia, heuristica, otimo, carregar, comprimentoValido):
+    busca = carregar(instancia, heuristica)
+    melhoras = []
+    resultado = busca.buscaAnytime(aoMelhorar=lambda no, peso, tempo: melhoras.append((no.profundidade, peso)))
+
+    custos = [custo for custo, _ in melhoras]
+    assert custos == sorted(set(custos), reverse=True)
+    assert comprimentoValido(busca, resultado) == custos[-1]
+    assert [(c, p) for c, p, _ in busca.estatisticas["planos"]] == melhoras
+    if heuristica == "hmax":
+        assert custos[-1] == otimo
+    else:
+        assert custos[-1] >= otimo
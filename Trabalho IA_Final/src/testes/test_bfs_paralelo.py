@@ -0,0 +1,13 @@
+import pytest
+
+
+# ------------------------------------------------------------
+# BFS por camadas em paralelo: o plano precisa ser ótimo para
+# qualquer número de processos, e a maior camada é registrada.
+# ------------------------------------------------------------
+
+@pytest.mark.parametrize("processos", [1, 2, 3])
+def test_bfs_paralelo(instancia, processos, otimo, carregar, comprimentoValido):
+    busca = carregar(instancia)
+    assert comprimentoValido(busca, busca.buscar("BFS-paralelo", processos=processos)) == otimo
+    assert busca.estatisticas["maior_camada"] > 1
@@ -0,0 +1,8 @@
+# ------------------------------------------------------------
+# Busca bidirecional: o plano montado a partir do encontro das duas
+# frentes precisa ser válido (não necessariamente mínimo).
+# ------------------------------------------------------------
+
+def test_bidirecional(instancia, otimo, carregar, comprimentoValido):
+    busca = carregar(instancia)
+    assert comprimentoValido(busca, busca.buscar("Bidirecional")) >= otimo
@@ -0,0 +1,15 @@
+# ------------------------------------------------------------
+# Heurística do mundo dos blocos: admissível, então o A* com ela
+# precisa dar o plano ótimo e o valor no estado inicial não passa do
+# ótimo.
+# ------------------------------------------------------------
+
+def test_a_estrela(instancia, otimo, carregar, comprimentoValido):
+    busca = carregar(instancia, "blocos")
+    assert comprimentoValido(busca, busca.buscar("A*")) == otimo
+
+
+def test_admissivel_no_inicio(instancia, otimo, carregar):
+    busca = carregar(instancia)
+    tarefa = busca.tarefa
+    assert 0 < busca.funcaoHeuristica("blocos")(tarefa.inicial, tarefa.objetivo) <= otimo
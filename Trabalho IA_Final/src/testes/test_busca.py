@@ -0,0 +1,29 @@
+import pytest
+
+
+# ------------------------------------------------------------
+# Buscas cegas: cada uma é rodada nas instâncias de teste (ver
+# conftest.py) e o plano devolvido é refeito a partir do estado
+# inicial. A BFS precisa dar o comprimento ótimo. As demais buscas
+# têm cada uma o seu arquivo de teste.
+# ------------------------------------------------------------
+
+# (tipo, heurística, argumentos de buscar, ótima)
+CONFIGURACOES = [
+    ("BFS", None, {}, True),
+    ("DLS", None, {"limite": 20}, False),
+]
+
+
+@pytest.mark.parametrize("tipo, heuristica, argumentos, otima", CONFIGURACOES,
+                         ids=[f"{c[0]}-{c[1]}" for c in CONFIGURACOES])
+def test_plano_valido(instancia, tipo, heuristica, argumentos, otima, otimo, carregar, comprimentoValido):
+    busca = carregar(instancia, heuristica)
+    resultado = busca.buscar(tipo, **argumentos)
+    assert resultado is not None
+
+    comprimento = comprimentoValido(busca, resultado)
+    if otima:
+        assert comprimento == otimo
+    else:
+        assert comprimento >= otimo
@@ -0,0 +1,33 @@
+from codigo.heuristicas import CacheHeuristica
+
+
+# ------------------------------------------------------------
+# Cache LRU de valores heurísticos: acertos não chamam a heurística,
+# o menos usado sai quando a capacidade estoura e uma colisão de
+# hash (mesma chave, outro estado) conta como falha. Com um cache
+# pequeno o A* continua ótimo.
+# ------------------------------------------------------------
+
+def test_remocao_lru():
+    avaliados = []
+
+    def funcao(estado, objetivo):
+        avaliados.append(estado)
+        return estado
+
+    cache = CacheHeuristica(funcao, 2)
+    assert cache(1, 10, 0) == 10
+    assert cache(2, 20, 0) == 20
+    assert cache(1, 10, 0) == 10     # acerto; 2 passa a ser o menos usado
+    assert cache(3, 30, 0) == 30     # remove 2
+    assert cache(2, 20, 0) == 20     # falha
+    assert cache(2, 21, 0) == 21     # colisão de hash
+    assert avaliados == [10, 20, 30, 20, 21]
+    assert cache.estatisticas() == {"cache_acertos": 1, "cache_falhas": 5, "cache_remocoes": 2}
+
+
+def test_a_estrela_com_cache_pequeno(instancia, otimo, carregar, comprimentoValido):
+    busca = carregar(instancia, "hmax")
+    busca.capacidadeCache = 16
+    assert comprimentoValido(busca, busca.buscar("A*")) == otimo
+    assert busca.estatisticas["cache_falhas"] > 0
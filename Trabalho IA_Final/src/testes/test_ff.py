@@ -0,0 +1,32 @@
+import pytest
+
+
+# ------------------------------------------------------------
+# h_FF e GBFS com operadores preferidos: as ações úteis são
+# aplicáveis no estado avaliado, a GBFS usa o h_FF quando nenhuma
+# heurística foi escolhida e recusa heurísticas sem ações úteis.
+# ------------------------------------------------------------
+
+def test_acoes_uteis_aplicaveis(instancia, carregar):
+    busca = carregar(instancia)
+    tarefa = busca.tarefa
+    h, uteis = busca.funcaoHeuristica("ff").avaliar(tarefa.inicial, tarefa.objetivo)
+    assert h >= 1 and uteis
+    assert all(tarefa.aplicavel(i, tarefa.inicial) for i in uteis)
+
+
+@pytest.mark.parametrize("heuristica", [None, "ff"])
+def test_gbfs(instancia, heuristica, otimo, carregar, comprimentoValido):
+    busca = carregar(instancia, heuristica)
+    assert comprimentoValido(busca, busca.buscar("GBFS")) >= otimo
+
+
+def test_a_estrela(instancia, otimo, carregar, comprimentoValido):
+    busca = carregar(instancia, "ff")
+    assert comprimentoValido(busca, busca.buscar("A*")) >= otimo
+
+
+def test_gbfs_sem_acoes_uteis(carregar):
+    busca = carregar("blocks-4-0", "hadd")
+    with pytest.raises(ValueError):
+        busca.buscar("GBFS")
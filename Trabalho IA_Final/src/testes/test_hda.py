@@ -0,0 +1,19 @@
+import pytest
+
+
+# ------------------------------------------------------------
+# HDA* (A* distribuído entre processos): com heurística admissível o
+# plano precisa ser ótimo para qualquer número de processos; com
+# heurística inadmissível, só válido.
+# ------------------------------------------------------------
+
+@pytest.mark.parametrize("heuristica, processos", [("hmax", 2), ("lmcut", 3), ("lmcut", 1)])
+def test_hda_admissivel(instancia, heuristica, processos, otimo, carregar, comprimentoValido):
+    busca = carregar(instancia, heuristica)
+    assert comprimentoValido(busca, busca.buscar("HDA*", processos=processos)) == otimo
+    assert busca.estatisticas["expandidos"] > 0
+
+
+def test_hda_inadmissivel(instancia, otimo, carregar, comprimentoValido):
+    busca = carregar(instancia, "hadd")
+    assert comprimentoValido(busca, busca.buscar("HDA*", processos=2)) >= otimo
@@ -0,0 +1,19 @@
+import pytest
+
+
+# ------------------------------------------------------------
+# IDA* e DLS (o mesmo laço com h = 0): o IDA* com heurística
+# admissível precisa dar o plano ótimo; a DLS acha plano com limite
+# igual ao ótimo e nenhum com limite menor.
+# ------------------------------------------------------------
+
+@pytest.mark.parametrize("heuristica", ["lmcut", "hmax"])
+def test_ida_estrela(instancia, heuristica, otimo, carregar, comprimentoValido):
+    busca = carregar(instancia, heuristica)
+    assert comprimentoValido(busca, busca.buscar("IDA*")) == otimo
+
+
+def test_dls_no_limite(instancia, otimo, carregar, comprimentoValido):
+    busca = carregar(instancia)
+    assert busca.buscar("DLS", limite=otimo - 1) is None
+    assert comprimentoValido(busca, busca.buscar("DLS", limite=otimo)) == otimo
@@ -0,0 +1,14 @@
+import pytest
+
+
+# ------------------------------------------------------------
+# IDS que retoma a iteração a partir da fronteira guardada: o plano
+# precisa ser ótimo com o orçamento padrão, com um orçamento que
+# estoura no meio da busca e sem orçamento nenhum (recomeça da raiz).
+# ------------------------------------------------------------
+
+@pytest.mark.parametrize("orcamento", [None, 4096, 0])
+def test_ids(instancia, orcamento, otimo, carregar, comprimentoValido):
+    busca = carregar(instancia)
+    resultado = busca.iddfs() if orcamento is None else busca.iddfs(orcamento)
+    assert comprimentoValido(busca, resultado) == otimo
@@ -0,0 +1,36 @@
+import pytest
+
+
+# ------------------------------------------------------------
+# LM-cut e contagem de objetivos: as duas são admissíveis e o A* com
+# elas precisa dar o plano ótimo. O LM-cut domina o h_max, e o
+# executar_busca compara as expansões com as da contagem de
+# objetivos.
+# ------------------------------------------------------------
+
+@pytest.mark.parametrize("heuristica", ["lmcut", "objetivos"])
+def test_a_estrela(instancia, heuristica, otimo, carregar, comprimentoValido):
+    busca = carregar(instancia, heuristica)
+    assert comprimentoValido(busca, busca.buscar("A*")) == otimo
+
+
+def test_lmcut_entre_hmax_e_otimo(instancia, otimo, carregar):
+    busca = carregar(instancia)
+    tarefa = busca.tarefa
+    lmcut = busca.funcaoHeuristica("lmcut")(tarefa.inicial, tarefa.objetivo)
+    hmax = busca.funcaoHeuristica("hmax")(tarefa.inicial, tarefa.objetivo)
+    assert hmax <= lmcut <= otimo
+
+
+def test_expansoes_comparadas(instancia, otimo, carregar, capsys):
+    busca = carregar(instancia)
+    resultado = busca.executar_busca("A*", heuristica="lmcut")
+    capsys.readouterr()
+    assert resultado["solucao"].profundidade == otimo
+    assert 0 < resultado["expandidos"] <= resultado["expandidos_base"]
+
+
+def test_bfs_conta_expansoes(instancia, carregar):
+    busca = carregar(instancia)
+    busca.buscar("BFS")
+    assert busca.estatisticas["expandidos"] > 0
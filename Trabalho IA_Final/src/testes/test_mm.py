@@ -0,0 +1,12 @@
+import pytest
+
+
+# ------------------------------------------------------------
+# MM (bidirecional heurística): com heurística admissível nos dois
+# sentidos, o plano precisa ser ótimo.
+# ------------------------------------------------------------
+
+@pytest.mark.parametrize("heuristica", ["lmcut", "hmax"])
+def test_mm(instancia, heuristica, otimo, carregar, comprimentoValido):
+    busca = carregar(instancia, heuristica)
+    assert comprimentoValido(busca, busca.buscar("MM")) == otimo
@@ -0,0 +1,32 @@
+import os
+
+import pytest
+
+from codigo.pdb import HeuristicaPDB
+
+
+# ------------------------------------------------------------
+# Bancos de padrões: as duas combinações são admissíveis e o A* com
+# elas precisa dar o plano ótimo. As tabelas gravadas na primeira
+# construção são reabertas na segunda e dão os mesmos valores.
+# ------------------------------------------------------------
+
+@pytest.mark.parametrize("heuristica", ["pdb", "pdbmax"])
+def test_a_estrela(instancia, heuristica, otimo, carregar, comprimentoValido):
+    busca = carregar(instancia, heuristica)
+    assert comprimentoValido(busca, busca.buscar("A*")) == otimo
+
+
+@pytest.mark.parametrize("combinar", ["soma", "max"])
+def test_tabelas_reaproveitadas(instancia, combinar, otimo, carregar, tmp_path):
+    busca = carregar(instancia)
+    tarefa = busca.tarefa
+    primeira = HeuristicaPDB(busca.tarefaSAS(), combinar=combinar, pasta=str(tmp_path))
+    arquivos = sorted(os.listdir(tmp_path))
+    assert arquivos
+
+    segunda = HeuristicaPDB(busca.tarefaSAS(), combinar=combinar, pasta=str(tmp_path))
+    assert sorted(os.listdir(tmp_path)) == arquivos
+    h = primeira(tarefa.inicial, tarefa.objetivo)
+    assert 0 < h <= otimo
+    assert segunda(tarefa.inicial, tarefa.objetivo) == h
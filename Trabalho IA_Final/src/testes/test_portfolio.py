@@ -0,0 +1,21 @@
+from codigo.portfolio import executarPortfolio
+
+
+# ------------------------------------------------------------
+# Portfólio: o plano do vencedor precisa ser válido, e uma
+# configuração que falha só sai da disputa, com o erro registrado.
+# ------------------------------------------------------------
+
+def test_portfolio_padrao(instancia, caminho, otimo, carregar, comprimentoValido):
+    resultado = executarPortfolio(caminho)
+    busca = carregar(instancia)
+    assert comprimentoValido(busca, busca._noDoPlano(resultado["plano"])) >= otimo
+
+
+def test_configuracao_com_erro(instancia, caminho, otimo, carregar, comprimentoValido):
+    resultado = executarPortfolio(caminho, [("GBFS", "hadd"), ("A*", "lmcut")], prazo=60)
+    assert (resultado["tipo"], resultado["heuristica"]) == ("A*", "lmcut")
+    assert "ValueError" in resultado["resultados"][0][2]
+
+    busca = carregar(instancia)
+    assert comprimentoValido(busca, busca._noDoPlano(resultado["plano"])) == otimo
@@ -0,0 +1,25 @@
+import pytest
+
+
+# ------------------------------------------------------------
+# h_add e h_max no A*: o h_max é admissível e precisa dar o plano
+# ótimo; o h_add só precisa dar um plano válido. No estado inicial,
+# h_max <= ótimo e h_max <= h_add.
+# ------------------------------------------------------------
+
+@pytest.mark.parametrize("heuristica", ["hadd", "hmax"])
+def test_a_estrela(instancia, heuristica, otimo, carregar, comprimentoValido):
+    busca = carregar(instancia, heuristica)
+    comprimento = comprimentoValido(busca, busca.buscar("A*"))
+    if heuristica == "hmax":
+        assert comprimento == otimo
+    else:
+        assert comprimento >= otimo
+
+
+def test_valores_no_estado_inicial(instancia, otimo, carregar):
+    busca = carregar(instancia)
+    tarefa = busca.tarefa
+    hadd = busca.funcaoHeuristica("hadd")(tarefa.inicial, tarefa.objetivo)
+    hmax = busca.funcaoHeuristica("hmax")(tarefa.inicial, tarefa.objetivo)
+    assert 0 < hmax <= min(hadd, otimo)
@@ -0,0 +1,31 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+
+# ------------------------------------------------------------
+# h_add/h_max vetorizados: avaliados em lote sobre o estado inicial
+# e seus sucessores, dão os mesmos valores que as versões escalares,
+# e o A* com o h_max vetorizado continua ótimo.
+# ------------------------------------------------------------
+
+@pytest.mark.parametrize("modo", ["hadd", "hmax"])
+def test_lote_igual_ao_escalar(instancia, modo, carregar):
+    busca = carregar(instancia)
+    tarefa = busca.tarefa
+    estados = [tarefa.inicial] + [tarefa.aplicar(i, tarefa.inicial) for i in range(len(tarefa.ids))
+                                  if tarefa.aplicavel(i, tarefa.inicial)]
+
+    escalar = busca.funcaoHeuristica(modo)
+    vetorizada = busca.funcaoHeuristica(modo + "_np")
+    assert vetorizada.lote(estados, tarefa.objetivo) == [escalar(e, tarefa.objetivo) for e in estados]
+
+
+@pytest.mark.parametrize("heuristica", ["hadd_np", "hmax_np"])
+def test_a_estrela(instancia, heuristica, otimo, carregar, comprimentoValido):
+    busca = carregar(instancia, heuristica)
+    comprimento = comprimentoValido(busca, busca.buscar("A*"))
+    if heuristica == "hmax_np":
+        assert comprimento == otimo
+    else:
+        assert comprimento >= otimo